@@ -1,4 +1,5 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Cookie
+from starlette.requests import Request
 from starlette.responses import Response
 
 from app.api.dependencies import DBDep, UserIdDep
@@ -9,39 +10,109 @@ from app.exceptions.auth import (
     UserNotFoundHTTPError,
     InvalidPasswordError,
     InvalidPasswordHTTPError,
+    InvalidJWTTokenError,
+    InvalidTokenHTTPError,
+    JWTTokenExpiredError,
+    JWTTokenExpiredHTTPError,
+    NoRefreshTokenHTTPError,
+    RefreshTokenReusedError,
+    RefreshTokenReusedHTTPError,
+    TokenRevokedError,
+    TokenRevokedHTTPError,
+    TooManyAttemptsHTTPError,
 )
 from app.schemes.users import SUserAddRequest, SUserAuth
 from app.schemes.relations_users_roles import SUserGetWithRels
 from app.services.auth import AuthService
+from app.utils.rate_limit import AUTH_EMAIL_RULE, AUTH_IP_RULE, auth_limiter
 
 router = APIRouter(prefix="/auth", tags=["Авторизация и аутентификация"])
 
+# Refresh-токен нужен только ручкам /auth - в остальные запросы он не уходит
+REFRESH_COOKIE_PATH = "/auth"
+
+
+def set_auth_cookies(response: Response, access_token: str, refresh_token: str) -> None:
+    response.set_cookie("access_token", access_token)
+    response.set_cookie(
+        "refresh_token", refresh_token, httponly=True, path=REFRESH_COOKIE_PATH
+    )
+
+
+async def check_auth_rate(request: Request, email: str) -> None:
+    """
+    До bcrypt: лимит попыток с одного IP и на один email. Попытка по email
+    тратится заранее, чтобы параллельные запросы не обошли лимит, и
+    возвращается после успеха (refund_email_attempt): ведро email
+    расходуют только неудачные попытки.
+    """
+    retry_after = await auth_limiter.hit_all(
+        (AUTH_IP_RULE, request.client.host if request.client else "unknown"),
+        (AUTH_EMAIL_RULE, email.lower()),
+    )
+    if retry_after:
+        raise TooManyAttemptsHTTPError(retry_after)
+
+
+async def refund_email_attempt(email: str) -> None:
+    await auth_limiter.refund(AUTH_EMAIL_RULE, email.lower())
+
 
 @router.post("/register", summary="Регистрация нового пользователя")
 async def register_user(
     db: DBDep,
+    request: Request,
     user_data: SUserAddRequest,
 ) -> dict[str, str]:
+    await check_auth_rate(request, user_data.email)
     try:
         await AuthService(db).register_user(user_data)
     except UserAlreadyExistsError:
         raise UserAlreadyExistsHTTPError
+    await refund_email_attempt(user_data.email)
     return {"status": "OK"}
 
 
 @router.post("/login", summary="Аутентификация пользователя")
 async def login_user(
     db: DBDep,
+    request: Request,
     response: Response,
     user_data: SUserAuth,
 ) -> dict[str, str]:
+    await check_auth_rate(request, user_data.email)
     try:
-        access_token: str = await AuthService(db).login_user(user_data)
+        access_token, refresh_token = await AuthService(db).login_user(user_data)
     except UserNotFoundError:
         raise UserNotFoundHTTPError
     except InvalidPasswordError:
         raise InvalidPasswordHTTPError
-    response.set_cookie("access_token", access_token)
+    await refund_email_attempt(user_data.email)
+    set_auth_cookies(response, access_token, refresh_token)
+    return {"access_token": access_token}
+
+
+@router.post("/refresh", summary="Обмен refresh-токена на новую пару токенов")
+async def refresh_tokens(
+    db: DBDep,
+    response: Response,
+    refresh_token: str | None = Cookie(default=None),
+) -> dict[str, str]:
+    if refresh_token is None:
+        raise NoRefreshTokenHTTPError
+    try:
+        access_token, refresh_token = await AuthService(db).refresh_tokens(refresh_token)
+    except InvalidJWTTokenError:
+        raise InvalidTokenHTTPError
+    except JWTTokenExpiredError:
+        raise JWTTokenExpiredHTTPError
+    except TokenRevokedError:
+        raise TokenRevokedHTTPError
+    except RefreshTokenReusedError:
+        raise RefreshTokenReusedHTTPError
+    except UserNotFoundError:
+        raise UserNotFoundHTTPError
+    set_auth_cookies(response, access_token, refresh_token)
     return {"access_token": access_token}
 
 
@@ -55,6 +126,13 @@ async def get_me(db: DBDep, user_id: UserIdDep) -> SUserGetWithRels | None:
 
 
 @router.post("/logout", summary="Выход пользователя из системы")
-async def logout(response: Response) -> dict[str, str]:
+async def logout(
+    db: DBDep,
+    response: Response,
+    refresh_token: str | None = Cookie(default=None),
+) -> dict[str, str]:
+    if refresh_token is not None:
+        await AuthService(db).logout_user(refresh_token)
     response.delete_cookie("access_token")
+    response.delete_cookie("refresh_token", path=REFRESH_COOKIE_PATH)
     return {"status": "OK"}
@@ -1,5 +1,7 @@
 from fastapi import APIRouter
 
+from app.api.dependencies import DBDep
+
 from app.exceptions.categories import (
     CategoryNotFoundError,
     CategoryNotFoundHTTPError,
@@ -19,10 +21,11 @@ router = APIRouter(prefix="/categories", tags=["Категории"])
 
 @router.post("", summary="Создание новой категории")
 async def create_new_category(
+    db: DBDep,
     category_data: SCategoryAdd,
 ) -> dict[str, str]:
     try:
-        await CategoryService().create_category(category_data)
+        await CategoryService(db).create_category(category_data)
     except CategoryAlreadyExistsError:
         raise CategoryAlreadyExistsHTTPError
     return {"status": "OK"}
@@ -30,24 +33,30 @@ async def create_new_category(
 
 @router.get("", summary="Получение списка всех категорий")
 async def get_all_categories(
+    db: DBDep,
 ) -> list[SCategoryGet]:
-    return await CategoryService().get_categories()
+    return await CategoryService(db).get_categories()
 
 
 @router.get("/{id}", summary="Получение конкретной категории")
 async def get_category(
+    db: DBDep,
     id: int,
 ) -> SCategoryGet:
-    return await CategoryService().get_category(category_id=id)
+    try:
+        return await CategoryService(db).get_category(category_id=id)
+    except CategoryNotFoundError:
+        raise CategoryNotFoundHTTPError
 
 
 @router.put("/{id}", summary="Изменение конкретной категории")
 async def update_category(
+    db: DBDep,
     category_data: SCategoryUpdate,
     id: int,
 ) -> dict[str, str]:
     try:
-        await CategoryService().edit_category(category_id=id, category_data=category_data)
+        await CategoryService(db).update_category(category_id=id, category_data=category_data)
     except CategoryNotFoundError:
         raise CategoryNotFoundHTTPError
 
@@ -56,11 +65,12 @@ async def update_category(
 
 @router.patch("/{id}", summary="Частичное изменение конкретной категории")
 async def patch_category(
+    db: DBDep,
     category_data: SCategoryPatch,
     id: int,
 ) -> dict[str, str]:
     try:
-        await CategoryService().patch_category(category_id=id, category_data=category_data)
+        await CategoryService(db).patch_category(category_id=id, category_data=category_data)
     except CategoryNotFoundError:
         raise CategoryNotFoundHTTPError
 
@@ -69,10 +79,11 @@ async def patch_category(
 
 @router.delete("/{id}", summary="Удаление конкретной категории")
 async def delete_category(
+    db: DBDep,
     id: int,
 ) -> dict[str, str]:
     try:
-        await CategoryService().delete_category(category_id=id)
+        await CategoryService(db).delete_category(category_id=id)
     except CategoryNotFoundError:
         raise CategoryNotFoundHTTPError
 
@@ -1,6 +1,7 @@
 from typing import Annotated
 
-from fastapi import Depends, Request
+from fastapi import Depends
+from starlette.requests import HTTPConnection
 from pydantic import BaseModel, Field
 
 from app.database.database import async_session_maker
@@ -8,9 +9,15 @@ from app.exceptions.auth import (
     InvalidJWTTokenError,
     InvalidTokenHTTPError,
     IsNotAdminHTTPError,
+    JWTTokenExpiredError,
+    JWTTokenExpiredHTTPError,
     NoAccessTokenHTTPError,
+    TokenRevokedHTTPError,
 )
 from app.services.auth import AuthService
+from app.utils.revocation import revocations
+from app.utils.role_stamps import role_stamps
+from app.utils.token_cache import token_cache
 from app.database.db_manager import DBManager
 
 
@@ -22,19 +29,42 @@ class PaginationParams(BaseModel):
 PaginationDep = Annotated[PaginationParams, Depends()]
 
 
-def get_token(request: Request) -> str:
-    token = request.cookies.get("access_token", None)
+class PageParams(BaseModel):
+    cursor: str | None = None
+    skip: int | None = Field(default=None, ge=0)  # режим совместимости (OFFSET)
+    limit: int = Field(default=100, ge=1, le=100)
+
+
+PageParamsDep = Annotated[PageParams, Depends()]
+
+
+def get_token(connection: HTTPConnection) -> str:
+    # HTTPConnection, а не Request: зависимость работает и для WebSocket
+    token = connection.cookies.get("access_token", None)
     if token is None:
         raise NoAccessTokenHTTPError
     return token
 
 
-def get_current_user_id(token: str = Depends(get_token)) -> int:
+async def get_token_claims(token: str = Depends(get_token)) -> dict:
     try:
-        data = AuthService.decode_token(token)
+        claims = token_cache.decode(token, AuthService.decode_token)
     except InvalidJWTTokenError:
         raise InvalidTokenHTTPError
-    return data["user_id"]
+    except JWTTokenExpiredError:
+        raise JWTTokenExpiredHTTPError
+    if claims.get("type") != "access":
+        raise InvalidTokenHTTPError
+    # Обычно это промах фильтра Блума в памяти, без запроса в БД
+    if "fid" in claims and await revocations.is_revoked(claims["fid"]):
+        raise TokenRevokedHTTPError
+    return claims
+
+TokenClaimsDep = Annotated[dict, Depends(get_token_claims)]
+
+
+def get_current_user_id(claims: TokenClaimsDep) -> int:
+    return claims["user_id"]
 
 UserIdDep = Annotated[int, Depends(get_current_user_id)]
 
@@ -44,7 +74,16 @@ from app.dependencies import get_db
 
 DBDep = Annotated[DBManager, Depends(get_db)]
 
-async def check_is_admin(user_id: UserIdDep, db: DBDep):
+async def check_is_admin(claims: TokenClaimsDep, db: DBDep):
+    user_id = claims["user_id"]
+    if "rv" in claims:
+        await role_stamps.refresh(db)
+        if not role_stamps.is_stale(user_id, claims["rv"]):
+            if claims["role"] == "admin":
+                return True
+            raise IsNotAdminHTTPError
+
+    # Токен без роли или роль менялась после его выдачи - решает БД
     user = await db.users.get_one_or_none_with_role(id=user_id)
 
     if user and user.role and user.role.name == "admin":
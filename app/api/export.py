@@ -0,0 +1,33 @@
+from datetime import datetime
+from typing import Optional
+
+from fastapi import APIRouter
+from fastapi.responses import StreamingResponse
+
+from app.api.dependencies import DBDep, IsAdminDep
+from app.services.export import ExportEntity, ExportFormat, ExportService
+
+router = APIRouter(prefix="/export", tags=["Выгрузка"])
+
+MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv; charset=utf-8"}
+
+
+@router.get("/{entity}", summary="Потоковая выгрузка таблицы в NDJSON/CSV")
+async def export_entity(
+    db: DBDep,
+    is_admin: IsAdminDep,
+    entity: ExportEntity,
+    format: ExportFormat = "ndjson",
+    since: Optional[datetime] = None,
+    gzip: bool = False,
+) -> StreamingResponse:
+    headers = {
+        "Content-Disposition": f'attachment; filename="{entity}.{format}{".gz" if gzip else ""}"'
+    }
+    if gzip:
+        headers["Content-Encoding"] = "gzip"
+    return StreamingResponse(
+        ExportService(db).export(entity, fmt=format, since=since, compress=gzip),
+        media_type=MEDIA_TYPES[format],
+        headers=headers,
+    )
@@ -1,6 +1,9 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Query
+from fastapi.responses import StreamingResponse
 from typing import Optional
 
+from app.api.dependencies import DBDep, IsAdminDep, PageParamsDep
+from app.exceptions.base import InvalidCursorError, InvalidCursorHTTPError
 from app.exceptions.items import (
     ItemNotFoundError,
     ItemNotFoundHTTPError,
@@ -10,58 +13,156 @@ from app.exceptions.items import (
 from app.schemes.items import (
     SItemAdd,
     SItemGet,
+    SItemGetWithRels,
     SItemUpdate,
     SItemPatch,
-    SItemFilter
+    SItemFilter,
+    SItemBulkRequest,
+    SItemBulkResult,
+    SItemSearchHit,
+    SItemSuggestion,
+    SItemNearby,
+    SItemFacets,
 )
+from app.schemes.pagination import SPage
 from app.services.items import ItemService
+from app.services.suggest import SuggestService
 
 router = APIRouter(prefix="/items", tags=["Товары"])
 
 
 @router.post("", summary="Создание нового товара")
 async def create_new_item(
+    db: DBDep,
     item_data: SItemAdd,
 ) -> dict[str, str]:
     try:
-        await ItemService().create_item(item_data)
+        await ItemService(db).create_item(item_data)
     except ItemAlreadyExistsError:
         raise ItemAlreadyExistsHTTPError
     return {"status": "OK"}
 
 
+@router.post("/bulk", summary="Массовая загрузка товаров из фида партнера")
+async def create_items_bulk(
+    db: DBDep,
+    is_admin: IsAdminDep,
+    bulk_data: SItemBulkRequest,
+) -> SItemBulkResult:
+    try:
+        return await ItemService(db).add_items_bulk(bulk_data)
+    except ItemAlreadyExistsError:
+        raise ItemAlreadyExistsHTTPError
+
+
 @router.get("", summary="Получение списка всех товаров")
 async def get_all_items(
+    db: DBDep,
+    pagination: PageParamsDep,
     category_id: Optional[int] = None,
     location_id: Optional[int] = None,
     user_id: Optional[int] = None,
     is_active: Optional[bool] = None,
-    skip: int = 0,
-    limit: int = 100
-) -> list[SItemGet]:
+    stream: bool = False,
+) -> SPage[SItemGet]:
     filters = SItemFilter(
         category_id=category_id,
         location_id=location_id,
         user_id=user_id,
         is_active=is_active
     )
-    return await ItemService().get_items(filters=filters, skip=skip, limit=limit)
+    if stream:
+        # Вся выборка одним JSON-массивом без пагинации
+        return StreamingResponse(
+            ItemService(db).stream_items(filters), media_type="application/json"
+        )
+    try:
+        return await ItemService(db).get_items(
+            filters=filters,
+            cursor=pagination.cursor,
+            skip=pagination.skip,
+            limit=pagination.limit,
+        )
+    except InvalidCursorError:
+        raise InvalidCursorHTTPError
+
+
+@router.get("/search", summary="Полнотекстовый поиск товаров")
+async def search_items(
+    db: DBDep,
+    q: str = Query(min_length=1, max_length=200),
+    category_id: Optional[int] = None,
+    location_id: Optional[int] = None,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(20, ge=1, le=50),
+) -> list[SItemSearchHit]:
+    return await ItemService(db).search_items(
+        q,
+        category_id=category_id,
+        location_id=location_id,
+        skip=skip,
+        limit=limit,
+    )
+
+
+@router.get("/suggest", summary="Подсказки для строки поиска")
+async def suggest_items(
+    prefix: str = Query(min_length=1, max_length=100),
+    limit: int = Query(10, ge=1, le=20),
+) -> list[SItemSuggestion]:
+    return SuggestService().suggest(prefix, limit)
+
+
+@router.get("/facets", summary="Количество товаров по категориям, локациям и состоянию")
+async def get_item_facets(
+    db: DBDep,
+    category_id: Optional[int] = None,
+    location_id: Optional[int] = None,
+    user_id: Optional[int] = None,
+    is_active: Optional[bool] = None,
+) -> SItemFacets:
+    filters = SItemFilter(
+        category_id=category_id,
+        location_id=location_id,
+        user_id=user_id,
+        is_active=is_active
+    )
+    return await ItemService(db).get_facets(filters)
+
+
+@router.get("/nearby", summary="Товары рядом с точкой")
+async def get_nearby_items(
+    db: DBDep,
+    lat: float = Query(ge=-90, le=90),
+    lon: float = Query(ge=-180, le=180),
+    radius: float = Query(10, gt=0, le=500, description="Радиус, км"),
+    category_id: Optional[int] = None,
+    limit: int = Query(50, ge=1, le=100),
+) -> list[SItemNearby]:
+    return await ItemService(db).get_nearby_items(
+        lat, lon, radius, category_id=category_id, limit=limit
+    )
 
 
 @router.get("/{id}", summary="Получение конкретного товара")
 async def get_item(
+    db: DBDep,
     id: int,
-) -> SItemGet:
-    return await ItemService().get_item(item_id=id)
+) -> SItemGetWithRels:
+    try:
+        return await ItemService(db).get_item(item_id=id)
+    except ItemNotFoundError:
+        raise ItemNotFoundHTTPError
 
 
 @router.put("/{id}", summary="Изменение конкретного товара")
 async def update_item(
+    db: DBDep,
     item_data: SItemUpdate,
     id: int,
 ) -> dict[str, str]:
     try:
-        await ItemService().edit_item(item_id=id, item_data=item_data)
+        await ItemService(db).update_item(item_id=id, item_data=item_data)
     except ItemNotFoundError:
         raise ItemNotFoundHTTPError
 
@@ -70,11 +171,12 @@ async def update_item(
 
 @router.patch("/{id}", summary="Частичное изменение конкретного товара")
 async def patch_item(
+    db: DBDep,
     item_data: SItemPatch,
     id: int,
 ) -> dict[str, str]:
     try:
-        await ItemService().patch_item(item_id=id, item_data=item_data)
+        await ItemService(db).patch_item(item_id=id, item_data=item_data)
     except ItemNotFoundError:
         raise ItemNotFoundHTTPError
 
@@ -83,10 +185,11 @@ async def patch_item(
 
 @router.delete("/{id}", summary="Удаление конкретного товара")
 async def delete_item(
+    db: DBDep,
     id: int,
 ) -> dict[str, str]:
     try:
-        await ItemService().delete_item(item_id=id)
+        await ItemService(db).delete_item(item_id=id)
     except ItemNotFoundError:
         raise ItemNotFoundHTTPError
 
@@ -95,8 +198,16 @@ async def delete_item(
 
 @router.get("/user/{user_id}", summary="Получение товаров пользователя")
 async def get_user_items(
+    db: DBDep,
+    pagination: PageParamsDep,
     user_id: int,
-    skip: int = 0,
-    limit: int = 100
-) -> list[SItemGet]:
-    return await ItemService().get_user_items(user_id=user_id, skip=skip, limit=limit)
\ No newline at end of file
+) -> SPage[SItemGet]:
+    try:
+        return await ItemService(db).get_user_items(
+            user_id=user_id,
+            cursor=pagination.cursor,
+            skip=pagination.skip,
+            limit=pagination.limit,
+        )
+    except InvalidCursorError:
+        raise InvalidCursorHTTPError
\ No newline at end of file
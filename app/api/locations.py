@@ -1,6 +1,8 @@
 from fastapi import APIRouter
 from typing import Optional
 
+from app.api.dependencies import DBDep, PageParamsDep
+from app.exceptions.base import InvalidCursorError, InvalidCursorHTTPError
 from app.exceptions.locations import (
     LocationNotFoundError,
     LocationNotFoundHTTPError,
@@ -14,6 +16,7 @@ from app.schemes.locations import (
     SLocationPatch,
     SLocationFilter
 )
+from app.schemes.pagination import SPage
 from app.services.locations import LocationService
 
 router = APIRouter(prefix="/locations", tags=["Локации"])
@@ -32,13 +35,21 @@ async def create_new_location(
 
 @router.get("", summary="Получение списка всех локаций")
 async def get_all_locations(
+    db: DBDep,
+    pagination: PageParamsDep,
     city: Optional[str] = None,
     region: Optional[str] = None,
-    skip: int = 0,
-    limit: int = 100
-) -> list[SLocationGet]:
+) -> SPage[SLocationGet]:
     filters = SLocationFilter(city=city, region=region)
-    return await LocationService().get_locations(filters=filters, skip=skip, limit=limit)
+    try:
+        return await LocationService(db).get_locations(
+            filters=filters,
+            cursor=pagination.cursor,
+            skip=pagination.skip,
+            limit=pagination.limit,
+        )
+    except InvalidCursorError:
+        raise InvalidCursorHTTPError
 
 
 @router.get("/{id}", summary="Получение конкретной локации")
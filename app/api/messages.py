@@ -1,19 +1,27 @@
 from fastapi import APIRouter
 
+from app.api.dependencies import DBDep, PageParamsDep, UserIdDep
+from app.exceptions.base import InvalidCursorError, InvalidCursorHTTPError
+from app.exceptions.items import ItemNotFoundError, ItemNotFoundHTTPError
 from app.exceptions.messages import (
     MessageNotFoundError,
     MessageNotFoundHTTPError,
     ConversationNotFoundError,
     ConversationNotFoundHTTPError,
     MessageAccessDeniedError,
-    MessageAccessDeniedHTTPError
+    MessageAccessDeniedHTTPError,
+    MessageToYourselfError,
+    MessageToYourselfHTTPError,
 )
+from app.exceptions.users import UserNotFoundError, UserNotFoundHTTPError
 from app.schemes.messages import (
     SMessageAdd,
     SMessageGet,
+    SMessageSend,
     SConversationGet,
     SConversationList
 )
+from app.schemes.pagination import SPage
 from app.services.messages import MessageService
 
 router = APIRouter(prefix="/messages", tags=["Сообщения"])
@@ -21,48 +29,118 @@ router = APIRouter(prefix="/messages", tags=["Сообщения"])
 
 @router.get("/conversations", summary="Получение списка всех чатов")
 async def get_all_conversations(
-) -> list[SConversationList]:
-    return await MessageService().get_conversations()
+    db: DBDep,
+    user_id: UserIdDep,
+    pagination: PageParamsDep,
+) -> SPage[SConversationList]:
+    try:
+        return await MessageService(db).get_conversations(
+            user_id=user_id,
+            cursor=pagination.cursor,
+            skip=pagination.skip,
+            limit=pagination.limit,
+        )
+    except InvalidCursorError:
+        raise InvalidCursorHTTPError
+
+
+@router.post("/conversations", summary="Первое сообщение по объявлению")
+async def start_conversation(
+    db: DBDep,
+    user_id: UserIdDep,
+    message_data: SMessageAdd,
+) -> SMessageGet:
+    try:
+        return await MessageService(db).start_conversation(user_id=user_id, message_data=message_data)
+    except ItemNotFoundError:
+        raise ItemNotFoundHTTPError
+    except UserNotFoundError:
+        raise UserNotFoundHTTPError
+    except MessageToYourselfError:
+        raise MessageToYourselfHTTPError
 
 
 @router.get("/conversations/{conversation_id}", summary="Получение конкретного чата")
 async def get_conversation(
+    db: DBDep,
+    user_id: UserIdDep,
     conversation_id: int,
 ) -> SConversationGet:
-    return await MessageService().get_conversation(conversation_id=conversation_id)
+    try:
+        return await MessageService(db).get_conversation(user_id=user_id, conversation_id=conversation_id)
+    except ConversationNotFoundError:
+        raise ConversationNotFoundHTTPError
+    except MessageAccessDeniedError:
+        raise MessageAccessDeniedHTTPError
 
 
 @router.post("/conversations/{conversation_id}/messages", summary="Отправка сообщения")
 async def send_message(
-    message_data: SMessageAdd,
+    db: DBDep,
+    user_id: UserIdDep,
+    message_data: SMessageSend,
     conversation_id: int,
-) -> dict[str, str]:
+) -> SMessageGet:
     try:
-        await MessageService().send_message(conversation_id=conversation_id, message_data=message_data)
+        return await MessageService(db).send_message(
+            user_id=user_id, conversation_id=conversation_id, message_data=message_data
+        )
     except ConversationNotFoundError:
         raise ConversationNotFoundHTTPError
-
-    return {"status": "OK"}
+    except MessageAccessDeniedError:
+        raise MessageAccessDeniedHTTPError
 
 
 @router.get("/conversations/{conversation_id}/messages", summary="Получение сообщений чата")
 async def get_conversation_messages(
+    db: DBDep,
+    user_id: UserIdDep,
+    pagination: PageParamsDep,
     conversation_id: int,
-    skip: int = 0,
-    limit: int = 100
-) -> list[SMessageGet]:
-    return await MessageService().get_messages(conversation_id=conversation_id, skip=skip, limit=limit)
+) -> SPage[SMessageGet]:
+    try:
+        return await MessageService(db).get_messages(
+            user_id=user_id,
+            conversation_id=conversation_id,
+            cursor=pagination.cursor,
+            skip=pagination.skip,
+            limit=pagination.limit,
+        )
+    except InvalidCursorError:
+        raise InvalidCursorHTTPError
+    except ConversationNotFoundError:
+        raise ConversationNotFoundHTTPError
+    except MessageAccessDeniedError:
+        raise MessageAccessDeniedHTTPError
+
+
+@router.post("/conversations/{conversation_id}/read", summary="Отметить чат прочитанным")
+async def mark_conversation_read(
+    db: DBDep,
+    user_id: UserIdDep,
+    conversation_id: int,
+) -> dict[str, str]:
+    try:
+        await MessageService(db).mark_read(user_id=user_id, conversation_id=conversation_id)
+    except ConversationNotFoundError:
+        raise ConversationNotFoundHTTPError
+    except MessageAccessDeniedError:
+        raise MessageAccessDeniedHTTPError
+
+    return {"status": "OK"}
 
 
 @router.delete("/messages/{message_id}", summary="Удаление сообщения")
 async def delete_message(
+    db: DBDep,
+    user_id: UserIdDep,
     message_id: int,
 ) -> dict[str, str]:
     try:
-        await MessageService().delete_message(message_id=message_id)
+        await MessageService(db).delete_message(user_id=user_id, message_id=message_id)
     except MessageNotFoundError:
         raise MessageNotFoundHTTPError
     except MessageAccessDeniedError:
         raise MessageAccessDeniedHTTPError
 
-    return {"status": "OK"}
\ No newline at end of file
+    return {"status": "OK"}
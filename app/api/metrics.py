@@ -0,0 +1,28 @@
+from fastapi import APIRouter
+
+from app.api.dependencies import IsAdminDep
+from app.database.db_manager import DBManager
+from app.utils.password_pool import password_pool
+from app.utils.passwords import get_rounds
+from app.utils.rate_limit import auth_limiter
+from app.utils.realtime import message_hub
+from app.utils.revocation import revocations
+from app.utils.role_cache import role_cache
+from app.utils.suggest import suggest_index
+from app.utils.token_cache import token_cache
+
+router = APIRouter(prefix="/admin", tags=["Метрики"])
+
+
+@router.get("/metrics", summary="Счетчики процесса")
+async def get_metrics(is_admin: IsAdminDep) -> dict[str, dict]:
+    return {
+        "db": DBManager.stats,
+        "suggest": suggest_index.stats(),
+        "realtime": message_hub.stats(),
+        "passwords": password_pool.stats() | {"bcrypt_rounds": get_rounds()},
+        "tokens": token_cache.stats(),
+        "roles": role_cache.stats(),
+        "revocations": revocations.stats(),
+        "auth_limiter": auth_limiter.stats(),
+    }
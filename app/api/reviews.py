@@ -1,11 +1,17 @@
 from fastapi import APIRouter
+from fastapi.responses import StreamingResponse
 from typing import Optional
 
+from app.api.dependencies import DBDep, PageParamsDep, UserIdDep
+from app.exceptions.base import InvalidCursorError, InvalidCursorHTTPError
+from app.exceptions.items import ItemNotFoundError, ItemNotFoundHTTPError
 from app.exceptions.reviews import (
     ReviewNotFoundError,
     ReviewNotFoundHTTPError,
     ReviewAlreadyExistsError,
-    ReviewAlreadyExistsHTTPError
+    ReviewAlreadyExistsHTTPError,
+    ReviewAccessDeniedError,
+    ReviewAccessDeniedHTTPError,
 )
 from app.schemes.reviews import (
     SReviewAdd,
@@ -14,6 +20,7 @@ from app.schemes.reviews import (
     SReviewPatch,
     SReviewFilter
 )
+from app.schemes.pagination import SPage
 from app.services.reviews import ReviewService
 
 router = APIRouter(prefix="/reviews", tags=["Отзывы"])
@@ -21,10 +28,12 @@ router = APIRouter(prefix="/reviews", tags=["Отзывы"])
 
 @router.post("", summary="Создание нового отзыва")
 async def create_new_review(
+    db: DBDep,
+    user_id: UserIdDep,
     review_data: SReviewAdd,
 ) -> dict[str, str]:
     try:
-        await ReviewService().create_review(review_data)
+        await ReviewService(db).create_review(user_id, review_data)
     except ReviewAlreadyExistsError:
         raise ReviewAlreadyExistsHTTPError
     return {"status": "OK"}
@@ -32,71 +41,118 @@ async def create_new_review(
 
 @router.get("", summary="Получение списка всех отзывов")
 async def get_all_reviews(
+    db: DBDep,
+    pagination: PageParamsDep,
     item_id: Optional[int] = None,
     user_id: Optional[int] = None,
-    skip: int = 0,
-    limit: int = 100
-) -> list[SReviewGet]:
-    filters = SReviewFilter(item_id=item_id, user_id=user_id)
-    return await ReviewService().get_reviews(filters=filters, skip=skip, limit=limit)
+    min_rating: Optional[int] = None,
+    max_rating: Optional[int] = None,
+    stream: bool = False,
+) -> SPage[SReviewGet]:
+    filters = SReviewFilter(
+        item_id=item_id, user_id=user_id, min_rating=min_rating, max_rating=max_rating
+    )
+    if stream:
+        # Вся выборка одним JSON-массивом без пагинации
+        return StreamingResponse(
+            ReviewService(db).stream_reviews(filters), media_type="application/json"
+        )
+    try:
+        return await ReviewService(db).get_reviews(
+            filters=filters,
+            cursor=pagination.cursor,
+            skip=pagination.skip,
+            limit=pagination.limit,
+        )
+    except InvalidCursorError:
+        raise InvalidCursorHTTPError
 
 
 @router.get("/{id}", summary="Получение конкретного отзыва")
 async def get_review(
+    db: DBDep,
     id: int,
 ) -> SReviewGet:
-    return await ReviewService().get_review(review_id=id)
+    try:
+        return await ReviewService(db).get_review(review_id=id)
+    except ReviewNotFoundError:
+        raise ReviewNotFoundHTTPError
 
 
 @router.put("/{id}", summary="Изменение конкретного отзыва")
 async def update_review(
+    db: DBDep,
+    user_id: UserIdDep,
     review_data: SReviewUpdate,
     id: int,
 ) -> dict[str, str]:
     try:
-        await ReviewService().edit_review(review_id=id, review_data=review_data)
+        await ReviewService(db).edit_review(user_id=user_id, review_id=id, review_data=review_data)
     except ReviewNotFoundError:
         raise ReviewNotFoundHTTPError
+    except ReviewAccessDeniedError:
+        raise ReviewAccessDeniedHTTPError
 
     return {"status": "OK"}
 
 
 @router.patch("/{id}", summary="Частичное изменение конкретного отзыва")
 async def patch_review(
+    db: DBDep,
+    user_id: UserIdDep,
     review_data: SReviewPatch,
     id: int,
 ) -> dict[str, str]:
     try:
-        await ReviewService().patch_review(review_id=id, review_data=review_data)
+        await ReviewService(db).patch_review(user_id=user_id, review_id=id, review_data=review_data)
     except ReviewNotFoundError:
         raise ReviewNotFoundHTTPError
+    except ReviewAccessDeniedError:
+        raise ReviewAccessDeniedHTTPError
 
     return {"status": "OK"}
 
 
 @router.delete("/{id}", summary="Удаление конкретного отзыва")
 async def delete_review(
+    db: DBDep,
+    user_id: UserIdDep,
     id: int,
 ) -> dict[str, str]:
     try:
-        await ReviewService().delete_review(review_id=id)
+        await ReviewService(db).delete_review(user_id=user_id, review_id=id)
     except ReviewNotFoundError:
         raise ReviewNotFoundHTTPError
+    except ReviewAccessDeniedError:
+        raise ReviewAccessDeniedHTTPError
 
     return {"status": "OK"}
 
 
 @router.get("/item/{item_id}", summary="Получение отзывов для товара")
 async def get_item_reviews(
+    db: DBDep,
+    pagination: PageParamsDep,
     item_id: int,
-    skip: int = 0,
-    limit: int = 100
-) -> list[SReviewGet]:
-    return await ReviewService().get_item_reviews(item_id=item_id, skip=skip, limit=limit)
+) -> SPage[SReviewGet]:
+    try:
+        return await ReviewService(db).get_item_reviews(
+            item_id=item_id,
+            cursor=pagination.cursor,
+            skip=pagination.skip,
+            limit=pagination.limit,
+        )
+    except InvalidCursorError:
+        raise InvalidCursorHTTPError
 
 
 @router.get("/item/{item_id}/average-rating", summary="Получение среднего рейтинга товара")
 async def get_item_average_rating(
+    db: DBDep,
     item_id: int,
 ) -> dict[str, float]:
-    return {"average_rating": await ReviewService().get_item_average_rating(item_id=item_id)}
\ No newline at end of file
+    try:
+        average = await ReviewService(db).get_item_average_rating(item_id=item_id)
+    except ItemNotFoundError:
+        raise ItemNotFoundHTTPError
+    return {"average_rating": average}
\ No newline at end of file
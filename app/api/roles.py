@@ -1,6 +1,7 @@
 from fastapi import APIRouter
 
-from app.api.dependencies import DBDep
+from app.api.dependencies import DBDep, PageParamsDep
+from app.exceptions.base import InvalidCursorError, InvalidCursorHTTPError
 from app.exceptions.roles import (
     RoleAlreadyExistsError,
     RoleAlreadyExistsHTTPError,
@@ -36,9 +37,20 @@ async def get_all_roles(
 @router.get("/roles/{id}", summary="Получение конкретной роли")
 async def get_role(
     db: DBDep,
+    pagination: PageParamsDep,
     id: int,
 ) -> SRoleGetWithRels:
-    return await RolesService(db).get_role(role_id=id)
+    try:
+        return await RolesService(db).get_role(
+            role_id=id,
+            cursor=pagination.cursor,
+            skip=pagination.skip,
+            limit=pagination.limit,
+        )
+    except RoleNotFoundError:
+        raise RoleNotFoundHTTPError
+    except InvalidCursorError:
+        raise InvalidCursorHTTPError
 
 
 @router.put("/roles/{id}", summary="Изменение конкретной роли")
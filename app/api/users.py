@@ -1,4 +1,5 @@
 from fastapi import APIRouter, Depends
+from fastapi.responses import StreamingResponse
 
 from app.api.dependencies import DBDep, UserIdDep, IsAdminDep
 from app.exceptions.users import (
@@ -7,7 +8,7 @@ from app.exceptions.users import (
     UserNotFoundError,
     UserNotFoundHTTPError,
 )
-from app.schemes.users import SUserAdd, SUserAddRequest, SUserGet
+from app.schemes.users import SUserAdd, SUserAddRequest, SUserAdminGet
 from app.schemes.relations_users_roles import SUserGetWithRels
 from app.services.users import UserService
 from typing import Optional
@@ -31,7 +32,13 @@ async def create_new_user(
 @router.get("/users", summary="Получение списка пользователей")
 async def get_all_users(
     db: DBDep,
-) -> list[SUserGet]:
+    is_admin: IsAdminDep,
+    stream: bool = False,
+) -> list[SUserAdminGet]:
+    if stream:
+        return StreamingResponse(
+            UserService(db).stream_users(), media_type="application/json"
+        )
     return await UserService(db).get_users()
 
 
@@ -0,0 +1,45 @@
+import asyncio
+
+from fastapi import APIRouter, WebSocket, WebSocketDisconnect, status
+
+from app.api.dependencies import UserIdDep
+from app.utils.realtime import message_hub
+
+router = APIRouter(prefix="/ws", tags=["Сообщения"])
+
+
+@router.websocket("/messages")
+async def messages_ws(websocket: WebSocket, user_id: UserIdDep):
+    """
+    Новые сообщения и отметки о прочтении в чатах пользователя.
+    Входящие кадры от клиента не обрабатываются - они только держат соединение.
+    """
+    await websocket.accept()
+    subscription = message_hub.subscribe(user_id)
+
+    async def send_events():
+        try:
+            while True:
+                await websocket.send_text((await subscription.queue.get()).decode())
+        except (WebSocketDisconnect, RuntimeError):
+            pass
+
+    async def receive_until_disconnect():
+        while (await websocket.receive())["type"] != "websocket.disconnect":
+            pass
+
+    tasks = [
+        asyncio.create_task(send_events()),
+        asyncio.create_task(receive_until_disconnect()),
+        asyncio.create_task(subscription.overflowed.wait()),
+    ]
+    try:
+        await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        for task in tasks:
+            task.cancel()
+        message_hub.unsubscribe(subscription)
+
+    if subscription.overflowed.is_set():
+        # Клиент отстал: пусть переподключится и доберет историю через REST
+        await websocket.close(code=status.WS_1013_TRY_AGAIN_LATER)
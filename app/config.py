@@ -6,9 +6,69 @@ class Settings(BaseSettings):
     ALGORITHM: str
     ACCESS_TOKEN_EXPIRE_MINUTES: int
     DB_NAME: str
-    model_config = SettingsConfigDict(
-        env_file=os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".env")
-    )
+
+    # Профиль движка SQLite (применяется PRAGMA-ми при каждом подключении)
+    DB_JOURNAL_MODE: str = "WAL"
+    DB_SYNCHRONOUS: str = "NORMAL"
+    DB_MMAP_SIZE: int = 256 * 1024 * 1024  # байты
+    DB_CACHE_SIZE: int = -64000  # отрицательное значение - в КиБ (≈64 МБ)
+    DB_BUSY_TIMEOUT: int = 5000  # мс
+    DB_TEMP_STORE: str = "MEMORY"
+    DB_READ_POOL_SIZE: int = 10
+
+    DEBUG: bool = False
+    # Сколько раз один и тот же SQL может выполниться за запрос до предупреждения о N+1
+    QUERY_REPEAT_THRESHOLD: int = 10
+
+    # Бюджет памяти индекса подсказок /items/suggest (на процесс)
+    SUGGEST_MEMORY_BUDGET_MB: int = 64
+
+    # Рейтинг доверия продавца: байесовское среднее оценок его объявлений,
+    # вес отзыва убывает вдвое каждые TRUST_HALF_LIFE_DAYS
+    TRUST_PRIOR_MEAN: float = 4.0
+    TRUST_PRIOR_WEIGHT: float = 5.0
+    TRUST_HALF_LIFE_DAYS: float = 180.0
+
+    # WebSocket /ws/messages: очередь событий на подключение и необязательный
+    # unix-сокет брокера (python -m app.utils.broker) для нескольких воркеров
+    WS_QUEUE_SIZE: int = 100
+    REALTIME_BROKER_SOCKET: str | None = None
+
+    # Потоки для bcrypt (хеширование и проверка паролей вне цикла событий)
+    PASSWORD_HASH_WORKERS: int = max(1, (os.cpu_count() or 2) // 2)
+    # Стоимость bcrypt. С BCRYPT_TARGET_MS воркер подбирает ее сам при старте
+    # (хеши в пределах раунда от подобранной не пересчитываются); результат
+    # python -m app.utils.passwords можно записать сюда, чтобы не замерять на старте
+    BCRYPT_ROUNDS: int = 12
+    BCRYPT_TARGET_MS: float | None = None
+
+    # Проверенные access-токены в памяти процесса (до их exp)
+    TOKEN_CACHE_SIZE: int = 10000
+
+    # Как часто воркер подтягивает изменения ролей из других процессов, секунды
+    ROLE_STAMPS_REFRESH_SECONDS: float = 5.0
+
+    # Сколько живет кеш ролей процесса, если роль правили в другом воркере
+    ROLE_CACHE_TTL_SECONDS: float = 60.0
+
+    # Refresh-токены и отозванные семейства в памяти процесса: фильтр Блума
+    # на REVOCATION_BLOOM_CAPACITY семейств, LRU проверенных и период опроса БД
+    REFRESH_TOKEN_EXPIRE_DAYS: int = 7
+    REVOCATION_BLOOM_CAPACITY: int = 100_000
+    REVOCATION_BLOOM_ERROR_RATE: float = 0.001
+    REVOCATION_LRU_SIZE: int = 10000
+    REVOCATION_REFRESH_SECONDS: float = 5.0
+
+    # Ограничение попыток входа и регистрации (каждая стоит полного bcrypt):
+    # ведро на BURST попыток, пополняется PER_MINUTE попытками в минуту.
+    # RATE_LIMIT_DB_PATH - файл SQLite с общими для всех воркеров ведрами,
+    # без него у каждого воркера свои ведра в памяти (не больше RATE_LIMIT_MAX_KEYS)
+    AUTH_RATE_IP_BURST: int = 20
+    AUTH_RATE_IP_PER_MINUTE: float = 10.0
+    AUTH_RATE_EMAIL_BURST: int = 5
+    AUTH_RATE_EMAIL_PER_MINUTE: float = 2.0
+    RATE_LIMIT_MAX_KEYS: int = 100_000
+    RATE_LIMIT_DB_PATH: str | None = None
 
     model_config = SettingsConfigDict(
         env_file=os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".env")
@@ -18,6 +78,16 @@ class Settings(BaseSettings):
     def get_db_url(self):
         return f"sqlite+aiosqlite:///{self.DB_NAME}"
 
+    @property
+    def db_pragmas(self) -> dict[str, str | int]:
+        return {
+            "busy_timeout": self.DB_BUSY_TIMEOUT,
+            "synchronous": self.DB_SYNCHRONOUS,
+            "cache_size": self.DB_CACHE_SIZE,
+            "mmap_size": self.DB_MMAP_SIZE,
+            "temp_store": self.DB_TEMP_STORE,
+        }
+
     @property
     def auth_data(self):
         return {"secret_key": self.SECRET_KEY, "algorithm": self.ALGORITHM}
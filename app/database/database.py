@@ -1,28 +1,65 @@
 from datetime import datetime
 from typing import TYPE_CHECKING
 
-from sqlalchemy import NullPool, func, text
+from sqlalchemy import NullPool, event, func, text
 from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
     async_sessionmaker,
     create_async_engine,
 )
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
 
 from app.config import settings
+from app.database.query_counter import install_query_counter
 
-engine = create_async_engine(settings.get_db_url)
 
-engine_null_pool = create_async_engine(settings.get_db_url, poolclass=NullPool)
+def apply_sqlite_pragmas(engine: AsyncEngine, read_only: bool = False) -> AsyncEngine:
+    """Вешает на движок хук, настраивающий каждое новое подключение SQLite"""
+
+    @event.listens_for(engine.sync_engine, "connect")
+    def _set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        if not read_only:
+            # Режим журнала хранится в самом файле БД, его меняет только писатель
+            cursor.execute(f"PRAGMA journal_mode={settings.DB_JOURNAL_MODE}")
+        for name, value in settings.db_pragmas.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+        if read_only:
+            cursor.execute("PRAGMA query_only=ON")
+        cursor.close()
+
+    return engine
+
+
+engine = apply_sqlite_pragmas(create_async_engine(settings.get_db_url))
+
+engine_null_pool = apply_sqlite_pragmas(
+    create_async_engine(settings.get_db_url, poolclass=NullPool)
+)
+
+# Отдельный пул читателей: в WAL они не блокируются писателем
+engine_read = apply_sqlite_pragmas(
+    create_async_engine(
+        settings.get_db_url,
+        pool_size=settings.DB_READ_POOL_SIZE,
+        max_overflow=settings.DB_READ_POOL_SIZE,
+    ),
+    read_only=True,
+)
+
+for _engine in (engine, engine_null_pool, engine_read):
+    install_query_counter(_engine)
 
 
 async_session_maker = async_sessionmaker(bind=engine, expire_on_commit=False)
 async_session_maker_null_pool = async_sessionmaker(
     bind=engine_null_pool, expire_on_commit=False
 )
+async_session_maker_read = async_sessionmaker(bind=engine_read, expire_on_commit=False)
 
 
 class Base(DeclarativeBase):
     created_at: Mapped[datetime] = mapped_column(server_default=func.now())
     updated_at: Mapped[datetime] = mapped_column(
         server_default=func.now(), onupdate=func.now()
-    )
\ No newline at end of file
+    )
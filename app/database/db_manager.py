@@ -1,32 +1,69 @@
-from app.database.database import async_session_maker
+from app.database.database import async_session_maker, async_session_maker_read
 from app.repositories.users import UsersRepository
 from app.repositories.items import ItemsRepository
 from app.repositories.categories import CategoriesRepository
 from app.repositories.locations import LocationsRepository
 from app.repositories.messages import MessagesRepository
+from app.repositories.conversations import ConversationsRepository
 from app.repositories.reviews import ReviewsRepository
 from app.repositories.roles import RolesRepository
+from app.repositories.refresh_tokens import RefreshTokensRepository
 
 class DBManager:
+    # Репозитории создаются при первом обращении к атрибуту: db.users, db.items, ...
+    repositories = {
+        "users": UsersRepository,
+        "items": ItemsRepository,
+        "categories": CategoriesRepository,
+        "locations": LocationsRepository,
+        "messages": MessagesRepository,
+        "conversations": ConversationsRepository,
+        "reviews": ReviewsRepository,
+        "roles": RolesRepository,
+        "refresh_tokens": RefreshTokensRepository,
+    }
+    # Счетчики на процесс: сколько менеджеров отработало и сколько из них не трогали БД
+    stats = {"total": 0, "without_session": 0}
+
     def __init__(self, session_factory: async_session_maker): 
         self.session_factory = session_factory
+        self._session = None
+
+    @classmethod
+    def for_read(cls) -> "DBManager":
+        """Менеджер поверх пула читателей (только SELECT)"""
+        return cls(session_factory=async_session_maker_read)
+
+    @property
+    def session(self):
+        if self._session is None:
+            self._session = self.session_factory()
+        return self._session
+
+    def __getattr__(self, name):
+        repository_cls = self.repositories.get(name)
+        if repository_cls is None:
+            raise AttributeError(name)
+        repository = repository_cls(self.session)
+        # Кладем в __dict__, чтобы следующие обращения не доходили до __getattr__
+        setattr(self, name, repository)
+        return repository
 
     async def __aenter__(self):
-        self.session = self.session_factory()
-        # TODO Добавить сюда созданные репозитории
-        # Пример:
-        self.users = UsersRepository(self.session)
-        self.items = ItemsRepository(self.session)
-        self.categories = CategoriesRepository(self.session)
-        self.locations = LocationsRepository(self.session)
-        self.messages = MessagesRepository(self.session)
-        self.reviews = ReviewsRepository(self.session)
-        self.roles = RolesRepository(self.session)
         return self
 
     async def __aexit__(self, *args):
-        await self.session.rollback()
-        await self.session.close()
+        DBManager.stats["total"] += 1
+        if self._session is None:
+            DBManager.stats["without_session"] += 1
+            return
+        await self._session.rollback()
+        await self._session.close()
 
     async def commit(self):
-        await self.session.commit()
+        if self._session is not None:
+            await self._session.commit()
+
+    async def rollback(self):
+        if self._session is not None:
+            await self._session.rollback()
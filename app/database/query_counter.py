@@ -0,0 +1,100 @@
+import logging
+import re
+import time
+from collections import Counter
+from contextvars import ContextVar
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+IN_LIST = re.compile(r"IN \((?:\?(?:, )?)+\)")
+SPACES = re.compile(r"\s+")
+
+
+class RequestQueryStats:
+    """Статистика SQL одного запроса к API"""
+
+    def __init__(self):
+        self.count = 0
+        self.total_time = 0.0
+        self.statements: Counter[str] = Counter()
+
+    def add(self, statement: str, duration: float) -> None:
+        self.count += 1
+        self.total_time += duration
+        self.statements[normalize_statement(statement)] += 1
+
+    def repeated(self, threshold: int) -> list[tuple[str, int]]:
+        return [(sql, n) for sql, n in self.statements.most_common() if n > threshold]
+
+
+current_query_stats: ContextVar[RequestQueryStats | None] = ContextVar(
+    "current_query_stats", default=None
+)
+
+
+def normalize_statement(statement: str) -> str:
+    # Списки IN (?, ?, ...) разной длины считаем одним и тем же запросом
+    return IN_LIST.sub("IN (...)", SPACES.sub(" ", statement).strip())
+
+
+def install_query_counter(engine: AsyncEngine) -> AsyncEngine:
+    """Вешает на движок хуки, считающие SQL текущего запроса к API"""
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        context._query_started_at = time.perf_counter()
+
+    @event.listens_for(engine.sync_engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        stats = current_query_stats.get()
+        if stats is not None:
+            stats.add(statement, time.perf_counter() - context._query_started_at)
+
+    return engine
+
+
+class QueryCounterMiddleware:
+    """
+    Считает SQL-запросы и время в БД на каждый HTTP-запрос.
+    В режиме DEBUG отдает их в заголовках X-DB-Query-Count / X-DB-Query-Time-Ms,
+    а одинаковые запросы сверх QUERY_REPEAT_THRESHOLD пишет в лог как возможный N+1.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestQueryStats()
+        token = current_query_stats.set(stats)
+
+        async def send_with_headers(message):
+            if message["type"] == "http.response.start" and settings.DEBUG:
+                headers = list(message.get("headers", []))
+                headers.append((b"x-db-query-count", str(stats.count).encode()))
+                headers.append(
+                    (b"x-db-query-time-ms", f"{stats.total_time * 1000:.2f}".encode())
+                )
+                message["headers"] = headers
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_headers)
+        finally:
+            current_query_stats.reset(token)
+            for statement, times in stats.repeated(settings.QUERY_REPEAT_THRESHOLD):
+                logger.warning(
+                    "Возможный N+1: %s %s выполнил один и тот же запрос %d раз: %s",
+                    scope["method"],
+                    scope["path"],
+                    times,
+                    statement,
+                )
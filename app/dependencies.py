@@ -1,7 +1,16 @@
-from app.database.database import async_session_maker
+from fastapi import Request
+
+from app.database.database import async_session_maker, async_session_maker_read
 from app.database.db_manager import DBManager
 
+READ_ONLY_METHODS = {"GET", "HEAD", "OPTIONS"}
+
 
-async def get_db():
-    async with DBManager(session_factory=async_session_maker) as db:
-        yield db
\ No newline at end of file
+async def get_db(request: Request):
+    # GET-ручки ходят в пул читателей и не встают в очередь за писателем
+    if request.method in READ_ONLY_METHODS:
+        session_factory = async_session_maker_read
+    else:
+        session_factory = async_session_maker
+    async with DBManager(session_factory=session_factory) as db:
+        yield db
@@ -21,6 +21,14 @@ class UserNotFoundError(MyAppError):
     detail = "Пользователя не существует"
 
 
+class TokenRevokedError(MyAppError):
+    detail = "Токен отозван"
+
+
+class RefreshTokenReusedError(MyAppError):
+    detail = "Refresh-токен уже использован, все сессии этого входа завершены"
+
+
 class InvalidTokenHTTPError(MyAppHTTPError):
     status_code = 401
     detail = "Неверный токен доступа"
@@ -31,6 +39,30 @@ class JWTTokenExpiredHTTPError(MyAppHTTPError):
     detail = "Токен истек, необходимо снова авторизоваться"
 
 
+class TokenRevokedHTTPError(MyAppHTTPError):
+    status_code = 401
+    detail = "Токен отозван, необходимо снова авторизоваться"
+
+
+class RefreshTokenReusedHTTPError(MyAppHTTPError):
+    status_code = 401
+    detail = "Refresh-токен уже использован, все сессии этого входа завершены"
+
+
+class NoRefreshTokenHTTPError(MyAppHTTPError):
+    status_code = 401
+    detail = "Вы не предоставили refresh-токен"
+
+
+class TooManyAttemptsHTTPError(MyAppHTTPError):
+    status_code = 429
+    detail = "Слишком много попыток, попробуйте позже"
+
+    def __init__(self, retry_after: int):
+        super().__init__()
+        self.headers = {"Retry-After": str(retry_after)}
+
+
 class NoAccessTokenHTTPError(MyAppHTTPError):
     detail = "Вы не предоставили токен доступа"
     status_code = 401
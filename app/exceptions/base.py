@@ -26,3 +26,12 @@ class ObjectAlreadyExistsError(MyAppError):
 
 class InvalidDateRangeError(MyAppError):
     detail = "Дата заезда не может быть позже даты выезда"
+
+
+class InvalidCursorError(MyAppError):
+    detail = "Неверный курсор пагинации"
+
+
+class InvalidCursorHTTPError(MyAppHTTPError):
+    status_code = 400
+    detail = "Неверный курсор пагинации"
@@ -35,4 +35,12 @@ class MessageAlreadyExistsError(MyAppError):
 
 class MessageAlreadyExistsHTTPError(MyAppHTTPError):
     status_code = 409
-    detail = "Сообщение уже существует"
\ No newline at end of file
+    detail = "Сообщение уже существует"
+
+class MessageToYourselfError(MyAppError):
+    detail = "Нельзя отправить сообщение самому себе"
+
+
+class MessageToYourselfHTTPError(MyAppHTTPError):
+    status_code = 400
+    detail = "Нельзя отправить сообщение самому себе"
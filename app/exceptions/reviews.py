@@ -16,4 +16,12 @@ class ReviewAlreadyExistsError(MyAppError):
 
 class ReviewAlreadyExistsHTTPError(MyAppHTTPError):
     status_code = 409
-    detail = "Отзыв от этого пользователя уже существует"
\ No newline at end of file
+    detail = "Отзыв от этого пользователя уже существует"
+
+class ReviewAccessDeniedError(MyAppError):
+    detail = "Изменять и удалять отзыв может только его автор"
+
+
+class ReviewAccessDeniedHTTPError(MyAppHTTPError):
+    status_code = 403
+    detail = "Изменять и удалять отзыв может только его автор"
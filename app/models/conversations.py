@@ -0,0 +1,41 @@
+# app/models/conversations.py
+from datetime import datetime
+
+from sqlalchemy import DateTime, ForeignKey, Index, Integer
+from sqlalchemy.orm import Mapped, mapped_column
+from app.database.database import Base
+
+
+class ConversationModel(Base):
+    """
+    Сводка чата двух пользователей по одному объявлению. Пара хранится
+    упорядоченной (user_low_id < user_high_id), поэтому у чата одна строка.
+    Указатель на последнее сообщение и счетчики полученных сообщений
+    обновляются при отправке в той же транзакции, что и само сообщение.
+    """
+    __tablename__ = "conversations"
+    __table_args__ = (
+        Index("ux_conversations_pair_item", "user_low_id", "user_high_id", "item_id", unique=True),
+        # Список чатов пользователя: по одному индексу на каждую сторону пары
+        Index("ix_conversations_low_last", "user_low_id", "last_message_at", "id"),
+        Index("ix_conversations_high_last", "user_high_id", "last_message_at", "id"),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    user_low_id: Mapped[int] = mapped_column(ForeignKey("users.id"), nullable=False)
+    user_high_id: Mapped[int] = mapped_column(ForeignKey("users.id"), nullable=False)
+    item_id: Mapped[int] = mapped_column(ForeignKey("items.id"), nullable=False)
+
+    # Без внешнего ключа: messages ссылается на conversations, цикл FK в SQLite не нужен
+    last_message_id: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    last_message_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+
+    # Прочтение - водяной знак на участника: сколько сообщений ему пришло,
+    # до какого счетчика и до какого сообщения он дочитал.
+    # Непрочитанные = received_* - read_*, флага на каждом сообщении нет
+    received_low: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    received_high: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    read_low: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    read_high: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    last_read_low_id: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    last_read_high_id: Mapped[int | None] = mapped_column(Integer, nullable=True)
@@ -0,0 +1,18 @@
+# app/models/item_facets.py
+from sqlalchemy import Boolean, Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
+from app.database.database import Base
+
+
+class ItemFacetCountModel(Base):
+    """
+    Счетчики объявлений по одному измерению фильтра (категория, локация,
+    состояние) с разбивкой по is_active. Ведутся триггерами на items
+    в той же транзакции, что и запись объявления.
+    """
+    __tablename__ = "item_facet_counts"
+
+    facet: Mapped[str] = mapped_column(String, primary_key=True)
+    value: Mapped[str] = mapped_column(String, primary_key=True)
+    is_active: Mapped[bool] = mapped_column(Boolean, primary_key=True)
+    count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
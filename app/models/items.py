@@ -1,5 +1,5 @@
 # app/models/items.py
-from sqlalchemy import Column, Integer, String, Text, Boolean, DateTime, ForeignKey
+from sqlalchemy import DDL, Column, Integer, String, Text, Boolean, DateTime, Float, ForeignKey, Index, event, text
 from sqlalchemy.orm import relationship, Mapped, mapped_column
 from datetime import datetime
 from app.database.database import Base
@@ -14,6 +14,41 @@ if TYPE_CHECKING:
 
 class ItemModel(Base):
     __tablename__ = "items"
+    __table_args__ = (
+        # Ленты объявлений: фильтр по одному полю + сортировка по (created_at, id)
+        Index("ix_items_created_at_id", "created_at", "id"),
+        # Инкрементальные выгрузки по updated_at
+        Index("ix_items_updated_at_id", "updated_at", "id"),
+        Index("ix_items_category_created", "category_id", "created_at", "id"),
+        Index("ix_items_location_created", "location_id", "created_at", "id"),
+        Index("ix_items_user_created", "user_id", "created_at", "id"),
+        # Частичные индексы только по активным объявлениям - основной сценарий витрины
+        Index(
+            "ix_items_active_created",
+            "created_at",
+            "id",
+            sqlite_where=text("is_active = 1"),
+        ),
+        Index(
+            "ix_items_active_category_created",
+            "category_id",
+            "created_at",
+            "id",
+            sqlite_where=text("is_active = 1"),
+        ),
+        Index(
+            "ix_items_active_location_created",
+            "location_id",
+            "created_at",
+            "id",
+            sqlite_where=text("is_active = 1"),
+        ),
+        # Ключ объявления во внешнем фиде - цель ON CONFLICT при массовой загрузке
+        Index("ux_items_source_external_id", "source", "external_id", unique=True),
+        # Фасеты при комбинированных фильтрах: GROUP BY по второму полю без чтения строк
+        Index("ix_items_category_location", "category_id", "location_id", "is_active"),
+        Index("ix_items_location_category", "location_id", "category_id", "is_active"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     title: Mapped[str] = mapped_column(String, nullable=False)
@@ -24,10 +59,110 @@ class ItemModel(Base):
     user_id: Mapped[int] = mapped_column(ForeignKey("users.id"), nullable=False)
     category_id: Mapped[int] = mapped_column(ForeignKey("categories.id"), nullable=False)
     location_id: Mapped[int] = mapped_column(ForeignKey("locations.id"), nullable=False)
+    source: Mapped[str] = mapped_column(String, nullable=True)
+    external_id: Mapped[str] = mapped_column(String, nullable=True)
+    # Собственная точка объявления; если не задана - используется точка локации
+    latitude: Mapped[float] = mapped_column(Float, nullable=True)
+    longitude: Mapped[float] = mapped_column(Float, nullable=True)
+    # Агрегаты отзывов, ведутся ReviewService в транзакции отзыва
+    rating_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    rating_sum: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    rating_1: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    rating_2: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    rating_3: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    rating_4: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    rating_5: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
 
     # Связи — через TYPE_CHECKING
     owner: Mapped["UserModel"] = relationship("UserModel", back_populates="items")
     category: Mapped["CategoryModel"] = relationship("CategoryModel", back_populates="items")
     location: Mapped["LocationModel"] = relationship("LocationModel", back_populates="items")
     reviews: Mapped[list["ReviewModel"]] = relationship("ReviewModel", back_populates="item")
-    messages: Mapped[list["MessageModel"]] = relationship("MessageModel", back_populates="item")
\ No newline at end of file
+    messages: Mapped[list["MessageModel"]] = relationship("MessageModel", back_populates="item")
+
+# Полнотекстовый поиск: внешняя FTS5-таблица поверх items, синхронизируется триггерами.
+# Русского стеммера в SQLite нет, поэтому слова запроса обрезаются до основы
+# (app.utils.search) и ищутся по префиксу, а prefix='2 3 4' держит для этого индекс.
+ITEMS_FTS_DDL = [
+    "CREATE VIRTUAL TABLE items_fts USING fts5("
+    "title, description, content='items', content_rowid='id', "
+    "tokenize='unicode61 remove_diacritics 2', prefix='2 3 4')",
+    # Заголовок весит больше описания
+    "INSERT INTO items_fts(items_fts, rank) VALUES ('rank', 'bm25(10.0, 1.0)')",
+    "CREATE TRIGGER items_fts_ai AFTER INSERT ON items BEGIN "
+    "INSERT INTO items_fts(rowid, title, description) "
+    "VALUES (new.id, new.title, new.description); END",
+    "CREATE TRIGGER items_fts_ad AFTER DELETE ON items BEGIN "
+    "INSERT INTO items_fts(items_fts, rowid, title, description) "
+    "VALUES ('delete', old.id, old.title, old.description); END",
+    "CREATE TRIGGER items_fts_au AFTER UPDATE OF title, description ON items BEGIN "
+    "INSERT INTO items_fts(items_fts, rowid, title, description) "
+    "VALUES ('delete', old.id, old.title, old.description); "
+    "INSERT INTO items_fts(rowid, title, description) "
+    "VALUES (new.id, new.title, new.description); END",
+]
+
+# Геопоиск: R-tree по точке объявления (своей или точке его локации).
+# Точка хранится вырожденным прямоугольником, триггеры держат индекс в актуальном
+# состоянии при изменении объявления и при переносе точки локации.
+ITEM_POINT_SQL = (
+    "SELECT new.latitude AS lat, new.longitude AS lon "
+    "WHERE new.latitude IS NOT NULL AND new.longitude IS NOT NULL "
+    "UNION ALL SELECT latitude, longitude FROM locations "
+    "WHERE id = new.location_id AND (new.latitude IS NULL OR new.longitude IS NULL)"
+)
+ITEMS_RTREE_DDL = [
+    "CREATE VIRTUAL TABLE items_rtree USING rtree(id, min_lat, max_lat, min_lon, max_lon)",
+    "CREATE TRIGGER items_rtree_ai AFTER INSERT ON items BEGIN "
+    "INSERT INTO items_rtree SELECT new.id, p.lat, p.lat, p.lon, p.lon "
+    f"FROM ({ITEM_POINT_SQL}) AS p WHERE p.lat IS NOT NULL AND p.lon IS NOT NULL; END",
+    "CREATE TRIGGER items_rtree_au AFTER UPDATE OF latitude, longitude, location_id ON items "
+    "BEGIN DELETE FROM items_rtree WHERE id = old.id; "
+    "INSERT INTO items_rtree SELECT new.id, p.lat, p.lat, p.lon, p.lon "
+    f"FROM ({ITEM_POINT_SQL}) AS p WHERE p.lat IS NOT NULL AND p.lon IS NOT NULL; END",
+    "CREATE TRIGGER items_rtree_ad AFTER DELETE ON items BEGIN "
+    "DELETE FROM items_rtree WHERE id = old.id; END",
+    "CREATE TRIGGER locations_rtree_au AFTER UPDATE OF latitude, longitude ON locations BEGIN "
+    "DELETE FROM items_rtree WHERE id IN (SELECT id FROM items WHERE location_id = new.id "
+    "AND (latitude IS NULL OR longitude IS NULL)); "
+    "INSERT INTO items_rtree SELECT id, new.latitude, new.latitude, new.longitude, new.longitude "
+    "FROM items WHERE location_id = new.id AND (latitude IS NULL OR longitude IS NULL) "
+    "AND new.latitude IS NOT NULL AND new.longitude IS NOT NULL; END",
+]
+
+# Счетчики для фасетов (app.models.item_facets): -1 старой строке, +1 новой
+FACET_COLUMNS = ("category_id", "location_id", "condition")
+
+
+def facet_count_sql(row: str, delta: int) -> str:
+    return "".join(
+        "INSERT INTO item_facet_counts (facet, value, is_active, count) "
+        f"SELECT '{column}', {row}.{column}, COALESCE({row}.is_active, 0), {delta} "
+        f"WHERE {row}.{column} IS NOT NULL "
+        "ON CONFLICT (facet, value, is_active) DO UPDATE SET count = count + excluded.count; "
+        for column in FACET_COLUMNS
+    )
+
+
+ITEMS_FACETS_DDL = [
+    "CREATE TRIGGER items_facets_ai AFTER INSERT ON items BEGIN "
+    f"{facet_count_sql('new', 1)}END",
+    "CREATE TRIGGER items_facets_ad AFTER DELETE ON items BEGIN "
+    f"{facet_count_sql('old', -1)}END",
+    "CREATE TRIGGER items_facets_au "
+    f"AFTER UPDATE OF {', '.join(FACET_COLUMNS)}, is_active ON items BEGIN "
+    f"{facet_count_sql('old', -1)}{facet_count_sql('new', 1)}END",
+]
+
+for _ddl in ITEMS_FTS_DDL + ITEMS_RTREE_DDL + ITEMS_FACETS_DDL:
+    event.listen(ItemModel.__table__, "after_create", DDL(_ddl).execute_if(dialect="sqlite"))
+event.listen(
+    ItemModel.__table__,
+    "before_drop",
+    DDL("DROP TABLE IF EXISTS items_fts").execute_if(dialect="sqlite"),
+)
+event.listen(
+    ItemModel.__table__,
+    "before_drop",
+    DDL("DROP TABLE IF EXISTS items_rtree").execute_if(dialect="sqlite"),
+)
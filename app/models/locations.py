@@ -1,5 +1,5 @@
 # app/models/locations.py
-from sqlalchemy import Column, Integer, String
+from sqlalchemy import Column, Float, Integer, String, Index
 from sqlalchemy.orm import relationship, Mapped, mapped_column
 from app.database.database import Base
 from typing import TYPE_CHECKING
@@ -9,10 +9,17 @@ if TYPE_CHECKING:
 
 class LocationModel(Base):
     __tablename__ = "locations"
+    __table_args__ = (
+        Index("ix_locations_created_at_id", "created_at", "id"),
+        Index("ix_locations_city_created", "city", "created_at", "id"),
+        Index("ix_locations_region_created", "region", "created_at", "id"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     city: Mapped[str] = mapped_column(String, nullable=False)
     region: Mapped[str] = mapped_column(String, nullable=False)
+    latitude: Mapped[float] = mapped_column(Float, nullable=True)
+    longitude: Mapped[float] = mapped_column(Float, nullable=True)
 
     # Связь — через TYPE_CHECKING
     items: Mapped[list["ItemModel"]] = relationship("ItemModel", back_populates="location")
\ No newline at end of file
@@ -1,5 +1,5 @@
 # app/models/messages.py
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Index
 from sqlalchemy.orm import relationship, Mapped, mapped_column
 from datetime import datetime
 from app.database.database import Base
@@ -11,6 +11,16 @@ if TYPE_CHECKING:
 
 class MessageModel(Base):
     __tablename__ = "messages"
+    __table_args__ = (
+        # Переписка: (sender, recipient) в обе стороны, сортировка по времени
+        Index("ix_messages_sender_recipient_created", "sender_id", "recipient_id", "created_at", "id"),
+        # История чата
+        Index("ix_messages_conversation_created", "conversation_id", "created_at", "id"),
+        # Входящие пользователя
+        Index("ix_messages_recipient_created", "recipient_id", "created_at", "id"),
+        # Инкрементальные выгрузки по updated_at
+        Index("ix_messages_updated_at_id", "updated_at", "id"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     text: Mapped[str] = mapped_column(String, nullable=False)
@@ -20,6 +30,7 @@ class MessageModel(Base):
     sender_id: Mapped[int] = mapped_column(ForeignKey("users.id"), nullable=False)
     recipient_id: Mapped[int] = mapped_column(ForeignKey("users.id"), nullable=False)
     item_id: Mapped[int] = mapped_column(ForeignKey("items.id"), nullable=False)
+    conversation_id: Mapped[int | None] = mapped_column(ForeignKey("conversations.id"), nullable=True)
 
     # Связи — через TYPE_CHECKING
     sender: Mapped["UserModel"] = relationship("UserModel", foreign_keys="MessageModel.sender_id", back_populates="sent_messages")
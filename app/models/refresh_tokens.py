@@ -0,0 +1,50 @@
+# app/models/refresh_tokens.py
+from datetime import datetime
+
+from sqlalchemy import DDL, DateTime, ForeignKey, Index, String, event
+from sqlalchemy.orm import Mapped, mapped_column
+from app.database.database import Base
+
+
+class RefreshTokenModel(Base):
+    """
+    Выданные refresh-токены. Каждый используется один раз: обмен на новую пару
+    помечает его used_at. Все токены одной цепочки обменов - семейство
+    (family_id = jti первого токена). Повторное предъявление уже использованного
+    токена значит, что он утек, и отзывает все семейство.
+    """
+    __tablename__ = "refresh_tokens"
+    __table_args__ = (
+        Index("ix_refresh_tokens_family_revoked", "family_id", "revoked_at"),
+        # Воркеры подтягивают свежие отзывы по времени
+        Index("ix_refresh_tokens_revoked_at", "revoked_at"),
+        # Отзыв всех семейств удаленного пользователя
+        Index("ix_refresh_tokens_user_id", "user_id"),
+    )
+
+    jti: Mapped[str] = mapped_column(String(32), primary_key=True)
+    family_id: Mapped[str] = mapped_column(String(32), nullable=False)
+    user_id: Mapped[int] = mapped_column(ForeignKey("users.id"), nullable=False)
+    expires_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+    used_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+    revoked_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+
+
+# Удаленный пользователь теряет все сессии: его семейства отзываются, и воркеры
+# узнают об этом обычным опросом отзывов (app.utils.revocation).
+# %% - экранирование для DDL; '000' дополняет дробную часть до формата SQLAlchemy
+USERS_REVOKE_TOKENS_DDL = (
+    "CREATE TRIGGER users_refresh_tokens_ad AFTER DELETE ON users BEGIN "
+    "UPDATE refresh_tokens SET revoked_at = strftime('%%Y-%%m-%%d %%H:%%M:%%f', 'now') || '000' "
+    "WHERE user_id = old.id AND revoked_at IS NULL; END"
+)
+event.listen(
+    RefreshTokenModel.__table__,
+    "after_create",
+    DDL(USERS_REVOKE_TOKENS_DDL).execute_if(dialect="sqlite"),
+)
+event.listen(
+    RefreshTokenModel.__table__,
+    "before_drop",
+    DDL("DROP TRIGGER IF EXISTS users_refresh_tokens_ad").execute_if(dialect="sqlite"),
+)
@@ -1,5 +1,5 @@
 # app/models/reviews.py
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Index
 from sqlalchemy.orm import relationship, Mapped, mapped_column
 from datetime import datetime
 from app.database.database import Base
@@ -11,6 +11,11 @@ if TYPE_CHECKING:
 
 class ReviewModel(Base):
     __tablename__ = "reviews"
+    __table_args__ = (
+        Index("ix_reviews_item_created", "item_id", "created_at", "id"),
+        Index("ix_reviews_user_created", "user_id", "created_at", "id"),
+        Index("ix_reviews_updated_at_id", "updated_at", "id"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     rating: Mapped[int] = mapped_column(Integer, nullable=False)  # 1-5
@@ -1,8 +1,9 @@
 # app/models/users.py
 from os import name
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey
+from sqlalchemy import DDL, Column, Integer, String, Boolean, DateTime, Float, ForeignKey, event
 from sqlalchemy.orm import relationship, Mapped, mapped_column
 from datetime import datetime
+from app.config import settings
 from app.database.database import Base
 from typing import TYPE_CHECKING
 
@@ -21,7 +22,24 @@ class UserModel(Base):
     phone: Mapped[str] = mapped_column(String, nullable=True)
     hashed_password: Mapped[str] = mapped_column(String(300), nullable=False)
     is_verified: Mapped[bool] = mapped_column(Boolean, default=False)
-    role_id: Mapped[int] = mapped_column(ForeignKey("roles.id"), nullable=True)
+    role_id: Mapped[int] = mapped_column(ForeignKey("roles.id"), nullable=True, index=True)
+    # Версия роли попадает в access-токен: если она выросла после выдачи токена,
+    # claims о роли устарели (app.utils.role_stamps)
+    role_version: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    role_changed_at: Mapped[datetime] = mapped_column(DateTime, nullable=True, index=True)
+    # Рейтинг доверия (app.utils.trust). Хранятся затухшие суммы весов и взвешенных
+    # оценок на момент trust_decayed_at, чтобы новый отзыв учитывался без пересчета
+    trust_score: Mapped[float] = mapped_column(
+        Float,
+        nullable=False,
+        default=settings.TRUST_PRIOR_MEAN,
+        server_default=str(settings.TRUST_PRIOR_MEAN),
+    )
+    trust_weight: Mapped[float] = mapped_column(Float, nullable=False, default=0.0, server_default="0")
+    trust_weighted_sum: Mapped[float] = mapped_column(
+        Float, nullable=False, default=0.0, server_default="0"
+    )
+    trust_decayed_at: Mapped[datetime] = mapped_column(DateTime, nullable=True)
 
     # Связи — через TYPE_CHECKING
     role: Mapped["RoleModel"] = relationship("RoleModel", back_populates="users")
@@ -37,4 +55,20 @@ class UserModel(Base):
     )
     received_messages: Mapped[list["MessageModel"]] = relationship(
         "MessageModel", foreign_keys="MessageModel.recipient_id", back_populates="recipient"
-    )
\ No newline at end of file
+    )
+
+
+# Любая запись нового role_id (PUT /admin/users, ручной SQL) поднимает версию роли,
+# иначе токены со старой ролью оставались бы в силе до своего exp
+# (%% - экранирование для DDL; '000' дополняет дробную часть до формата SQLAlchemy)
+USERS_ROLE_VERSION_DDL = (
+    "CREATE TRIGGER users_role_version_au AFTER UPDATE OF role_id ON users "
+    "WHEN old.role_id IS NOT new.role_id BEGIN "
+    "UPDATE users SET role_version = role_version + 1, "
+    "role_changed_at = strftime('%%Y-%%m-%%d %%H:%%M:%%f', 'now') || '000' WHERE id = new.id; END"
+)
+event.listen(
+    UserModel.__table__,
+    "after_create",
+    DDL(USERS_ROLE_VERSION_DDL).execute_if(dialect="sqlite"),
+)
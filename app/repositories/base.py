@@ -1,10 +1,52 @@
-from pydantic import BaseModel
-from sqlalchemy import delete, insert, select, update
+import itertools
+from datetime import datetime
+from functools import lru_cache
+from typing import AsyncIterator, Iterable, Iterator, Literal, Sequence
+
+from pydantic import BaseModel, TypeAdapter
+from sqlalchemy import RowMapping, Select, String, delete, func, insert, literal, select, tuple_, update
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.exc import IntegrityError
 
 
 from app.database.database import Base
 from app.exceptions.base import ObjectAlreadyExistsError
+from app.utils.pagination import decode_cursor, encode_cursor
+
+# Лимит переменных в одном запросе SQLite (SQLITE_MAX_VARIABLE_NUMBER, 3.32+)
+SQLITE_MAX_VARIABLES = 32766
+BULK_CHUNK_ROWS = 5000
+STREAM_BATCH_ROWS = 500
+
+
+def chunked(rows: Iterable[dict], size: int) -> Iterator[list[dict]]:
+    iterator = iter(rows)
+    while chunk := list(itertools.islice(iterator, size)):
+        yield chunk
+
+
+def comparable_literal(value, type_):
+    """
+    Значение для сравнения с колонкой. server_default (CURRENT_TIMESTAMP) пишет
+    время без долей секунды, а SQLite сравнивает даты как строки - поэтому
+    время без микросекунд передаем в том же виде, что и в БД.
+    """
+    if isinstance(value, datetime) and not value.microsecond:
+        return literal(value.strftime("%Y-%m-%d %H:%M:%S"), String)
+    return literal(value, type_)
+
+
+@lru_cache
+def list_adapter(schema: type[BaseModel]) -> TypeAdapter:
+    """Валидатор списка схем: строится один раз на схему"""
+    return TypeAdapter(list[schema])
+
+
+@lru_cache
+def projection_columns(model: type[Base], schema: type[BaseModel], extra: tuple[str, ...] = ()):
+    """Колонки таблицы, которые есть в схеме ответа (плюс extra, например ключ сортировки)"""
+    names = set(schema.model_fields) | set(extra)
+    return tuple(col for col in model.__table__.columns if col.name in names)
 
 
 class BaseRepository:
@@ -14,22 +56,48 @@ class BaseRepository:
     def __init__(self, session):
         self.session = session
 
+    def select_for_schema(
+        self,
+        projection: bool = True,
+        sort_keys: Sequence[str] = (),
+        schema: type[BaseModel] | None = None,
+    ):
+        """
+        SELECT под схему ответа (по умолчанию - схему репозитория). В режиме
+        projection выбираются только нужные схеме колонки, без сборки
+        ORM-объектов и identity map.
+        """
+        if projection:
+            return select(
+                *projection_columns(self.model, schema or self.schema, tuple(sort_keys))
+            )
+        return select(self.model)
+
+    def validate_rows(self, rows, schema: type[BaseModel] | None = None) -> list[BaseModel]:
+        """Валидирует всю выборку за один вызов pydantic-core"""
+        return list_adapter(schema or self.schema).validate_python(rows, from_attributes=True)
+
     async def get_filtered(
         self,
         limit: int | None = None,
         offset: int | None = None,
         *filter,
+        projection: bool = True,
         **filter_by,
     ) -> list[BaseModel]:
         filter_by = {k: v for k, v in filter_by.items() if v is not None}
         filter_ = [v for v in filter if v is not None]
 
-        query = select(self.model).filter(*filter_).filter_by(**filter_by)
+        query = self.select_for_schema(projection).filter(*filter_).filter_by(**filter_by)
 
-        if limit is not None and offset is not None:
-            query = query.limit(limit).offset(offset)
+        if limit is not None:
+            query = query.limit(limit)
+        if offset is not None:
+            query = query.offset(offset)
         # print(query.compile(bind=engine, compile_kwargs={"literal_binds": True}))
         result = await self.session.execute(query)
+        if projection:
+            return self.validate_rows(result.all())
         result = [
             self.schema.model_validate(model, from_attributes=True)
             for model in result.scalars().all()
@@ -37,6 +105,159 @@ class BaseRepository:
 
         return result
 
+    def keyset_order_by(
+        self, sort_keys: tuple[str, ...] = ("created_at", "id"), descending: bool = True
+    ) -> list:
+        columns = [getattr(self.model, key) for key in sort_keys]
+        return [col.desc() if descending else col.asc() for col in columns]
+
+    def keyset_filter(
+        self,
+        cursor: str | None,
+        sort_keys: tuple[str, ...] = ("created_at", "id"),
+        descending: bool = True,
+    ) -> list:
+        """Условие "строго после курсора" для WHERE (пустой список без курсора)"""
+        if cursor is None:
+            return []
+        columns = [getattr(self.model, key) for key in sort_keys]
+        values = tuple_(
+            *(
+                comparable_literal(value, col.type)
+                for col, value in zip(
+                    columns, decode_cursor(cursor, [col.type.python_type for col in columns])
+                )
+            )
+        )
+        key = tuple_(*columns)
+        return [key < values if descending else key > values]
+
+    async def fetch_page(
+        self,
+        query,
+        limit: int,
+        offset: int | None = None,
+        sort_keys: tuple[str, ...] = ("created_at", "id"),
+        projection: bool = True,
+    ) -> tuple[list[BaseModel], str | None]:
+        """
+        Выполняет упорядоченный запрос и считает курсор следующей страницы.
+        query должен быть построен через select_for_schema с тем же projection.
+        """
+        if offset is not None:
+            query = query.limit(limit).offset(offset)
+        else:
+            # Берем на одну строку больше, чтобы понять, есть ли следующая страница
+            query = query.limit(limit + 1)
+        if not projection and not isinstance(query, Select):
+            # UNION и прочие составные запросы превращаем обратно в ORM-сущности
+            query = select(self.model).from_statement(query)
+
+        result = await self.session.execute(query)
+        rows = result.all() if projection else result.scalars().all()
+
+        next_cursor = None
+        if offset is None and len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor([getattr(rows[-1], key) for key in sort_keys])
+
+        if projection:
+            return self.validate_rows(rows), next_cursor
+        return [
+            self.schema.model_validate(model, from_attributes=True) for model in rows
+        ], next_cursor
+
+    async def get_page(
+        self,
+        *filter,
+        limit: int = 100,
+        cursor: str | None = None,
+        offset: int | None = None,
+        sort_keys: tuple[str, ...] = ("created_at", "id"),
+        descending: bool = True,
+        projection: bool = True,
+        **filter_by,
+    ) -> tuple[list[BaseModel], str | None]:
+        """
+        Постраничная выборка по ключу сортировки (keyset).
+        Курсор хранит ключ последней отданной строки, поэтому любая страница
+        стоит одинаково. Если передан offset - работает старый режим LIMIT/OFFSET
+        без курсора следующей страницы.
+        """
+        if offset is None:
+            filter += tuple(self.keyset_filter(cursor, sort_keys, descending))
+        query = self.build_list_query(
+            *filter,
+            sort_keys=sort_keys,
+            descending=descending,
+            projection=projection,
+            **filter_by,
+        )
+        return await self.fetch_page(query, limit, offset, sort_keys, projection)
+
+    def build_list_query(
+        self,
+        *filter,
+        sort_keys: tuple[str, ...] = ("created_at", "id"),
+        descending: bool = True,
+        projection: bool = True,
+        schema: type[BaseModel] | None = None,
+        **filter_by,
+    ):
+        filter_by = {k: v for k, v in filter_by.items() if v is not None}
+        filter_ = [v for v in filter if v is not None]
+        return (
+            self.select_for_schema(projection, sort_keys, schema)
+            .filter(*filter_)
+            .filter_by(**filter_by)
+            .order_by(*self.keyset_order_by(sort_keys, descending))
+        )
+
+    async def stream_json(
+        self,
+        *filter,
+        sort_keys: tuple[str, ...] = ("created_at", "id"),
+        descending: bool = True,
+        batch_size: int = STREAM_BATCH_ROWS,
+        schema: type[BaseModel] | None = None,
+        **filter_by,
+    ) -> AsyncIterator[bytes]:
+        """
+        Отдает всю выборку JSON-массивом по кускам: строки читаются с серверного
+        курсора пачками по batch_size, поэтому память не растет с размером выборки.
+        schema - схема строк ответа, если отдавать нужно не все поля схемы репозитория.
+        """
+        schema = schema or self.schema
+        query = self.build_list_query(
+            *filter, sort_keys=sort_keys, descending=descending, schema=schema, **filter_by
+        )
+        adapter = list_adapter(schema)
+        result = await self.session.stream(query.execution_options(yield_per=batch_size))
+
+        yield b"["
+        separator = b""
+        async for rows in result.partitions():
+            # dump_json дает "[...]" - отрезаем скобки и склеиваем пачки через запятую
+            yield separator + adapter.dump_json(self.validate_rows(rows, schema))[1:-1]
+            separator = b","
+        yield b"]"
+
+    async def stream_table_rows(
+        self,
+        *filter,
+        sort_keys: tuple[str, ...] = ("id",),
+        batch_size: int = STREAM_BATCH_ROWS,
+    ) -> AsyncIterator[Sequence[RowMapping]]:
+        """Все колонки таблицы пачками с серверного курсора, без схем ответа (для выгрузок)"""
+        query = (
+            select(self.model.__table__)
+            .filter(*[v for v in filter if v is not None])
+            .order_by(*self.keyset_order_by(sort_keys, descending=False))
+        )
+        result = await self.session.stream(query.execution_options(yield_per=batch_size))
+        async for rows in result.mappings().partitions():
+            yield rows
+
     async def get_all(self, *args, **kwargs) -> list[BaseModel]:
         """Возращает все записи в БД из связаной таблицы"""
         return await self.get_filtered(*args, **kwargs)
@@ -69,13 +290,62 @@ class BaseRepository:
         except IntegrityError as exc:
             raise ObjectAlreadyExistsError from exc
 
-    async def add_bulk(self, data: list[BaseModel]) -> None | BaseModel:
+    async def add_bulk(
+        self,
+        data: Iterable[BaseModel],
+        on_conflict: Literal["update", "nothing"] | None = None,
+        conflict_keys: Sequence[str] = (),
+        returning: bool = False,
+        extra_values: dict | None = None,
+        chunk_size: int | None = None,
+    ) -> tuple[int, list[int] | None]:
         """
-        Метод для множественного добавления данных в таблицу
+        Метод для множественного добавления данных в таблицу.
+        Строки уходят пачками через executemany; размер пачки подбирается
+        под лимит переменных SQLite, поэтому данные можно отдавать генератором.
+        on_conflict включает upsert по уникальному ключу conflict_keys:
+        "update" перезаписывает строку, "nothing" пропускает ее.
+        Возвращает число реально записанных строк (пропущенные при "nothing"
+        не считаются) и, с returning=True, id вставленных/обновленных строк.
         """
-        add_stmt = insert(self.model).values([item.model_dump() for item in data])
-        # print(add_stmt.compile(compile_kwargs={"literal_binds": True}))
-        await self.session.execute(add_stmt)
+        rows = (item.model_dump() | (extra_values or {}) for item in data)
+        first = next(rows, None)
+        if first is None:
+            return 0, [] if returning else None
+        if chunk_size is None:
+            chunk_size = max(1, min(BULK_CHUNK_ROWS, SQLITE_MAX_VARIABLES // len(first)))
+
+        add_stmt = sqlite_insert(self.model.__table__)
+        if on_conflict == "update":
+            add_stmt = add_stmt.on_conflict_do_update(
+                index_elements=list(conflict_keys),
+                set_={
+                    key: add_stmt.excluded[key]
+                    for key in first
+                    if key not in conflict_keys
+                }
+                | {"updated_at": func.now()},
+            )
+        elif on_conflict == "nothing":
+            add_stmt = add_stmt.on_conflict_do_nothing(index_elements=list(conflict_keys))
+        if returning:
+            add_stmt = add_stmt.returning(self.model.__table__.c.id)
+
+        ids = []
+        written = 0
+        try:
+            for chunk in chunked(itertools.chain([first], rows), chunk_size):
+                result = await self.session.execute(add_stmt, chunk)
+                if returning:
+                    ids.extend(result.scalars().all())
+                else:
+                    written += result.rowcount
+        except IntegrityError as exc:
+            raise ObjectAlreadyExistsError from exc
+
+        if returning:
+            return len(ids), ids
+        return written, None
 
     async def delete(self, *filters, **filter_by) -> None:
         delete_stmt = delete(self.model)
@@ -85,7 +355,6 @@ class BaseRepository:
             delete_stmt = delete_stmt.filter_by(**filter_by)
 
         await self.session.execute(delete_stmt)
-        await self.session.commit()
 
     async def edit(
         self, data: BaseModel, exclude_unset: bool = False, **filter_by
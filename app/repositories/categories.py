@@ -1,7 +1,8 @@
 # app/repositories/category_repository.py
-from sqlalchemy import select
+from sqlalchemy import and_, func, select, true
 from sqlalchemy.orm import selectinload
 from app.models.categories import CategoryModel
+from app.models.items import ItemModel
 from app.schemes.categories import SCategoryGet, SCategoryGetWithItems
 from .base import BaseRepository
 
@@ -24,4 +25,17 @@ class CategoriesRepository(BaseRepository):
             return None
 
         result = SCategoryGetWithItems.model_validate(model, from_attributes=True)
-        return result
\ No newline at end of file
+        return result
+
+    async def get_active_item_counts(self) -> list[tuple[int, str, int]]:
+        """Категории с числом активных объявлений (для индекса подсказок)"""
+        query = (
+            select(self.model.id, self.model.name, func.count(ItemModel.id))
+            .outerjoin(
+                ItemModel,
+                and_(ItemModel.category_id == self.model.id, ItemModel.is_active == true()),
+            )
+            .group_by(self.model.id)
+        )
+        result = await self.session.execute(query)
+        return [tuple(row) for row in result.all()]
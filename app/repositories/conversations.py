@@ -0,0 +1,198 @@
+# app/repositories/conversations.py
+from datetime import datetime
+
+from sqlalchemy import case, func, or_, select, union_all, update
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+from app.models.conversations import ConversationModel as Conversation
+from app.models.messages import MessageModel
+from app.models.users import UserModel
+from app.schemes.messages import SConversationList, SConversationRecord, SMessageGet
+from app.utils.pagination import encode_cursor
+from .base import BaseRepository
+
+INBOX_SORT_KEYS = ("last_message_at", "id")
+
+
+class ConversationsRepository(BaseRepository):
+    model = Conversation
+    schema = SConversationRecord
+
+    async def touch(
+        self, sender_id: int, recipient_id: int, item_id: int, sent_at: datetime
+    ) -> int:
+        """
+        Upsert чата при отправке одним запросом по уникальному ключу (пара, объявление):
+        время последнего сообщения, +1 к полученным у получателя. Отправитель
+        ответом подтверждает, что прочитал все, что ему пришло до этого.
+        Возвращает id чата.
+        """
+        user_low_id, user_high_id = sorted((sender_id, recipient_id))
+        recipient = "high" if recipient_id == user_high_id else "low"
+        sender = "low" if recipient == "high" else "high"
+        stmt = sqlite_insert(Conversation).values(
+            user_low_id=user_low_id,
+            user_high_id=user_high_id,
+            item_id=item_id,
+            last_message_at=sent_at,
+            **{f"received_{recipient}": 1},
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["user_low_id", "user_high_id", "item_id"],
+            set_={
+                "last_message_at": sent_at,
+                f"received_{recipient}": getattr(Conversation, f"received_{recipient}") + 1,
+                f"read_{sender}": getattr(Conversation, f"received_{sender}"),
+                f"last_read_{sender}_id": Conversation.last_message_id,
+                "updated_at": func.now(),
+            },
+        ).returning(Conversation.id)
+        return (await self.session.execute(stmt)).scalar_one()
+
+    async def set_last_message(self, conversation_id: int, message_id: int) -> None:
+        await self.session.execute(
+            update(Conversation)
+            .where(Conversation.id == conversation_id)
+            .values(last_message_id=message_id)
+        )
+
+    async def mark_read(self, conversation_id: int, user_id: int):
+        """
+        Весь чат прочитан участником user_id: водяной знак переезжает
+        на последнее сообщение одним UPDATE. Возвращает участников и новый
+        водяной знак, None - чата нет или он чужой.
+        """
+        is_low = Conversation.user_low_id == user_id
+        result = await self.session.execute(
+            update(Conversation)
+            .where(
+                Conversation.id == conversation_id,
+                or_(is_low, Conversation.user_high_id == user_id),
+            )
+            .values(
+                read_low=case((is_low, Conversation.received_low), else_=Conversation.read_low),
+                read_high=case((is_low, Conversation.read_high), else_=Conversation.received_high),
+                last_read_low_id=case(
+                    (is_low, Conversation.last_message_id), else_=Conversation.last_read_low_id
+                ),
+                last_read_high_id=case(
+                    (is_low, Conversation.last_read_high_id), else_=Conversation.last_message_id
+                ),
+            )
+            .returning(
+                Conversation.user_low_id, Conversation.user_high_id, Conversation.last_message_id
+            )
+        )
+        return result.first()
+
+    async def forget_message(self, conversation: SConversationRecord, message: SMessageGet) -> None:
+        """
+        Учитывает удаление сообщения: счетчики получателя (и прочитанных, если
+        сообщение было до его водяного знака) и указатель на последнее оставшееся.
+        Водяной знак на удаленном сообщении отступает к предыдущему: SQLite
+        отдает максимальный rowid заново, если удалена последняя строка таблицы,
+        и новое сообщение с тем же id иначе сочлось бы прочитанным.
+        """
+        side = "low" if message.recipient_id == conversation.user_low_id else "high"
+        last_read_id = getattr(conversation, f"last_read_{side}_id")
+        values = {f"received_{side}": getattr(Conversation, f"received_{side}") - 1}
+        if last_read_id is not None and message.id <= last_read_id:
+            values[f"read_{side}"] = getattr(Conversation, f"read_{side}") - 1
+
+        previous_id = (
+            select(func.max(MessageModel.id))
+            .where(MessageModel.conversation_id == conversation.id, MessageModel.id < message.id)
+            .scalar_subquery()
+        )
+        for watermark in ("last_read_low_id", "last_read_high_id"):
+            if getattr(conversation, watermark) == message.id:
+                values[watermark] = previous_id
+
+        last = (
+            select(MessageModel.id, MessageModel.created_at)
+            .where(MessageModel.conversation_id == conversation.id)
+            .order_by(MessageModel.created_at.desc(), MessageModel.id.desc())
+            .limit(1)
+        )
+        values |= {
+            "last_message_id": last.with_only_columns(MessageModel.id).scalar_subquery(),
+            "last_message_at": last.with_only_columns(MessageModel.created_at).scalar_subquery(),
+        }
+        await self.session.execute(
+            update(Conversation).where(Conversation.id == conversation.id).values(**values)
+        )
+
+    def inbox_query(self, user_id: int, *filter):
+        """
+        Чаты пользователя с собеседником, текстом последнего сообщения и своими
+        непрочитанными. Каждая сторона пары - отдельная ветка UNION ALL по индексу
+        (user_*_id, last_message_at, id), остальное - поиск по первичным ключам.
+        """
+        sides = []
+        for own, partner, unread in (
+            (
+                Conversation.user_low_id,
+                Conversation.user_high_id,
+                Conversation.received_low - Conversation.read_low,
+            ),
+            (
+                Conversation.user_high_id,
+                Conversation.user_low_id,
+                Conversation.received_high - Conversation.read_high,
+            ),
+        ):
+            sides.append(
+                select(
+                    # Явные метки: ORDER BY составного запроса ссылается на имена колонок
+                    Conversation.id.label("id"),
+                    Conversation.item_id,
+                    partner.label("partner_id"),
+                    UserModel.name.label("partner"),
+                    func.coalesce(MessageModel.text, "").label("last_message"),
+                    unread.label("unread"),
+                    Conversation.last_message_at.label("last_message_at"),
+                )
+                .join(UserModel, UserModel.id == partner)
+                .outerjoin(MessageModel, MessageModel.id == Conversation.last_message_id)
+                .where(own == user_id, *filter)
+            )
+        return union_all(*sides)
+
+    async def get_inbox(
+        self,
+        user_id: int,
+        limit: int = 100,
+        cursor: str | None = None,
+        offset: int | None = None,
+    ) -> tuple[list[SConversationList], str | None]:
+        after = self.keyset_filter(cursor, INBOX_SORT_KEYS) if offset is None else []
+        query = self.inbox_query(user_id, *after).order_by(*self.keyset_order_by(INBOX_SORT_KEYS))
+        if offset is not None:
+            query = query.limit(limit).offset(offset)
+        else:
+            query = query.limit(limit + 1)
+        rows = (await self.session.execute(query)).all()
+
+        next_cursor = None
+        if offset is None and len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor([getattr(rows[-1], key) for key in INBOX_SORT_KEYS])
+        return [
+            SConversationList(
+                id=row.id,
+                item_id=row.item_id,
+                partner_id=row.partner_id,
+                partner=row.partner,
+                last_message=row.last_message,
+                unread=row.unread,
+                time=row.last_message_at.isoformat() if row.last_message_at else "",
+            )
+            for row in rows
+        ], next_cursor
+
+    async def get_summary(self, conversation_id: int, user_id: int):
+        """Строка списка чатов для одного чата (None, если пользователь не участник)"""
+        result = await self.session.execute(
+            self.inbox_query(user_id, Conversation.id == conversation_id)
+        )
+        return result.first()
@@ -1,9 +1,48 @@
 # app/repositories/item_repository.py
-from sqlalchemy import select
+import math
+from typing import Optional, Sequence
+
+from sqlalchemy import case, column, func, literal_column, select, table, true, update
 from sqlalchemy.orm import selectinload
+from app.models.item_facets import ItemFacetCountModel
 from app.models.items import ItemModel
-from app.schemes.items import SItemGet, SItemGetWithRels
-from .base import BaseRepository
+from app.models.reviews import ReviewModel
+from app.schemes.items import (
+    SFacetCount,
+    SItemFacets,
+    SItemGet,
+    SItemGetWithRels,
+    SItemNearby,
+    SItemSearchHit,
+)
+from .base import (
+    SQLITE_MAX_VARIABLES,
+    BaseRepository,
+    chunked,
+    list_adapter,
+    projection_columns,
+)
+
+items_fts = table("items_fts", column("rowid"), column("rank"))
+HIGHLIGHT_OPEN = "<mark>"
+HIGHLIGHT_CLOSE = "</mark>"
+SNIPPET_TOKENS = 16
+
+items_rtree = table(
+    "items_rtree",
+    column("id"),
+    column("min_lat"),
+    column("max_lat"),
+    column("min_lon"),
+    column("max_lon"),
+)
+KM_PER_DEGREE = 111.32
+
+RATINGS = range(1, 6)
+
+FACETS = ("category_id", "location_id", "condition")
+# Измерения, значения которых в таблице счетчиков хранятся строкой
+INT_FACETS = {"category_id", "location_id"}
 
 
 class ItemsRepository(BaseRepository):
@@ -39,4 +78,230 @@ class ItemsRepository(BaseRepository):
         result = await self.session.execute(query)
         models = result.scalars().all()
 
-        return [SItemGetWithRels.model_validate(m, from_attributes=True) for m in models]
\ No newline at end of file
+        return [SItemGetWithRels.model_validate(m, from_attributes=True) for m in models]
+
+    async def search(
+        self,
+        match: str,
+        category_id: Optional[int] = None,
+        location_id: Optional[int] = None,
+        limit: int = 20,
+        offset: int = 0,
+    ) -> list[SItemSearchHit]:
+        """
+        Поиск по заголовку и описанию через FTS5. match - готовое выражение
+        MATCH (app.utils.search.build_match_query). Сортировка по встроенному
+        rank (bm25 с весом заголовка), только активные объявления.
+        """
+        fts = literal_column("items_fts")
+        query = (
+            select(
+                *projection_columns(self.model, self.schema),
+                func.highlight(fts, 0, HIGHLIGHT_OPEN, HIGHLIGHT_CLOSE).label("title_highlight"),
+                func.snippet(
+                    fts, 1, HIGHLIGHT_OPEN, HIGHLIGHT_CLOSE, "…", SNIPPET_TOKENS
+                ).label("snippet"),
+                items_fts.c.rank,
+            )
+            .select_from(items_fts)
+            .join(self.model, self.model.id == items_fts.c.rowid)
+            .filter(fts.match(match), self.model.is_active.is_(True))
+            .order_by(items_fts.c.rank)
+            .limit(limit)
+            .offset(offset)
+        )
+        if category_id is not None:
+            query = query.filter(self.model.category_id == category_id)
+        if location_id is not None:
+            query = query.filter(self.model.location_id == location_id)
+
+        result = await self.session.execute(query)
+        return list_adapter(SItemSearchHit).validate_python(result.all(), from_attributes=True)
+
+    async def get_active_title_counts(self) -> list[tuple[str, int]]:
+        """Заголовки активных объявлений с числом объявлений (для индекса подсказок)"""
+        query = (
+            select(self.model.title, func.count())
+            .filter(self.model.is_active == true())
+            .group_by(self.model.title)
+        )
+        result = await self.session.execute(query)
+        return [tuple(row) for row in result.all()]
+
+    async def get_feed_titles(
+        self, source: str, external_ids: Sequence[str]
+    ) -> dict[str, tuple[str, int, bool]]:
+        """
+        Заголовок, категория и активность уже загруженных объявлений фида:
+        external_id -> (title, category_id, is_active). Нужны индексу подсказок
+        при upsert - RETURNING в SQLite отдает только новые значения.
+        """
+        found = {}
+        for chunk in chunked(external_ids, SQLITE_MAX_VARIABLES - 1):
+            query = select(
+                self.model.external_id,
+                self.model.title,
+                self.model.category_id,
+                self.model.is_active,
+            ).filter(self.model.source == source, self.model.external_id.in_(chunk))
+            for external_id, title, category_id, is_active in await self.session.execute(query):
+                found[external_id] = (title, category_id, is_active)
+        return found
+
+    async def get_nearby(
+        self,
+        lat: float,
+        lon: float,
+        radius_km: float,
+        category_id: Optional[int] = None,
+        limit: int = 50,
+    ) -> list[SItemNearby]:
+        """
+        Активные объявления в радиусе radius_km, ближайшие первыми.
+        Кандидаты отбираются по ограничивающему прямоугольнику в R-tree, поэтому
+        стоимость зависит от плотности объявлений рядом, а не от размера таблицы.
+        Расстояние - equirectangular-приближение (для радиусов до сотен км
+        погрешность доли процента), переход через 180-й меридиан не учитывается.
+        """
+        cos_lat = max(math.cos(math.radians(lat)), 0.01)
+        dlat = radius_km / KM_PER_DEGREE
+        dlon = min(dlat / cos_lat, 180.0)
+        # Точка объявления - вырожденный прямоугольник, min_* == max_*
+        dx = (items_rtree.c.min_lon - lon) * cos_lat
+        dy = items_rtree.c.min_lat - lat
+        distance2 = dx * dx + dy * dy
+
+        query = (
+            select(
+                *projection_columns(self.model, self.schema),
+                distance2.label("distance2"),
+            )
+            .select_from(items_rtree)
+            .join(self.model, self.model.id == items_rtree.c.id)
+            .filter(
+                items_rtree.c.min_lat <= lat + dlat,
+                items_rtree.c.max_lat >= lat - dlat,
+                items_rtree.c.min_lon <= lon + dlon,
+                items_rtree.c.max_lon >= lon - dlon,
+                distance2 <= dlat * dlat,
+                self.model.is_active == true(),
+            )
+            .order_by(distance2)
+            .limit(limit)
+        )
+        if category_id is not None:
+            query = query.filter(self.model.category_id == category_id)
+
+        result = await self.session.execute(query)
+        rows = [
+            dict(row, distance_km=math.sqrt(row["distance2"]) * KM_PER_DEGREE)
+            for row in result.mappings().all()
+        ]
+        return list_adapter(SItemNearby).validate_python(rows)
+
+    async def get_facets(self, **filter_by) -> SItemFacets:
+        """
+        Фасеты для текущего фильтра. Каждое измерение считается с учетом всех
+        фильтров, кроме фильтра по нему самому. Если кроме is_active других
+        фильтров нет - берем готовые счетчики, иначе GROUP BY по индексу.
+        """
+        filter_by = {k: v for k, v in filter_by.items() if v is not None}
+        facets = {}
+        for facet in FACETS:
+            other = {k: v for k, v in filter_by.items() if k != facet}
+            if set(other) <= {"is_active"}:
+                counts = await self._facet_from_counters(facet, other.get("is_active"))
+            else:
+                counts = await self._facet_group_by(facet, other)
+            if facet in INT_FACETS:
+                counts = [(int(value), count) for value, count in counts]
+            # Значений у измерения немного - сортируем здесь, а не в SQL
+            counts.sort(key=lambda pair: pair[1], reverse=True)
+            facets[facet] = [SFacetCount(value=value, count=count) for value, count in counts]
+        return SItemFacets(**facets)
+
+    async def _facet_from_counters(
+        self, facet: str, is_active: Optional[bool]
+    ) -> list[tuple]:
+        total = func.sum(ItemFacetCountModel.count)
+        query = (
+            select(ItemFacetCountModel.value, total)
+            .filter(ItemFacetCountModel.facet == facet)
+            .group_by(ItemFacetCountModel.value)
+            .having(total > 0)
+        )
+        if is_active is not None:
+            query = query.filter(ItemFacetCountModel.is_active == is_active)
+        result = await self.session.execute(query)
+        return [tuple(row) for row in result.all()]
+
+    async def _facet_group_by(self, facet: str, filter_by: dict) -> list[tuple]:
+        column = getattr(self.model, facet)
+        query = (
+            select(column, func.count())
+            .filter_by(**filter_by)
+            .filter(column.is_not(None))
+            .group_by(column)
+        )
+        result = await self.session.execute(query)
+        return [tuple(row) for row in result.all()]
+
+    async def change_rating_aggregates(
+        self, item_id: int, removed: Optional[int] = None, added: Optional[int] = None
+    ) -> Optional[int]:
+        """
+        Сдвигает агрегаты отзывов объявления одним UPDATE: removed - оценка,
+        которая ушла (удаление или изменение отзыва), added - которая пришла.
+        Вызывается в той же транзакции, что и запись отзыва.
+        Возвращает id владельца объявления.
+        """
+        values = {}
+        count_delta = (added is not None) - (removed is not None)
+        if count_delta:
+            values["rating_count"] = self.model.rating_count + count_delta
+        sum_delta = (added or 0) - (removed or 0)
+        if sum_delta:
+            values["rating_sum"] = self.model.rating_sum + sum_delta
+        for rating, delta in ((removed, -1), (added, 1)):
+            if rating is not None:
+                column_ = getattr(self.model, f"rating_{rating}")
+                values[column_.key] = values.get(column_.key, column_) + delta
+        if not values:
+            return None
+        result = await self.session.execute(
+            update(self.model)
+            .filter_by(id=item_id)
+            .values(**values)
+            .returning(self.model.user_id)
+        )
+        return result.scalar_one_or_none()
+
+    async def rebuild_rating_aggregates(self) -> None:
+        """Пересчитывает агрегаты отзывов всех объявлений по таблице reviews"""
+        aggregates = (
+            select(
+                ReviewModel.item_id,
+                func.count().label("rating_count"),
+                func.sum(ReviewModel.rating).label("rating_sum"),
+                *(
+                    func.sum(case((ReviewModel.rating == rating, 1), else_=0)).label(
+                        f"rating_{rating}"
+                    )
+                    for rating in RATINGS
+                ),
+            )
+            .group_by(ReviewModel.item_id)
+            .subquery()
+        )
+        columns = ["rating_count", "rating_sum", *(f"rating_{rating}" for rating in RATINGS)]
+        # Обнуляем объявления, у которых отзывов больше нет, затем пишем свежие суммы
+        await self.session.execute(
+            update(self.model)
+            .filter(self.model.rating_count != 0)
+            .values({name: 0 for name in columns})
+        )
+        await self.session.execute(
+            update(self.model)
+            .filter(self.model.id == aggregates.c.item_id)
+            .values({name: aggregates.c[name] for name in columns})
+        )
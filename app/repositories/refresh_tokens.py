@@ -0,0 +1,55 @@
+# app/repositories/refresh_tokens.py
+from datetime import datetime
+
+from sqlalchemy import select, update
+from sqlalchemy.engine import Row
+
+from app.models.refresh_tokens import RefreshTokenModel as RefreshToken
+from app.schemes.auth import SRefreshTokenGet
+from .base import BaseRepository
+
+
+class RefreshTokensRepository(BaseRepository):
+    model = RefreshToken
+    schema = SRefreshTokenGet
+
+    async def use(self, jti: str, now: datetime) -> Row | None:
+        """
+        Атомарно погашает действующий токен. None - токена нет, он истек,
+        отозван или уже был использован.
+        """
+        result = await self.session.execute(
+            update(RefreshToken)
+            .where(
+                RefreshToken.jti == jti,
+                RefreshToken.used_at.is_(None),
+                RefreshToken.revoked_at.is_(None),
+                RefreshToken.expires_at > now,
+            )
+            .values(used_at=now)
+            .returning(RefreshToken.family_id, RefreshToken.user_id)
+        )
+        return result.first()
+
+    async def revoke_family(self, family_id: str, now: datetime) -> None:
+        await self.session.execute(
+            update(RefreshToken)
+            .where(RefreshToken.family_id == family_id, RefreshToken.revoked_at.is_(None))
+            .values(revoked_at=now)
+        )
+
+    async def is_family_revoked(self, family_id: str) -> bool:
+        query = (
+            select(RefreshToken.jti)
+            .where(RefreshToken.family_id == family_id, RefreshToken.revoked_at.is_not(None))
+            .limit(1)
+        )
+        return (await self.session.execute(query)).first() is not None
+
+    async def get_user_families(self, user_id: int) -> list[str]:
+        query = select(RefreshToken.family_id).where(RefreshToken.user_id == user_id).distinct()
+        return list((await self.session.execute(query)).scalars().all())
+
+    async def get_families_revoked_since(self, since: datetime) -> list[str]:
+        query = select(RefreshToken.family_id).where(RefreshToken.revoked_at > since).distinct()
+        return list((await self.session.execute(query)).scalars().all())
@@ -1,15 +1,17 @@
 # app/repositories/reviews.py
-from sqlalchemy import select
+from typing import AsyncIterator, Sequence
+
+from sqlalchemy import Row, select
 from sqlalchemy.orm import selectinload
-from app.schemes.reviews import SReviewAdd as ReviewCreate, SReviewUpdate as ReviewUpdate
+from app.schemes.reviews import SReviewGet
+from app.models.items import ItemModel
 from app.models.reviews import ReviewModel as Review
-from .base import BaseRepository
+from .base import STREAM_BATCH_ROWS, BaseRepository
 
 
 class ReviewsRepository(BaseRepository):
-    def __init__(self, session):
-        super().__init__(session)  # ← только session, не передавайте Review
-        self.model = Review  # ← устанавливаем модель отдельно
+    model = Review
+    schema = SReviewGet
 
     async def get_one_or_none_with_relations(self, **filter_by):
         query = (
@@ -29,12 +31,22 @@ class ReviewsRepository(BaseRepository):
         # return SReviewGetWithRels.model_validate(model, from_attributes=True)
         return model
 
-    async def get_item_reviews(self, item_id: int):
-        query = (
-            select(self.model)
-            .where(self.model.item_id == item_id)
-            .options(selectinload(self.model.user))
+    async def get_item_reviews(
+        self, item_id: int, limit: int = 100, cursor: str | None = None, offset: int | None = None
+    ):
+        return await self.get_page(
+            limit=limit, cursor=cursor, offset=offset, item_id=item_id
         )
 
-        result = await self.session.execute(query)
-        return result.scalars().all()
\ No newline at end of file
+    async def stream_owner_ratings(
+        self, batch_size: int = STREAM_BATCH_ROWS
+    ) -> AsyncIterator[Sequence[Row]]:
+        """(владелец объявления, оценка, дата) по всем отзывам, пачками"""
+        query = (
+            select(ItemModel.user_id, self.model.rating, self.model.created_at)
+            .join(ItemModel, ItemModel.id == self.model.item_id)
+            .execution_options(yield_per=batch_size)
+        )
+        result = await self.session.stream(query)
+        async for rows in result.partitions():
+            yield rows
@@ -1,28 +1,41 @@
 from sqlalchemy import select
-from sqlalchemy.orm import selectinload
 
 from app.models.roles import RoleModel
+from app.models.users import UserModel
 from app.repositories.base import BaseRepository
 from app.schemes.roles import SRoleGet
-from app.schemes.relations_users_roles import SRoleGetWithRels
+from app.schemes.relations_users_roles import SUserSimple
+from app.utils.pagination import decode_cursor, encode_cursor
 
 
 class RolesRepository(BaseRepository):
     model = RoleModel
     schema = SRoleGet
 
-    async def get_one_or_none_with_users(self, **filter_by):
+    async def get_role_users(
+        self,
+        role_id: int,
+        limit: int = 100,
+        cursor: str | None = None,
+        offset: int | None = None,
+    ) -> tuple[list[SUserSimple], str | None]:
+        """Пользователи роли по возрастанию id (индекс по role_id уже упорядочен по id)"""
         query = (
-            select(self.model)
-            .filter_by(**filter_by)
-            .options(selectinload(self.model.users))
+            select(UserModel.id, UserModel.name, UserModel.email)
+            .filter(UserModel.role_id == role_id)
+            .order_by(UserModel.id)
         )
+        if offset is not None:
+            query = query.limit(limit).offset(offset)
+        else:
+            if cursor is not None:
+                (last_id,) = decode_cursor(cursor, [int])
+                query = query.filter(UserModel.id > last_id)
+            query = query.limit(limit + 1)
+        rows = (await self.session.execute(query)).all()
 
-        result = await self.session.execute(query)
-
-        model = result.scalars().one_or_none()
-        if model is None:
-            return None
-
-        result = SRoleGetWithRels.model_validate(model, from_attributes=True)
-        return result
+        next_cursor = None
+        if offset is None and len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor([rows[-1].id])
+        return [SUserSimple.model_validate(row, from_attributes=True) for row in rows], next_cursor
@@ -1,10 +1,15 @@
-from sqlalchemy import select
+from datetime import datetime
+
+from sqlalchemy import select, update
 from sqlalchemy.orm import selectinload
 
 from app.models.users import UserModel
 from app.repositories.base import BaseRepository
 from app.schemes.users import SUserGet
 from app.schemes.relations_users_roles import SUserGetWithRels
+from app.utils.trust import decay, decay_all, trust_score
+
+TRUST_BATCH_ROWS = 1000
 
 
 class UsersRepository(BaseRepository):
@@ -26,3 +31,117 @@ class UsersRepository(BaseRepository):
 
         result = SUserGetWithRels.model_validate(model, from_attributes=True)
         return result
+
+    async def bump_role_version(self, *filter, now: datetime, **filter_by) -> list[tuple[int, int]]:
+        """Роль пользователей изменилась: +1 к версии. Возвращает (id, новая версия)"""
+        result = await self.session.execute(
+            update(self.model)
+            .filter(*filter)
+            .filter_by(**filter_by)
+            .values(role_version=self.model.role_version + 1, role_changed_at=now)
+            .returning(self.model.id, self.model.role_version)
+        )
+        return [tuple(row) for row in result.all()]
+
+    async def get_role_versions_changed_since(self, since: datetime) -> list[tuple[int, int]]:
+        query = select(self.model.id, self.model.role_version).filter(
+            self.model.role_changed_at > since
+        )
+        return [tuple(row) for row in (await self.session.execute(query)).all()]
+
+    async def shift_trust(
+        self, user_id: int, now: datetime, weight_delta: float, sum_delta: float
+    ) -> None:
+        """
+        Учитывает изменение отзыва в рейтинге доверия: суммы сначала
+        затухают до now, затем к ним добавляются дельты (вес отзыва на now).
+        """
+        query = select(
+            self.model.trust_weight, self.model.trust_weighted_sum, self.model.trust_decayed_at
+        ).filter_by(id=user_id)
+        row = (await self.session.execute(query)).one_or_none()
+        if row is None:
+            return
+        factor = decay(row.trust_decayed_at, now)
+        # max(): погрешность float не должна уводить вес в минус после удалений
+        weight = max(row.trust_weight * factor + weight_delta, 0.0)
+        weighted_sum = max(row.trust_weighted_sum * factor + sum_delta, 0.0) if weight else 0.0
+        await self.session.execute(
+            update(self.model)
+            .filter_by(id=user_id)
+            .values(
+                trust_weight=weight,
+                trust_weighted_sum=weighted_sum,
+                trust_decayed_at=now,
+                trust_score=trust_score(weight, weighted_sum),
+            )
+        )
+
+    async def refresh_trust_decay(self, now: datetime, batch_size: int = TRUST_BATCH_ROWS) -> int:
+        """
+        Затухание рейтинга доверия для всех, у кого есть отзывы: пачками по id,
+        коэффициенты считаются на всю пачку сразу и пишутся одним executemany.
+        """
+        last_id = 0
+        updated = 0
+        while True:
+            query = (
+                select(
+                    self.model.id,
+                    self.model.trust_weight,
+                    self.model.trust_weighted_sum,
+                    self.model.trust_decayed_at,
+                )
+                .filter(self.model.id > last_id, self.model.trust_weight > 0)
+                .order_by(self.model.id)
+                .limit(batch_size)
+            )
+            rows = (await self.session.execute(query)).all()
+            if not rows:
+                return updated
+            factors = decay_all(
+                [max((now - (row.trust_decayed_at or now)).total_seconds(), 0.0) for row in rows]
+            )
+            values = []
+            for row, factor in zip(rows, factors):
+                weight = row.trust_weight * factor
+                weighted_sum = row.trust_weighted_sum * factor
+                values.append(
+                    {
+                        "id": row.id,
+                        "trust_weight": weight,
+                        "trust_weighted_sum": weighted_sum,
+                        "trust_decayed_at": now,
+                        "trust_score": trust_score(weight, weighted_sum),
+                    }
+                )
+            # UPDATE по первичному ключу для списка словарей - executemany
+            await self.session.execute(update(self.model), values)
+            updated += len(values)
+            last_id = rows[-1].id
+
+    async def rebuild_trust(self, sums: dict[int, tuple[float, float]], now: datetime) -> None:
+        """
+        Полный пересчет: всех сбрасывает к априорной оценке и записывает
+        суммы (вес, взвешенная сумма оценок) на момент now тем, у кого есть отзывы.
+        """
+        await self.session.execute(
+            update(self.model).values(
+                trust_weight=0.0,
+                trust_weighted_sum=0.0,
+                trust_decayed_at=None,
+                trust_score=trust_score(0.0, 0.0),
+            )
+        )
+        values = [
+            {
+                "id": owner_id,
+                "trust_weight": weight,
+                "trust_weighted_sum": weighted_sum,
+                "trust_decayed_at": now,
+                "trust_score": trust_score(weight, weighted_sum),
+            }
+            for owner_id, (weight, weighted_sum) in sums.items()
+        ]
+        for start in range(0, len(values), TRUST_BATCH_ROWS):
+            await self.session.execute(update(self.model), values[start : start + TRUST_BATCH_ROWS])
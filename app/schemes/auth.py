@@ -1,4 +1,7 @@
 # app/schemes/auth.py
+from datetime import datetime
+from typing import Optional
+
 from pydantic import BaseModel
 from .users import SUserResponse
 
@@ -19,4 +22,19 @@ class STokenResponse(BaseModel):
     success: bool = True
     message: str = "Успешно"
     token: str
-    user: SUserResponse
\ No newline at end of file
+    user: SUserResponse
+
+class SRefreshTokenAdd(BaseModel):
+    """Для добавления в БД"""
+    jti: str
+    family_id: str
+    user_id: int
+    expires_at: datetime
+
+
+class SRefreshTokenGet(SRefreshTokenAdd):
+    used_at: Optional[datetime] = None
+    revoked_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
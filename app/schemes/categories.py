@@ -22,6 +22,11 @@ class SCategoryCreate(BaseModel):
     description: Optional[str] = None
 
 
+class SCategoryName(BaseModel):
+    """Для записи в БД: в таблице категорий хранится только название"""
+    name: str
+
+
 class SCategoryGet(BaseModel):
     """Схема для получения категории"""
     id: int
@@ -4,10 +4,14 @@ from pydantic import BaseModel
 
 
 # app/schemes/items.py
-from pydantic import BaseModel
-from typing import Optional, List
+from pydantic import BaseModel, Field, computed_field
+from typing import Optional, List, Literal
 from datetime import datetime
 
+from app.schemes.categories import SCategoryGet
+from app.schemes.locations import Latitude, Longitude, SLocationGet
+from app.schemes.relations_users_roles import SUserPublic
+
 
 # ==================== ОСНОВНЫЕ СХЕМЫ ====================
 
@@ -20,16 +24,71 @@ class SItemGet(BaseModel):
     user_id: int
     category_id: int
     location_id: int
+    latitude: Optional[float] = None
+    longitude: Optional[float] = None
     created_at: datetime
+    # Агрегаты отзывов: читаются из колонок items вместе с объявлением,
+    # в ответ уходят средняя оценка и гистограмма
+    rating_count: int = 0
+    rating_sum: int = Field(0, exclude=True)
+    rating_1: int = Field(0, exclude=True)
+    rating_2: int = Field(0, exclude=True)
+    rating_3: int = Field(0, exclude=True)
+    rating_4: int = Field(0, exclude=True)
+    rating_5: int = Field(0, exclude=True)
+
+    @computed_field
+    @property
+    def rating_average(self) -> Optional[float]:
+        if not self.rating_count:
+            return None
+        return round(self.rating_sum / self.rating_count, 2)
+
+    @computed_field
+    @property
+    def rating_histogram(self) -> List[int]:
+        """Число оценок 1..5"""
+        return [self.rating_1, self.rating_2, self.rating_3, self.rating_4, self.rating_5]
 
     class Config:
         from_attributes = True
 
 
+class SItemSearchHit(SItemGet):
+    """Результат полнотекстового поиска: фрагменты с подсветкой и релевантность"""
+    title_highlight: str
+    snippet: Optional[str] = None
+    rank: float
+
+
+class SItemSuggestion(BaseModel):
+    """Подсказка поисковой строки"""
+    text: str
+    kind: Literal["item", "category"]
+    count: int
+
+
+class SItemNearby(SItemGet):
+    """Объявление рядом с точкой поиска"""
+    distance_km: float
+
+
+class SFacetCount(BaseModel):
+    value: int | str
+    count: int
+
+
+class SItemFacets(BaseModel):
+    """Число объявлений по значениям каждого измерения фильтра"""
+    category_id: List[SFacetCount]
+    location_id: List[SFacetCount]
+    condition: List[SFacetCount]
+
+
 class SItemGetWithRels(SItemGet):
-    owner: Optional[dict] = None
-    category: Optional[dict] = None
-    location: Optional[dict] = None
+    owner: Optional[SUserPublic] = None
+    category: Optional[SCategoryGet] = None
+    location: Optional[SLocationGet] = None
 
 
 # ==================== ДЛЯ API ====================
@@ -42,6 +101,8 @@ class SItemAdd(BaseModel):
     user_id: int
     category_id: int
     location_id: int
+    latitude: Optional[Latitude] = None
+    longitude: Optional[Longitude] = None
 
 
 class SItemCreate(BaseModel):
@@ -51,6 +112,8 @@ class SItemCreate(BaseModel):
     condition: str
     category_id: int
     location_id: int
+    latitude: Optional[Latitude] = None
+    longitude: Optional[Longitude] = None
 
 
 class SItemUpdate(BaseModel):
@@ -61,6 +124,8 @@ class SItemUpdate(BaseModel):
     is_active: Optional[bool] = None
     category_id: Optional[int] = None
     location_id: Optional[int] = None
+    latitude: Optional[Latitude] = None
+    longitude: Optional[Longitude] = None
 
 
 class SItemPatch(BaseModel):
@@ -71,6 +136,26 @@ class SItemPatch(BaseModel):
     is_active: Optional[bool] = None
     category_id: Optional[int] = None
     location_id: Optional[int] = None
+    latitude: Optional[Latitude] = None
+    longitude: Optional[Longitude] = None
+
+
+class SItemBulkAdd(SItemAdd):
+    """Товар из фида партнера"""
+    external_id: str
+
+
+class SItemBulkRequest(BaseModel):
+    """Схема для массовой загрузки товаров из фида"""
+    source: str
+    on_conflict: Optional[Literal["update", "nothing"]] = "update"
+    return_ids: bool = False
+    items: List[SItemBulkAdd]
+
+
+class SItemBulkResult(BaseModel):
+    count: int  # записано строк: пропущенные дубликаты не считаются
+    ids: Optional[List[int]] = None
 
 
 class SItemFilter(BaseModel):
@@ -1,5 +1,8 @@
-from pydantic import BaseModel
-from typing import Optional, List
+from pydantic import BaseModel, Field
+from typing import Annotated, Optional, List
+
+Latitude = Annotated[float, Field(ge=-90, le=90)]
+Longitude = Annotated[float, Field(ge=-180, le=180)]
 
 # ==================== ОСНОВНЫЕ СХЕМЫ ====================
 
@@ -8,6 +11,8 @@ class SLocationGet(BaseModel):
     id: int
     city: str
     region: str
+    latitude: Optional[float] = None
+    longitude: Optional[float] = None
 
     class Config:
         from_attributes = True
@@ -24,6 +29,8 @@ class SLocationAdd(BaseModel):
     """Схема для добавления локации"""
     city: str
     region: str
+    latitude: Optional[Latitude] = None
+    longitude: Optional[Longitude] = None
 
 
 SLocationCreate = SLocationAdd  # Алиас для совместимости
@@ -33,12 +40,16 @@ class SLocationUpdate(BaseModel):
     """Схема для обновления локации"""
     city: Optional[str] = None
     region: Optional[str] = None
+    latitude: Optional[Latitude] = None
+    longitude: Optional[Longitude] = None
 
 
 class SLocationPatch(BaseModel):
     """Схема для частичного обновления локации"""
     city: Optional[str] = None
     region: Optional[str] = None
+    latitude: Optional[Latitude] = None
+    longitude: Optional[Longitude] = None
 
 
 class SLocationFilter(BaseModel):
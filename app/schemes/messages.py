@@ -11,7 +11,9 @@ class SMessageGet(BaseModel):
     id: int
     text: str
     sender_id: int
-    receiver_id: int
+    recipient_id: int
+    item_id: int
+    conversation_id: Optional[int] = None
     is_read: bool = False
     created_at: datetime
 
@@ -27,32 +29,73 @@ class SMessageGetWithRels(SMessageGet):
 
 # ==================== ДЛЯ API ====================
 
-class SMessageAdd(BaseModel):
-    """Схема для добавления сообщения"""
+class SMessageSend(BaseModel):
+    """Схема для отправки сообщения в существующий чат"""
     text: str
+
+
+class SMessageAdd(SMessageSend):
+    """Схема для первого сообщения по объявлению (чат создается при отправке)"""
     receiver_id: int
+    item_id: int
 
 
-SMessageCreate = SMessageAdd  # Алиас для совместимости
+class SMessageCreate(BaseModel):
+    """Для добавления в БД"""
+    text: str
+    sender_id: int
+    recipient_id: int
+    item_id: int
+    conversation_id: int
+    created_at: datetime
 
 
 class SMessageUpdate(BaseModel):
     """Схема для обновления сообщения"""
     text: Optional[str] = None
-    is_read: Optional[bool] = None
 
 
 class SMessagePatch(BaseModel):
     """Схема для частичного обновления сообщения"""
     text: Optional[str] = None
-    is_read: Optional[bool] = None
 
 
 # ==================== ДЛЯ ЧАТОВ ====================
 
+class SConversationRecord(BaseModel):
+    """Строка таблицы conversations"""
+    id: int
+    user_low_id: int
+    user_high_id: int
+    item_id: int
+    last_message_id: Optional[int] = None
+    last_message_at: Optional[datetime] = None
+    received_low: int = 0
+    received_high: int = 0
+    read_low: int = 0
+    read_high: int = 0
+    last_read_low_id: Optional[int] = None
+    last_read_high_id: Optional[int] = None
+
+    class Config:
+        from_attributes = True
+
+    def partner_of(self, user_id: int) -> int:
+        return self.user_high_id if user_id == self.user_low_id else self.user_low_id
+
+    def has_participant(self, user_id: int) -> bool:
+        return user_id in (self.user_low_id, self.user_high_id)
+
+    def last_read_id(self, user_id: int) -> Optional[int]:
+        """Последнее сообщение, прочитанное участником user_id"""
+        return self.last_read_low_id if user_id == self.user_low_id else self.last_read_high_id
+
+
 class SConversationGet(BaseModel):
     """Схема для получения чата"""
     id: int
+    item_id: int
+    partner_id: int
     partner_name: str
     last_message: str
     unread_count: int = 0
@@ -62,6 +105,8 @@ class SConversationGet(BaseModel):
 class SConversationList(BaseModel):
     """Схема для списка чатов"""
     id: int
+    item_id: int
+    partner_id: int
     partner: str
     last_message: str
     unread: int
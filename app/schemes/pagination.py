@@ -0,0 +1,11 @@
+# app/schemes/pagination.py
+from typing import Generic, TypeVar
+from pydantic import BaseModel
+
+T = TypeVar("T")
+
+
+class SPage(BaseModel, Generic[T]):
+    """Страница списка: элементы и курсор для запроса следующей страницы"""
+    items: list[T]
+    next_cursor: str | None = None
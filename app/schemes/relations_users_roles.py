@@ -16,11 +16,20 @@ class SUserSimple(BaseModel):
     email: str
 
 
+class SUserPublic(BaseModel):
+    """Продавец во вложенных ответах (карточка объявления)"""
+    id: int
+    name: str = ""
+    trust_score: float
+
+
 # Основные схемы с отношениями
 class SRoleGetWithRels(SRoleSimple):
+    # Страница пользователей роли, дальше - по next_cursor
     users: List[SUserSimple] = []
+    next_cursor: Optional[str] = None
 
 
 class SUserGetWithRels(SUserSimple):
     role: Optional[SRoleSimple] = None
-    trust_score: float = 5.0
\ No newline at end of file
+    trust_score: float
\ No newline at end of file
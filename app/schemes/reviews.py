@@ -1,8 +1,10 @@
 # app/schemes/reviews.py
-from pydantic import BaseModel
-from typing import Optional
+from pydantic import BaseModel, Field
+from typing import Annotated, Optional
 from datetime import datetime
 
+Rating = Annotated[int, Field(ge=1, le=5)]
+
 
 # ==================== ОСНОВНЫЕ СХЕМЫ ====================
 
@@ -12,7 +14,7 @@ class SReviewGet(BaseModel):
     user_id: int
     item_id: int
     rating: int
-    comment: str
+    comment: Optional[str] = None
     created_at: datetime
 
     class Config:
@@ -30,22 +32,24 @@ class SReviewGetWithRels(SReviewGet):
 class SReviewAdd(BaseModel):
     """Схема для добавления отзыва"""
     item_id: int
-    rating: int
+    rating: Rating
     comment: str
 
 
-SReviewCreate = SReviewAdd  # Алиас для совместимости
+class SReviewCreate(SReviewAdd):
+    """Схема отзыва для записи в БД: автор берется из токена"""
+    user_id: int
 
 
 class SReviewUpdate(BaseModel):
     """Схема для обновления отзыва"""
-    rating: Optional[int] = None
+    rating: Rating
     comment: Optional[str] = None
 
 
 class SReviewPatch(BaseModel):
     """Схема для частичного обновления отзыва"""
-    rating: Optional[int] = None
+    rating: Optional[Rating] = None
     comment: Optional[str] = None
 
 
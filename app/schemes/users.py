@@ -78,6 +78,17 @@ class SUserGet(BaseModel):
     email: str
     # trust_score: float = 5.0  # добавьте это поле
     hashed_password: str
+    role_id: Optional[int] = None
+    role_version: int = 0
+    created_at: Optional[datetime] = None
+
+
+class SUserAdminGet(BaseModel):
+    """Для списка пользователей в админке (без хеша пароля)"""
+    id: int
+    name: str = ""
+    email: str
+    role_id: Optional[int] = None
     created_at: Optional[datetime] = None
 
 
@@ -97,6 +108,11 @@ class SUserUpdate(BaseModel):
     is_verified: Optional[bool] = None
 
 
+class SUserPasswordUpdate(BaseModel):
+    """Для замены хеша пароля"""
+    hashed_password: str
+
+
 class SUserPatch(BaseModel):
     """Для частичного обновления"""
     name: Optional[str] = None
@@ -1,4 +1,5 @@
 # app/services/auth.py
+import uuid
 from datetime import datetime, timezone, timedelta
 from app.config import settings
 from app.exceptions.auth import (
@@ -7,23 +8,27 @@ from app.exceptions.auth import (
     InvalidPasswordError,
     InvalidJWTTokenError,
     JWTTokenExpiredError,
+    RefreshTokenReusedError,
+    TokenRevokedError,
 )
 from app.exceptions.base import ObjectAlreadyExistsError
 from app.schemes.users import (
     SUserAdd,
     SUserAddRequest,
     SUserAuth,
+    SUserPasswordUpdate,
 )
 from app.schemes.relations_users_roles import SUserGetWithRels
-from app.schemes.auth import STokenResponse, SUserResponse
+from app.schemes.auth import SRefreshTokenAdd, STokenResponse, SUserResponse
 from app.services.base import BaseService
+from app.utils.password_pool import password_pool
+from app.utils.passwords import pwd_context
+from app.utils.revocation import revocations
+from app.utils.role_cache import role_cache
 import jwt
-from passlib.context import CryptContext
 
 
 class AuthService(BaseService):
-    pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-
     @classmethod
     def create_access_token(cls, data: dict) -> str:
         to_encode = data.copy()
@@ -37,27 +42,29 @@ class AuthService(BaseService):
     @classmethod
     def create_refresh_token(cls, data: dict) -> str:
         to_encode = data.copy()
-        expire: datetime = datetime.now(timezone.utc) + timedelta(days=7)
+        expire: datetime = datetime.now(timezone.utc) + timedelta(
+            days=settings.REFRESH_TOKEN_EXPIRE_DAYS
+        )
         to_encode |= {"exp": expire, "type": "refresh"}
         encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, settings.ALGORITHM)
         return encoded_jwt
 
     @classmethod
-    def verify_password(cls, plain_password, hashed_password) -> bool:
-        return cls.pwd_context.verify(plain_password, hashed_password)
+    async def verify_password(cls, plain_password, hashed_password) -> bool:
+        return await password_pool.run(pwd_context.verify, plain_password, hashed_password)
 
     @classmethod
-    def hash_password(cls, plain_password) -> str:
-        return cls.pwd_context.hash(plain_password)
+    async def hash_password(cls, plain_password) -> str:
+        return await password_pool.run(pwd_context.hash, plain_password)
 
     @classmethod
     def decode_token(cls, token: str) -> dict:
         try:
             return jwt.decode(token, settings.SECRET_KEY, [settings.ALGORITHM])
-        except jwt.exceptions.DecodeError as ex:
-            raise InvalidJWTTokenError from ex
         except jwt.exceptions.ExpiredSignatureError as ex:
             raise JWTTokenExpiredError from ex
+        except jwt.exceptions.InvalidTokenError as ex:
+            raise InvalidJWTTokenError from ex
 
     async def register_user(self, user_data: SUserAddRequest):
         # Проверяем, существует ли пользователь с таким email
@@ -65,15 +72,11 @@ class AuthService(BaseService):
         if existing_user:
             raise UserAlreadyExistsError
 
-        # Проверяем, существует ли роль
+        # Проверяем, существует ли роль (кеш ролей процесса, без запроса в БД)
         from app.services.roles import RolesService
-        role_service = RolesService(self.db)
-        role = await role_service.get_role_by_id(1)
-        if not role:
-            from app.exceptions.roles import RoleNotFoundError
-            raise RoleNotFoundError
+        await RolesService(self.db).get_role_by_id(1)
 
-        hashed_password: str = self.hash_password(user_data.password)
+        hashed_password: str = await self.hash_password(user_data.password)
         new_user_data = SUserAdd(
             email=user_data.email,
             hashed_password=hashed_password,
@@ -89,13 +92,20 @@ class AuthService(BaseService):
         if not user:
             raise UserNotFoundError
 
-        if not self.verify_password(user_data.password, user.hashed_password):
+        if not await self.verify_password(user_data.password, user.hashed_password):
             raise InvalidPasswordError
 
-        token_data = {"user_id": user.id, "email": user.email}
-        access_token = self.create_access_token(token_data)
+        # Хеш со старой стоимостью bcrypt пересчитываем, пока пароль известен
+        if pwd_context.needs_update(user.hashed_password):
+            await self.db.users.edit(
+                SUserPasswordUpdate(hashed_password=await self.hash_password(user_data.password)),
+                id=user.id,
+            )
 
-        return access_token
+        # Вход открывает новое семейство refresh-токенов
+        tokens = await self._issue_tokens(user, family_id=None)
+        await self.db.commit()
+        return tokens
         # return STokenResponse(
         #     token=access_token,
         #     user=SUserResponse(
@@ -107,6 +117,82 @@ class AuthService(BaseService):
         #     )
         # )
 
+    async def _issue_tokens(self, user, family_id: str | None) -> tuple[str, str]:
+        """Пара (access, refresh); refresh записывается в семейство family_id"""
+        role = await role_cache.get(self.db, user.role_id) if user.role_id else None
+        jti = uuid.uuid4().hex
+        family_id = family_id or jti
+        access_token = self.create_access_token({
+            "user_id": user.id,
+            "email": user.email,
+            # Роль с версией: проверки прав обходятся без БД, пока версия актуальна
+            "role": role.name if role else None,
+            "rv": user.role_version,
+            # Семейство refresh-токена: его отзыв закрывает и этот access-токен
+            "fid": family_id,
+        })
+        refresh_token = self.create_refresh_token(
+            {"user_id": user.id, "jti": jti, "fid": family_id}
+        )
+        await self.db.refresh_tokens.add(SRefreshTokenAdd(
+            jti=jti,
+            family_id=family_id,
+            user_id=user.id,
+            expires_at=datetime.utcnow() + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS),
+        ))
+        return access_token, refresh_token
+
+    def _decode_refresh_token(self, refresh_token: str) -> dict:
+        claims = self.decode_token(refresh_token)
+        if claims.get("type") != "refresh" or "jti" not in claims or "fid" not in claims:
+            raise InvalidJWTTokenError
+        return claims
+
+    async def refresh_tokens(self, refresh_token: str) -> tuple[str, str]:
+        """
+        Меняет refresh-токен на новую пару. Каждый токен погашается один раз;
+        повторное предъявление погашенного значит, что его копия у кого-то еще,
+        и отзывает все семейство - и у вора, и у владельца.
+        """
+        claims = self._decode_refresh_token(refresh_token)
+        family_id = claims["fid"]
+        if await revocations.is_revoked(family_id):
+            raise TokenRevokedError
+
+        now = datetime.utcnow()
+        used = await self.db.refresh_tokens.use(claims["jti"], now)
+        if used is None:
+            token = await self.db.refresh_tokens.get_one_or_none(jti=claims["jti"])
+            if token is None:
+                raise InvalidJWTTokenError
+            if token.revoked_at is not None:
+                revocations.revoke(family_id)
+                raise TokenRevokedError
+            if token.used_at is not None:
+                await self.db.refresh_tokens.revoke_family(family_id, now)
+                await self.db.commit()
+                revocations.revoke(family_id)
+                raise RefreshTokenReusedError
+            raise JWTTokenExpiredError
+
+        user = await self.db.users.get_one_or_none(id=used.user_id)
+        if user is None:
+            raise UserNotFoundError
+        tokens = await self._issue_tokens(user, family_id=used.family_id)
+        await self.db.commit()
+        return tokens
+
+    async def logout_user(self, refresh_token: str) -> None:
+        """Отзывает семейство refresh-токена вместе с выданными по нему access-токенами"""
+        try:
+            family_id = self._decode_refresh_token(refresh_token)["fid"]
+        except (InvalidJWTTokenError, JWTTokenExpiredError):
+            # Истекший или чужой токен отзывать незачем
+            return
+        await self.db.refresh_tokens.revoke_family(family_id, datetime.utcnow())
+        await self.db.commit()
+        revocations.revoke(family_id)
+
     async def get_me(self, user_id: int) -> SUserGetWithRels:
         user = await self.db.users.get_one_or_none_with_role(id=user_id)
         if not user:
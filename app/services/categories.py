@@ -1,25 +1,32 @@
 # app/services/categories.py
 from typing import Optional
+from app.exceptions.base import ObjectAlreadyExistsError
 from app.exceptions.categories import CategoryNotFoundError, CategoryAlreadyExistsError
-from app.schemes.categories import SCategoryCreate, SCategoryUpdate, SCategoryPatch
+from app.schemes.categories import (
+    SCategoryCreate,
+    SCategoryGet,
+    SCategoryName,
+    SCategoryPatch,
+    SCategoryUpdate,
+)
 from app.services.base import BaseService
+from app.utils.suggest import suggest_index
 
 
 class CategoryService(BaseService):
 
     async def create_category(self, category_data: SCategoryCreate):
+        # Проверка на существование категории по имени
+        existing_category = await self.db.categories.get_one_or_none(name=category_data.name)
+        if existing_category:
+            raise CategoryAlreadyExistsError
         try:
-            # Проверка на существование категории по имени
-            existing_category = await self.db.categories.get_by_name(category_data.name)
-            if existing_category:
-                raise CategoryAlreadyExistsError
-            # Создание новой категории
-            new_category = await self.db.categories.create(category_data.model_dump())
-            await self.db.commit()
-            return new_category
-        except Exception as e:
-            await self.db.rollback()
-            raise e
+            new_category = await self.db.categories.add(SCategoryName(name=category_data.name))
+        except ObjectAlreadyExistsError:
+            raise CategoryAlreadyExistsError
+        await self.db.commit()
+        suggest_index.set_category(new_category.id, new_category.name)
+        return new_category
 
     async def get_category(self, category_id: int):
         category = await self.db.categories.get_one_or_none(id=category_id)
@@ -31,29 +38,36 @@ class CategoryService(BaseService):
         category = await self.db.categories.get_one_or_none(id=category_id)
         if not category:
             raise CategoryNotFoundError
-        # Обновление данных категории
-        updated_category = await self.db.categories.update(category_id, category_data.model_dump())
-        await self.db.commit()
-        return updated_category
+        # Меняется только название - описание в таблице не хранится
+        if category_data.name is not None:
+            await self.db.categories.edit(SCategoryName(name=category_data.name), id=category_id)
+            await self.db.commit()
+            suggest_index.set_category(category_id, category_data.name)
+        return
 
     async def patch_category(self, category_id: int, category_data: SCategoryPatch):
         category = await self.db.categories.get_one_or_none(id=category_id)
         if not category:
             raise CategoryNotFoundError
         # Обновление только непустых полей
-        patch_data = category_data.model_dump(exclude_unset=True)
-        if patch_data:
-            await self.db.categories.update(category_id, patch_data)
+        if category_data.name is not None:
+            await self.db.categories.edit(SCategoryName(name=category_data.name), id=category_id)
             await self.db.commit()
+            suggest_index.set_category(category_id, category_data.name)
         return
 
     async def delete_category(self, category_id: int):
         category = await self.db.categories.get_one_or_none(id=category_id)
         if not category:
             raise CategoryNotFoundError
-        await self.db.categories.delete(category_id)
+        await self.db.categories.delete(id=category_id)
         await self.db.commit()
+        suggest_index.remove_category(category_id)
         return
 
-    async def get_categories(self):
-        return await self.db.categories.get_all()
\ No newline at end of file
+    async def get_categories(self) -> list[SCategoryGet]:
+        # count - число активных объявлений (одним GROUP BY, как для индекса подсказок)
+        return [
+            SCategoryGet(id=category_id, name=name, count=count)
+            for category_id, name, count in await self.db.categories.get_active_item_counts()
+        ]
\ No newline at end of file
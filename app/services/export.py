@@ -0,0 +1,78 @@
+# app/services/export.py
+import csv
+import io
+import zlib
+from datetime import datetime
+from typing import AsyncIterator, Literal, Optional, Sequence
+
+import orjson
+from sqlalchemy import RowMapping
+
+from app.repositories.base import comparable_literal
+from app.services.base import BaseService
+
+ExportEntity = Literal["items", "reviews", "messages"]
+ExportFormat = Literal["ndjson", "csv"]
+
+
+async def ndjson_chunks(batches: AsyncIterator[Sequence[RowMapping]]) -> AsyncIterator[bytes]:
+    async for rows in batches:
+        yield b"".join(orjson.dumps(dict(row)) + b"\n" for row in rows)
+
+
+async def csv_chunks(
+    columns: list[str], batches: AsyncIterator[Sequence[RowMapping]]
+) -> AsyncIterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    async for rows in batches:
+        writer.writerows(
+            [row[column] for column in columns] for row in rows
+        )
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+    # Пустая выгрузка - только заголовок
+    if buffer.tell():
+        yield buffer.getvalue().encode()
+
+
+async def gzip_chunks(chunks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    compressor = zlib.compressobj(wbits=zlib.MAX_WBITS | 16)  # формат gzip
+    async for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+class ExportService(BaseService):
+
+    def export(
+        self,
+        entity: ExportEntity,
+        fmt: ExportFormat = "ndjson",
+        since: Optional[datetime] = None,
+        compress: bool = False,
+    ) -> AsyncIterator[bytes]:
+        """
+        Выгрузка таблицы целиком потоком. since - водяной знак по updated_at
+        (включительно): строки идут по (updated_at, id), и следующую выгрузку
+        можно начинать с максимального updated_at предыдущей.
+        """
+        repository = getattr(self.db, entity)
+        model = repository.model
+        batches = repository.stream_table_rows(
+            model.updated_at >= comparable_literal(since, model.updated_at.type)
+            if since is not None
+            else None,
+            sort_keys=("updated_at", "id"),
+        )
+        if fmt == "csv":
+            chunks = csv_chunks(model.__table__.columns.keys(), batches)
+        else:
+            chunks = ndjson_chunks(batches)
+        if compress:
+            chunks = gzip_chunks(chunks)
+        return chunks
@@ -1,24 +1,80 @@
 # app/services/items.py
-from typing import Optional
+from typing import AsyncIterator, Optional
+from app.exceptions.base import ObjectAlreadyExistsError
 from app.exceptions.items import ItemNotFoundError, ItemAlreadyExistsError
-from app.schemes.items import SItemCreate, SItemUpdate, SItemPatch
+from app.schemes.items import (
+    SItemAdd,
+    SItemUpdate,
+    SItemPatch,
+    SItemFilter,
+    SItemGet,
+    SItemGetWithRels,
+    SItemBulkRequest,
+    SItemBulkResult,
+    SItemSearchHit,
+    SItemNearby,
+    SItemFacets,
+)
+from app.schemes.pagination import SPage
 from app.services.base import BaseService
+from app.utils.search import build_match_query
+from app.utils.suggest import suggest_index
 
 
 class ItemService(BaseService):
 
-    async def create_item(self, item_data: SItemCreate):
+    async def create_item(self, item_data: SItemAdd) -> SItemGet:
         try:
-            # Создание нового объявления
-            new_item = await self.db.items.create(item_data.model_dump())
-            await self.db.commit()
-            return new_item
-        except Exception as e:
-            await self.db.rollback()
-            raise e
+            new_item = await self.db.items.add(item_data)
+        except ObjectAlreadyExistsError:
+            raise ItemAlreadyExistsError
+        await self.db.commit()
+        suggest_index.add_item(new_item.title, new_item.category_id)
+        return new_item
 
-    async def get_item(self, item_id: int):
-        item = await self.db.items.get_one_or_none(id=item_id)
+    async def add_items_bulk(self, bulk_data: SItemBulkRequest) -> SItemBulkResult:
+        # Прежние заголовки строк фида - чтобы перенести их в индексе подсказок
+        previous = {}
+        if bulk_data.on_conflict is not None:
+            previous = await self.db.items.get_feed_titles(
+                bulk_data.source, [item.external_id for item in bulk_data.items]
+            )
+        # Без on_conflict повтор (source, external_id) - ошибка уникальности
+        try:
+            count, ids = await self.db.items.add_bulk(
+                bulk_data.items,
+                on_conflict=bulk_data.on_conflict,
+                conflict_keys=("source", "external_id"),
+                returning=bulk_data.return_ids,
+                extra_values={"source": bulk_data.source},
+            )
+        except ObjectAlreadyExistsError:
+            raise ItemAlreadyExistsError
+        await self.db.commit()
+        self._reindex_suggest_bulk(bulk_data, previous)
+        return SItemBulkResult(count=count, ids=ids)
+
+    @staticmethod
+    def _reindex_suggest_bulk(
+        bulk_data: SItemBulkRequest, previous: dict[str, tuple[str, int, bool]]
+    ) -> None:
+        """Повторяет загрузку фида в индексе подсказок строка за строкой"""
+        for item in bulk_data.items:
+            old = previous.get(item.external_id)
+            if old is None:
+                suggest_index.add_item(item.title, item.category_id)
+                previous[item.external_id] = (item.title, item.category_id, True)
+            elif bulk_data.on_conflict == "update":
+                # upsert не трогает is_active: снятое с витрины объявление в индекс не попадает
+                title, category_id, is_active = old
+                if is_active:
+                    suggest_index.remove_item(title, category_id)
+                    suggest_index.add_item(item.title, item.category_id)
+                previous[item.external_id] = (item.title, item.category_id, is_active)
+
+    async def get_item(self, item_id: int) -> SItemGetWithRels:
+        # Карточка объявления: продавец с trust_score, категория и локация
+        item = await self.db.items.get_one_or_none_with_relations(id=item_id)
         if not item:
             raise ItemNotFoundError
         return item
@@ -27,29 +83,101 @@ class ItemService(BaseService):
         item = await self.db.items.get_one_or_none(id=item_id)
         if not item:
             raise ItemNotFoundError
-        # Обновление данных объявления
-        updated_item = await self.db.items.update(item_id, item_data.model_dump())
-        await self.db.commit()
-        return updated_item
+        # Обновление данных объявления: незаданные поля не затираются NULL
+        update_data = item_data.model_dump(exclude_none=True)
+        if update_data:
+            await self.db.items.edit(SItemPatch(**update_data), exclude_unset=True, id=item_id)
+            await self.db.commit()
+            self._reindex_suggest(item, update_data)
+        return
 
     async def patch_item(self, item_id: int, item_data: SItemPatch):
         item = await self.db.items.get_one_or_none(id=item_id)
         if not item:
             raise ItemNotFoundError
-        # Обновление только непустых полей
+        # Обновление только переданных полей
         patch_data = item_data.model_dump(exclude_unset=True)
         if patch_data:
-            await self.db.items.update(item_id, patch_data)
+            await self.db.items.edit(item_data, exclude_unset=True, id=item_id)
             await self.db.commit()
+            self._reindex_suggest(item, patch_data)
         return
 
     async def delete_item(self, item_id: int):
         item = await self.db.items.get_one_or_none(id=item_id)
         if not item:
             raise ItemNotFoundError
-        await self.db.items.delete(item_id)
+        await self.db.items.delete(id=item_id)
         await self.db.commit()
+        if item.is_active:
+            suggest_index.remove_item(item.title, item.category_id)
         return
 
-    async def get_items(self):
-        return await self.db.items.get_all()
\ No newline at end of file
+    @staticmethod
+    def _reindex_suggest(item: SItemGet, changes: dict) -> None:
+        """Переносит объявление в индексе подсказок после изменения"""
+        updated = item.model_copy(update=changes)
+        if item.is_active:
+            suggest_index.remove_item(item.title, item.category_id)
+        if updated.is_active:
+            suggest_index.add_item(updated.title, updated.category_id)
+
+    async def get_items(
+        self,
+        filters: SItemFilter,
+        cursor: Optional[str] = None,
+        skip: Optional[int] = None,
+        limit: int = 100,
+    ) -> SPage[SItemGet]:
+        items, next_cursor = await self.db.items.get_page(
+            limit=limit, cursor=cursor, offset=skip, **filters.model_dump()
+        )
+        return SPage[SItemGet](items=items, next_cursor=next_cursor)
+
+    def stream_items(self, filters: SItemFilter) -> AsyncIterator[bytes]:
+        return self.db.items.stream_json(**filters.model_dump())
+
+    async def search_items(
+        self,
+        q: str,
+        category_id: Optional[int] = None,
+        location_id: Optional[int] = None,
+        skip: int = 0,
+        limit: int = 20,
+    ) -> list[SItemSearchHit]:
+        match = build_match_query(q)
+        if match is None:
+            return []
+        return await self.db.items.search(
+            match,
+            category_id=category_id,
+            location_id=location_id,
+            limit=limit,
+            offset=skip,
+        )
+
+    async def get_facets(self, filters: SItemFilter) -> SItemFacets:
+        return await self.db.items.get_facets(**filters.model_dump(exclude={"title"}))
+
+    async def get_nearby_items(
+        self,
+        lat: float,
+        lon: float,
+        radius_km: float,
+        category_id: Optional[int] = None,
+        limit: int = 50,
+    ) -> list[SItemNearby]:
+        return await self.db.items.get_nearby(
+            lat, lon, radius_km, category_id=category_id, limit=limit
+        )
+
+    async def get_user_items(
+        self,
+        user_id: int,
+        cursor: Optional[str] = None,
+        skip: Optional[int] = None,
+        limit: int = 100,
+    ) -> SPage[SItemGet]:
+        return await self.get_items(
+            SItemFilter(user_id=user_id), cursor=cursor, skip=skip, limit=limit
+        )
\ No newline at end of file
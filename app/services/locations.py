@@ -1,7 +1,14 @@
 # app/services/locations.py
 from typing import Optional
 from app.exceptions.locations import LocationNotFoundError, LocationAlreadyExistsError
-from app.schemes.locations import SLocationCreate, SLocationUpdate, SLocationPatch
+from app.schemes.locations import (
+    SLocationCreate,
+    SLocationUpdate,
+    SLocationPatch,
+    SLocationFilter,
+    SLocationGet,
+)
+from app.schemes.pagination import SPage
 from app.services.base import BaseService
 
 
@@ -51,5 +58,14 @@ class LocationService(BaseService):
         await self.db.commit()
         return
 
-    async def get_locations(self):
-        return await self.db.locations.get_all()
\ No newline at end of file
+    async def get_locations(
+        self,
+        filters: SLocationFilter,
+        cursor: Optional[str] = None,
+        skip: Optional[int] = None,
+        limit: int = 100,
+    ) -> SPage[SLocationGet]:
+        locations, next_cursor = await self.db.locations.get_page(
+            limit=limit, cursor=cursor, offset=skip, **filters.model_dump()
+        )
+        return SPage[SLocationGet](items=locations, next_cursor=next_cursor)
\ No newline at end of file
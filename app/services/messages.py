@@ -1,21 +1,117 @@
-# app/services/messages.py
+from datetime import datetime
 from typing import Optional
-from app.exceptions.messages import MessageNotFoundError
-from app.schemes.messages import SMessageCreate, SMessageUpdate, SMessagePatch
+from app.exceptions.items import ItemNotFoundError
+from app.exceptions.messages import (
+    ConversationNotFoundError,
+    MessageAccessDeniedError,
+    MessageNotFoundError,
+    MessageToYourselfError,
+)
+from app.exceptions.users import UserNotFoundError
+from app.schemes.messages import (
+    SConversationGet,
+    SConversationList,
+    SConversationRecord,
+    SMessageAdd,
+    SMessageCreate,
+    SMessageGet,
+    SMessagePatch,
+    SMessageSend,
+    SMessageUpdate,
+)
+from app.schemes.pagination import SPage
 from app.services.base import BaseService
+from app.utils.realtime import message_hub
 
 
 class MessageService(BaseService):
 
-    async def create_message(self, message_data: SMessageCreate):
+    async def start_conversation(self, user_id: int, message_data: SMessageAdd) -> SMessageGet:
+        """Первое сообщение по объявлению: чат создается в том же запросе, что и сообщение"""
+        if await self.db.items.get_one_or_none(id=message_data.item_id) is None:
+            raise ItemNotFoundError
+        if await self.db.users.get_one_or_none(id=message_data.receiver_id) is None:
+            raise UserNotFoundError
+        return await self._send(
+            user_id, message_data.receiver_id, message_data.item_id, message_data.text
+        )
+
+    async def send_message(
+        self, user_id: int, conversation_id: int, message_data: SMessageSend
+    ) -> SMessageGet:
+        conversation = await self._get_own_conversation(user_id, conversation_id)
+        return await self._send(
+            user_id, conversation.partner_of(user_id), conversation.item_id, message_data.text
+        )
+
+    async def _send(self, sender_id: int, recipient_id: int, item_id: int, text: str) -> SMessageGet:
+        if sender_id == recipient_id:
+            raise MessageToYourselfError
+        sent_at = datetime.utcnow()
         try:
-            # Создание нового сообщения
-            new_message = await self.db.messages.create(message_data.model_dump())
+            conversation_id = await self.db.conversations.touch(
+                sender_id, recipient_id, item_id, sent_at
+            )
+            message = await self.db.messages.add(
+                SMessageCreate(
+                    text=text,
+                    sender_id=sender_id,
+                    recipient_id=recipient_id,
+                    item_id=item_id,
+                    conversation_id=conversation_id,
+                    created_at=sent_at,
+                )
+            )
+            await self.db.conversations.set_last_message(conversation_id, message.id)
             await self.db.commit()
-            return new_message
-        except Exception as e:
+        except Exception:
             await self.db.rollback()
-            raise e
+            raise
+        await message_hub.publish(
+            (sender_id, recipient_id),
+            {
+                "type": "message",
+                "conversation_id": conversation_id,
+                "message": message.model_dump(mode="json"),
+            },
+        )
+        return message
+
+    async def _get_own_conversation(self, user_id: int, conversation_id: int) -> SConversationRecord:
+        conversation = await self.db.conversations.get_one_or_none(id=conversation_id)
+        if conversation is None:
+            raise ConversationNotFoundError
+        if not conversation.has_participant(user_id):
+            raise MessageAccessDeniedError
+        return conversation
+
+    async def get_conversations(
+        self,
+        user_id: int,
+        cursor: Optional[str] = None,
+        skip: Optional[int] = None,
+        limit: int = 100,
+    ) -> SPage[SConversationList]:
+        conversations, next_cursor = await self.db.conversations.get_inbox(
+            user_id, limit=limit, cursor=cursor, offset=skip
+        )
+        return SPage[SConversationList](items=conversations, next_cursor=next_cursor)
+
+    async def get_conversation(self, user_id: int, conversation_id: int) -> SConversationGet:
+        row = await self.db.conversations.get_summary(conversation_id, user_id)
+        if row is None:
+            # Различаем "нет такого чата" и "чат чужой"
+            await self._get_own_conversation(user_id, conversation_id)
+            raise ConversationNotFoundError
+        return SConversationGet(
+            id=row.id,
+            item_id=row.item_id,
+            partner_id=row.partner_id,
+            partner_name=row.partner,
+            last_message=row.last_message,
+            unread_count=row.unread,
+            last_message_time=row.last_message_at.isoformat() if row.last_message_at else "",
+        )
 
     async def get_message(self, message_id: int):
         message = await self.db.messages.get_one_or_none(id=message_id)
@@ -43,13 +139,50 @@ class MessageService(BaseService):
             await self.db.commit()
         return
 
-    async def delete_message(self, message_id: int):
+    async def delete_message(self, user_id: int, message_id: int):
         message = await self.db.messages.get_one_or_none(id=message_id)
         if not message:
             raise MessageNotFoundError
-        await self.db.messages.delete(message_id)
+        if message.sender_id != user_id:
+            raise MessageAccessDeniedError
+        await self.db.messages.delete(id=message_id)
+        if message.conversation_id is not None:
+            # Сводку чата держим согласованной: счетчики и указатель на последнее
+            conversation = await self.db.conversations.get_one_or_none(id=message.conversation_id)
+            await self.db.conversations.forget_message(conversation, message)
         await self.db.commit()
         return
 
-    async def get_messages(self):
-        return await self.db.messages.get_all()
\ No newline at end of file
+    async def get_messages(
+        self,
+        user_id: int,
+        conversation_id: int,
+        cursor: Optional[str] = None,
+        skip: Optional[int] = None,
+        limit: int = 100,
+    ) -> SPage[SMessageGet]:
+        conversation = await self._get_own_conversation(user_id, conversation_id)
+        messages, next_cursor = await self.db.messages.get_chat(
+            conversation_id, limit=limit, cursor=cursor, offset=skip
+        )
+        # Прочитано - значит не новее водяного знака получателя
+        for message in messages:
+            last_read_id = conversation.last_read_id(message.recipient_id)
+            message.is_read = last_read_id is not None and message.id <= last_read_id
+        return SPage[SMessageGet](items=messages, next_cursor=next_cursor)
+
+    async def mark_read(self, user_id: int, conversation_id: int) -> None:
+        watermark = await self.db.conversations.mark_read(conversation_id, user_id)
+        if watermark is None:
+            await self._get_own_conversation(user_id, conversation_id)
+            raise ConversationNotFoundError
+        await self.db.commit()
+        await message_hub.publish(
+            (watermark.user_low_id, watermark.user_high_id),
+            {
+                "type": "read",
+                "conversation_id": conversation_id,
+                "user_id": user_id,
+                "last_read_id": watermark.last_message_id,
+            },
+        )
@@ -1,21 +1,38 @@
 # app/services/reviews.py
-from typing import Optional
-from app.exceptions.reviews import ReviewNotFoundError
-from app.schemes.reviews import SReviewCreate, SReviewUpdate, SReviewPatch
+from typing import AsyncIterator, Optional
+from app.exceptions.base import ObjectAlreadyExistsError
+from app.exceptions.items import ItemNotFoundError
+from app.exceptions.reviews import (
+    ReviewAccessDeniedError,
+    ReviewAlreadyExistsError,
+    ReviewNotFoundError,
+)
+from app.models.reviews import ReviewModel
+from app.schemes.reviews import (
+    SReviewAdd,
+    SReviewCreate,
+    SReviewUpdate,
+    SReviewPatch,
+    SReviewFilter,
+    SReviewGet,
+)
+from app.schemes.pagination import SPage
 from app.services.base import BaseService
+from app.services.trust import TrustService
 
 
 class ReviewService(BaseService):
 
-    async def create_review(self, review_data: SReviewCreate):
+    async def create_review(self, user_id: int, review_data: SReviewAdd):
         try:
-            # Создание нового отзыва
-            new_review = await self.db.reviews.create(review_data.model_dump())
-            await self.db.commit()
-            return new_review
-        except Exception as e:
-            await self.db.rollback()
-            raise e
+            await self.db.reviews.add(SReviewCreate(**review_data.model_dump(), user_id=user_id))
+        except ObjectAlreadyExistsError:
+            raise ReviewAlreadyExistsError
+        owner_id = await self.db.items.change_rating_aggregates(
+            review_data.item_id, added=review_data.rating
+        )
+        await TrustService(self.db).review_added(owner_id, review_data.rating)
+        await self.db.commit()
 
     async def get_review(self, review_id: int):
         review = await self.db.reviews.get_one_or_none(id=review_id)
@@ -23,33 +40,97 @@ class ReviewService(BaseService):
             raise ReviewNotFoundError
         return review
 
-    async def update_review(self, review_id: int, review_data: SReviewUpdate):
+    async def edit_review(self, user_id: int, review_id: int, review_data: SReviewUpdate):
+        await self._save_review(user_id, review_id, review_data, exclude_unset=False)
+
+    async def patch_review(self, user_id: int, review_id: int, review_data: SReviewPatch):
+        # Обновление только переданных полей
+        await self._save_review(user_id, review_id, review_data, exclude_unset=True)
+
+    async def _get_own_review(self, user_id: int, review_id: int):
         review = await self.db.reviews.get_one_or_none(id=review_id)
         if not review:
             raise ReviewNotFoundError
-        # Обновление данных отзыва
-        updated_review = await self.db.reviews.update(review_id, review_data.model_dump())
+        # Оценка двигает рейтинг объявления и доверие к продавцу - менять ее может только автор
+        if review.user_id != user_id:
+            raise ReviewAccessDeniedError
+        return review
+
+    async def _save_review(
+        self,
+        user_id: int,
+        review_id: int,
+        review_data: SReviewUpdate | SReviewPatch,
+        exclude_unset: bool,
+    ):
+        review = await self._get_own_review(user_id, review_id)
+        changes = review_data.model_dump(exclude_unset=exclude_unset)
+        if not changes:
+            return
+        await self.db.reviews.edit(review_data, exclude_unset=exclude_unset, id=review_id)
+        rating = changes.get("rating", review.rating)
+        if rating != review.rating:
+            owner_id = await self.db.items.change_rating_aggregates(
+                review.item_id, removed=review.rating, added=rating
+            )
+            await TrustService(self.db).review_rerated(
+                owner_id, review.rating, rating, review.created_at
+            )
         await self.db.commit()
-        return updated_review
 
-    async def patch_review(self, review_id: int, review_data: SReviewPatch):
-        review = await self.db.reviews.get_one_or_none(id=review_id)
-        if not review:
-            raise ReviewNotFoundError
-        # Обновление только непустых полей
-        patch_data = review_data.model_dump(exclude_unset=True)
-        if patch_data:
-            await self.db.reviews.update(review_id, patch_data)
-            await self.db.commit()
-        return
-
-    async def delete_review(self, review_id: int):
-        review = await self.db.reviews.get_one_or_none(id=review_id)
-        if not review:
-            raise ReviewNotFoundError
-        await self.db.reviews.delete(review_id)
+    async def delete_review(self, user_id: int, review_id: int):
+        review = await self._get_own_review(user_id, review_id)
+        await self.db.reviews.delete(id=review_id)
+        owner_id = await self.db.items.change_rating_aggregates(
+            review.item_id, removed=review.rating
+        )
+        await TrustService(self.db).review_removed(owner_id, review.rating, review.created_at)
         await self.db.commit()
-        return
 
-    async def get_reviews(self):
-        return await self.db.reviews.get_all()
\ No newline at end of file
+    async def get_item_average_rating(self, item_id: int) -> float:
+        # Среднее хранится агрегатами в items - отзывы не читаем
+        item = await self.db.items.get_one_or_none(id=item_id)
+        if not item:
+            raise ItemNotFoundError
+        return item.rating_average or 0.0
+
+    async def get_reviews(
+        self,
+        filters: SReviewFilter,
+        cursor: Optional[str] = None,
+        skip: Optional[int] = None,
+        limit: int = 100,
+    ) -> SPage[SReviewGet]:
+        reviews, next_cursor = await self.db.reviews.get_page(
+            ReviewModel.rating >= filters.min_rating if filters.min_rating is not None else None,
+            ReviewModel.rating <= filters.max_rating if filters.max_rating is not None else None,
+            limit=limit,
+            cursor=cursor,
+            offset=skip,
+            item_id=filters.item_id,
+            user_id=filters.user_id,
+        )
+        return SPage[SReviewGet](items=reviews, next_cursor=next_cursor)
+
+    def stream_reviews(self, filters: SReviewFilter) -> AsyncIterator[bytes]:
+        # Выгрузка всей таблицы идет в порядке первичного ключа - без сортировки в памяти
+        return self.db.reviews.stream_json(
+            ReviewModel.rating >= filters.min_rating if filters.min_rating is not None else None,
+            ReviewModel.rating <= filters.max_rating if filters.max_rating is not None else None,
+            sort_keys=("id",),
+            descending=False,
+            item_id=filters.item_id,
+            user_id=filters.user_id,
+        )
+
+    async def get_item_reviews(
+        self,
+        item_id: int,
+        cursor: Optional[str] = None,
+        skip: Optional[int] = None,
+        limit: int = 100,
+    ) -> SPage[SReviewGet]:
+        reviews, next_cursor = await self.db.reviews.get_item_reviews(
+            item_id, limit=limit, cursor=cursor, offset=skip
+        )
+        return SPage[SReviewGet](items=reviews, next_cursor=next_cursor)
\ No newline at end of file
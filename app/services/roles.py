@@ -1,8 +1,13 @@
+from datetime import datetime
+from typing import Optional
+
 from app.exceptions.base import ObjectAlreadyExistsError
 from app.exceptions.roles import RoleNotFoundError, RoleAlreadyExistsError
-from app.schemes.roles import SRoleAdd
+from app.schemes.roles import SRoleAdd, SRoleGet
 from app.schemes.relations_users_roles import SRoleGetWithRels
 from app.services.base import BaseService
+from app.utils.role_cache import role_cache
+from app.utils.role_stamps import role_stamps
 
 
 class RolesService(BaseService):
@@ -13,30 +18,54 @@ class RolesService(BaseService):
         except ObjectAlreadyExistsError:
             raise RoleAlreadyExistsError
         await self.db.commit()
+        role_cache.invalidate()
 
-    async def get_role_by_id(self, role_id: int):
-        role: SRoleGetWithRels | None = await self.db.roles.get_one_or_none_with_users(
-            id=role_id
-        )
+    async def get_role_by_id(self, role_id: int) -> SRoleGet:
+        """Дешевая проверка и получение роли: из кеша процесса, без пользователей"""
+        role = await role_cache.get(self.db, role_id)
         if not role:
             raise RoleNotFoundError
         return role
 
+    async def get_role(
+        self,
+        role_id: int,
+        cursor: Optional[str] = None,
+        skip: Optional[int] = None,
+        limit: int = 100,
+    ) -> SRoleGetWithRels:
+        """Роль со страницей ее пользователей (для админки)"""
+        role = await self.get_role_by_id(role_id)
+        users, next_cursor = await self.db.roles.get_role_users(
+            role_id, limit=limit, cursor=cursor, offset=skip
+        )
+        return SRoleGetWithRels(id=role.id, name=role.name, users=users, next_cursor=next_cursor)
+
     async def edit_role(self, role_id: int, role_data: SRoleAdd):
         role: SRoleGetWithRels | None = await self.db.roles.get_one_or_none(id=role_id)
         if not role:
             raise RoleNotFoundError
-        await self.db.roles.edit(role_data)
+        await self.db.roles.edit(role_data, id=role_id)
+        await self._role_changed(role_id)
         await self.db.commit()
+        role_cache.invalidate()
         return
 
     async def delete_role(self, role_id: int):
         role: SRoleGetWithRels | None = await self.db.roles.get_one_or_none(id=role_id)
         if not role:
             raise RoleNotFoundError
+        await self._role_changed(role_id)
         await self.db.roles.delete(id=role_id)
         await self.db.commit()
+        role_cache.invalidate()
         return
 
+    async def _role_changed(self, role_id: int) -> None:
+        """Claims о роли в уже выданных токенах ее владельцев больше не верны"""
+        now = datetime.utcnow()
+        for user_id, version in await self.db.users.bump_role_version(role_id=role_id, now=now):
+            role_stamps.note(user_id, version, now)
+
     async def get_roles(self):
         return await self.db.roles.get_all()
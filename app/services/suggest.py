@@ -0,0 +1,19 @@
+# app/services/suggest.py
+from app.schemes.items import SItemSuggestion
+from app.services.base import BaseService
+from app.utils.suggest import suggest_index
+
+
+class SuggestService(BaseService):
+
+    async def rebuild_index(self) -> None:
+        titles = await self.db.items.get_active_title_counts()
+        categories = await self.db.categories.get_active_item_counts()
+        suggest_index.build(titles, categories)
+
+    def suggest(self, prefix: str, limit: int = 10) -> list[SItemSuggestion]:
+        # Без обращения к БД: индекс целиком в памяти процесса
+        return [
+            SItemSuggestion(text=text, kind=kind, count=count)
+            for text, kind, count in suggest_index.suggest(prefix, limit)
+        ]
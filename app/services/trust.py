@@ -0,0 +1,53 @@
+# app/services/trust.py
+from datetime import datetime
+from typing import Optional
+
+from app.services.base import BaseService
+from app.utils.trust import decay, decay_all
+
+
+class TrustService(BaseService):
+    """Рейтинг доверия продавца по отзывам на его объявления"""
+
+    async def review_added(self, owner_id: Optional[int], rating: int) -> None:
+        # Новый отзыв входит с весом 1
+        if owner_id is not None:
+            await self.db.users.shift_trust(owner_id, datetime.utcnow(), 1.0, rating)
+
+    async def review_removed(
+        self, owner_id: Optional[int], rating: int, created_at: datetime
+    ) -> None:
+        if owner_id is None:
+            return
+        now = datetime.utcnow()
+        weight = decay(created_at, now)
+        await self.db.users.shift_trust(owner_id, now, -weight, -weight * rating)
+
+    async def review_rerated(
+        self, owner_id: Optional[int], old_rating: int, new_rating: int, created_at: datetime
+    ) -> None:
+        if owner_id is None:
+            return
+        now = datetime.utcnow()
+        weight = decay(created_at, now)
+        await self.db.users.shift_trust(owner_id, now, 0.0, weight * (new_rating - old_rating))
+
+    async def refresh_decay(self) -> int:
+        """Периодическое затухание: без чтения отзывов, только суммы в users"""
+        updated = await self.db.users.refresh_trust_decay(datetime.utcnow())
+        await self.db.commit()
+        return updated
+
+    async def rebuild(self) -> int:
+        """Полный пересчет по таблице reviews (исправляет накопленную погрешность)"""
+        now = datetime.utcnow()
+        sums: dict[int, list[float]] = {}
+        async for rows in self.db.reviews.stream_owner_ratings():
+            factors = decay_all([max((now - row.created_at).total_seconds(), 0.0) for row in rows])
+            for (owner_id, rating, _), factor in zip(rows, factors):
+                acc = sums.setdefault(owner_id, [0.0, 0.0])
+                acc[0] += factor
+                acc[1] += factor * rating
+        await self.db.users.rebuild_trust(sums, now)
+        await self.db.commit()
+        return len(sums)
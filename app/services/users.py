@@ -1,21 +1,30 @@
+from typing import AsyncIterator
+
 from app.exceptions.base import ObjectAlreadyExistsError
 from app.exceptions.users import UserNotFoundError, UserAlreadyExistsError
-from app.schemes.users import SUserAdd, SUserAddRequest, SUserUpdate
+from app.schemes.users import SUserAdd, SUserAddRequest, SUserAdminGet, SUserUpdate
 from app.schemes.relations_users_roles import SUserGetWithRels
 from app.services.base import BaseService
-from passlib.context import CryptContext
-
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+from app.utils.password_pool import password_pool
+from app.utils.passwords import pwd_context
+from app.utils.revocation import revocations
+from app.utils.role_stamps import role_stamps
 
 class UserService(BaseService):
 
     async def create_user(self, user_data: SUserAddRequest):
+        # Повтор email отсекаем до bcrypt, роль по умолчанию - из кеша ролей, как при регистрации
+        if await self.db.users.get_one_or_none(email=user_data.email):
+            raise UserAlreadyExistsError
+        from app.services.roles import RolesService
+        await RolesService(self.db).get_role_by_id(1)
+
         user_for_db = SUserAdd(
             name=user_data.name,
             email=user_data.email,
-            hashed_password=pwd_context.hash(user_data.password),
-            role_id=user_data.role_id,
-            phone_number=user_data.phone_number,
+            hashed_password=await password_pool.run(pwd_context.hash, user_data.password),
+            role_id=1,
+            phone=user_data.phone,
         )
         try:
             await self.db.users.add(user_for_db)
@@ -37,15 +46,29 @@ class UserService(BaseService):
             raise UserNotFoundError
         await self.db.users.edit(user_data, id=user_id)
         await self.db.commit()
+        # Смену роли версионирует триггер БД; свой процесс узнает о ней сразу
+        updated = await self.db.users.get_one_or_none(id=user_id)
+        if updated.role_version != user.role_version:
+            role_stamps.note(user_id, updated.role_version)
         return
 
     async def delete_user(self, user_id: int):
         user: SUserGetWithRels | None = await self.db.users.get_one_or_none(id=user_id)
         if not user:
             raise UserNotFoundError
+        family_ids = await self.db.refresh_tokens.get_user_families(user_id)
+        # Семейства отзывает триггер БД, другие воркеры увидят это при опросе
         await self.db.users.delete(id=user_id)
         await self.db.commit()
+        for family_id in family_ids:
+            revocations.revoke(family_id)
+        role_stamps.note_deleted(user_id)
         return
 
     async def get_users(self):
-        return await self.db.users.get_all()
\ No newline at end of file
+        return await self.db.users.get_all()
+
+    def stream_users(self) -> AsyncIterator[bytes]:
+        return self.db.users.stream_json(
+            sort_keys=("id",), descending=False, schema=SUserAdminGet
+        )
\ No newline at end of file
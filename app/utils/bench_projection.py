@@ -0,0 +1,89 @@
+"""
+Сравнение режимов выборки страницы объявлений.
+
+    python -m app.utils.bench_projection [строк в таблице] [размер страницы] [повторов]
+
+orm        - ORM-объекты и model_validate(from_attributes=True) на каждую строку
+projection - только колонки схемы и одна валидация списка через TypeAdapter
+"""
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import insert, text
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.database.database import Base
+from app.database.db_manager import DBManager
+from app.models.items import ItemModel
+
+
+async def seed(engine, rows: int) -> None:
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.execute(text("INSERT INTO roles (id, name) VALUES (1, 'user')"))
+        await conn.execute(
+            text(
+                "INSERT INTO users (id, email, name, hashed_password, is_verified, role_id) "
+                "VALUES (1, 'a@example.com', 'A', '-', 0, 1)"
+            )
+        )
+        await conn.execute(text("INSERT INTO categories (id, name) VALUES (1, 'Книги')"))
+        await conn.execute(
+            text("INSERT INTO locations (id, city, region) VALUES (1, 'Москва', 'Москва')")
+        )
+        started = datetime(2025, 1, 1)
+        await conn.execute(
+            insert(ItemModel),
+            [
+                {
+                    "title": f"Объявление {i}",
+                    "description": "Описание " * 10,
+                    "condition": "хорошее",
+                    "is_active": True,
+                    "created_at": started + timedelta(seconds=i),
+                    "user_id": 1,
+                    "category_id": 1,
+                    "location_id": 1,
+                }
+                for i in range(rows)
+            ],
+        )
+
+
+async def measure(session_factory, projection: bool, page_size: int, repeat: int) -> float:
+    started = time.perf_counter()
+    for _ in range(repeat):
+        async with DBManager(session_factory=session_factory) as db:
+            await db.items.get_page(limit=page_size, projection=projection)
+    return (time.perf_counter() - started) / repeat
+
+
+async def run(rows: int, page_size: int, repeat: int) -> None:
+    fd, path = tempfile.mkstemp(suffix=".db")
+    os.close(fd)
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    try:
+        await seed(engine, rows)
+        session_factory = async_sessionmaker(bind=engine, expire_on_commit=False)
+        # Прогрев: кеш скомпилированных запросов и TypeAdapter
+        await measure(session_factory, False, page_size, 3)
+        await measure(session_factory, True, page_size, 3)
+
+        orm = await measure(session_factory, False, page_size, repeat)
+        projection = await measure(session_factory, True, page_size, repeat)
+        print(f"Страница {page_size} строк из {rows}, {repeat} повторов")
+        print(f"orm:        {orm * 1000:8.3f} мс/страница")
+        print(f"projection: {projection * 1000:8.3f} мс/страница  (x{orm / projection:.2f})")
+    finally:
+        await engine.dispose()
+        os.remove(path)
+
+
+if __name__ == "__main__":
+    args = [int(arg) for arg in sys.argv[1:4]]
+    rows, page_size, repeat = args + [10_000, 100, 200][len(args):]
+    asyncio.run(run(rows, page_size, repeat))
@@ -0,0 +1,71 @@
+"""
+Локальный брокер событий чатов для нескольких воркеров uvicorn.
+
+    python -m app.utils.broker [путь к сокету]
+
+Замена внешнему pub/sub: каждая строка (JSON), пришедшая от воркера,
+рассылается всем подключенным воркерам, включая отправителя. Воркеры
+подключаются сами, если в настройках задан REALTIME_BROKER_SOCKET.
+"""
+import asyncio
+import logging
+import os
+import sys
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Воркер, который не вычитывает события, отключается, а не раздувает память брокера
+CLIENT_BUFFER_LIMIT = 4 * 1024 * 1024
+
+
+class Broker:
+    def __init__(self):
+        self.clients: set[asyncio.StreamWriter] = set()
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.clients.add(writer)
+        try:
+            while line := await reader.readline():
+                self.broadcast(line)
+        except (ConnectionError, asyncio.LimitOverrunError, ValueError):
+            pass
+        finally:
+            self.clients.discard(writer)
+            writer.close()
+
+    def broadcast(self, line: bytes) -> None:
+        for client in tuple(self.clients):
+            if client.transport.get_write_buffer_size() > CLIENT_BUFFER_LIMIT:
+                logger.warning("Воркер не успевает читать события, отключаем")
+                self.clients.discard(client)
+                client.close()
+                continue
+            client.write(line)
+
+
+async def serve(path: str) -> None:
+    if os.path.exists(path):
+        os.remove(path)
+    server = await asyncio.start_unix_server(Broker().handle, path=path)
+    logger.info("Брокер событий слушает %s", path)
+    async with server:
+        await server.serve_forever()
+
+
+def main() -> int:
+    path = sys.argv[1] if len(sys.argv) > 1 else settings.REALTIME_BROKER_SOCKET
+    if not path:
+        print("Укажите путь к сокету аргументом или в REALTIME_BROKER_SOCKET")
+        return 1
+    logging.basicConfig(level=logging.INFO)
+    try:
+        asyncio.run(serve(path))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,33 @@
+import base64
+import json
+from datetime import datetime
+from typing import Any, Sequence
+
+from app.exceptions.base import InvalidCursorError
+
+
+def _to_json(value: Any):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """Упаковывает значения ключа сортировки последней строки в непрозрачную строку"""
+    raw = json.dumps([_to_json(v) for v in values], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, python_types: Sequence[type]) -> list[Any]:
+    """Распаковывает курсор и приводит значения к типам колонок ключа сортировки"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if not isinstance(values, list) or len(values) != len(python_types):
+            raise ValueError
+        return [
+            datetime.fromisoformat(v) if t is datetime and v is not None else v
+            for v, t in zip(values, python_types)
+        ]
+    except (ValueError, TypeError) as exc:
+        raise InvalidCursorError from exc
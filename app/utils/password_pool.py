@@ -0,0 +1,68 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, TypeVar
+
+from app.config import settings
+
+T = TypeVar("T")
+
+
+def _timed(func: Callable[..., T], args: tuple) -> tuple[float, float, T]:
+    started = time.perf_counter()
+    result = func(*args)
+    return started, time.perf_counter(), result
+
+
+class PasswordPool:
+    """
+    Пул потоков для bcrypt: хеширование занимает сотни миллисекунд CPU и не должно
+    стоять в цикле событий. bcrypt отпускает GIL, поэтому потоков достаточно.
+    Число потоков ограничено, лишние вызовы ждут в очереди пула - это ожидание
+    и видно в метриках как queue time.
+    """
+
+    def __init__(self, workers: int):
+        self.workers = workers
+        self._executor: ThreadPoolExecutor | None = None
+        self.calls = 0
+        self.in_flight = 0
+        self.queue_time_total = 0.0
+        self.queue_time_max = 0.0
+        self.run_time_total = 0.0
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(self.workers, thread_name_prefix="password")
+        return self._executor
+
+    async def run(self, func: Callable[..., T], *args) -> T:
+        submitted = time.perf_counter()
+        self.in_flight += 1
+        try:
+            started, finished, result = await asyncio.get_running_loop().run_in_executor(
+                self.executor, _timed, func, args
+            )
+        finally:
+            self.in_flight -= 1
+        queue_time = started - submitted
+        self.calls += 1
+        self.queue_time_total += queue_time
+        self.queue_time_max = max(self.queue_time_max, queue_time)
+        self.run_time_total += finished - started
+        return result
+
+    def stats(self) -> dict[str, int | float]:
+        calls = self.calls or 1
+        return {
+            "workers": self.workers,
+            "calls": self.calls,
+            "in_flight": self.in_flight,
+            "queue_ms_avg": round(self.queue_time_total / calls * 1000, 2),
+            "queue_ms_max": round(self.queue_time_max * 1000, 2),
+            "run_ms_avg": round(self.run_time_total / calls * 1000, 2),
+        }
+
+
+password_pool = PasswordPool(settings.PASSWORD_HASH_WORKERS)
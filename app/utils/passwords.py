@@ -0,0 +1,81 @@
+"""
+Общий контекст хеширования паролей и подбор стоимости bcrypt под железо.
+
+    python -m app.utils.passwords [целевое время хеширования, мс]
+
+печатает число раундов, которое стоит записать в BCRYPT_ROUNDS. Если задан
+BCRYPT_TARGET_MS, воркер подбирает раунды сам при старте, и хеши в пределах
+раунда от подобранной стоимости считаются актуальными. Хеши с другой
+стоимостью пересчитываются при следующем входе пользователя, поэтому
+стоимость можно менять в обе стороны без сброса паролей.
+"""
+import math
+import sys
+import time
+
+from passlib.context import CryptContext
+
+from app.config import settings
+
+# Допустимые для bcrypt раунды (стоимость 2^rounds)
+MIN_ROUNDS = 4
+MAX_ROUNDS = 31
+# Воркеры калибруются независимо и на границе могут разойтись на раунд.
+# Без допуска каждый вход на «чужом» воркере пересчитывал бы хеш туда-обратно
+CALIBRATION_TOLERANCE = 1
+# Раунды замера: достаточно долго для стабильного времени, достаточно быстро для старта
+PROBE_ROUNDS = 10
+PROBE_SAMPLES = 3
+
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+
+def set_rounds(rounds: int, tolerance: int = 0) -> None:
+    """
+    Новые хеши - с этой стоимостью; пересчета требуют хеши, стоимость которых
+    отличается больше чем на tolerance раундов.
+    """
+    pwd_context.update(
+        bcrypt__default_rounds=rounds,
+        bcrypt__min_rounds=max(MIN_ROUNDS, rounds - tolerance),
+        bcrypt__max_rounds=min(MAX_ROUNDS, rounds + tolerance),
+    )
+
+
+def get_rounds() -> int:
+    return pwd_context.to_dict()["bcrypt__default_rounds"]
+
+
+def measure_hash_ms(rounds: int, samples: int = PROBE_SAMPLES) -> float:
+    """Лучшее из нескольких измерений: остальные включают шум планировщика"""
+    handler = pwd_context.handler("bcrypt").using(rounds=rounds)
+    best = math.inf
+    for _ in range(samples):
+        started = time.perf_counter()
+        handler.hash("calibration")
+        best = min(best, time.perf_counter() - started)
+    return best * 1000
+
+
+def calibrate_rounds(target_ms: float) -> int:
+    """
+    Наибольшие раунды, при которых хеш считается не дольше target_ms.
+    Каждый раунд удваивает работу, поэтому хватает одного замера.
+    """
+    probe_ms = measure_hash_ms(PROBE_ROUNDS)
+    rounds = PROBE_ROUNDS + math.floor(math.log2(target_ms / probe_ms))
+    return max(MIN_ROUNDS, min(MAX_ROUNDS, rounds))
+
+
+set_rounds(settings.BCRYPT_ROUNDS)
+
+
+def main() -> int:
+    target_ms = float(sys.argv[1]) if len(sys.argv) > 1 else settings.BCRYPT_TARGET_MS or 250.0
+    rounds = calibrate_rounds(target_ms)
+    print(f"BCRYPT_ROUNDS={rounds}  # ≈{measure_hash_ms(rounds, 1):.0f} мс на хеш, цель {target_ms:.0f} мс")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
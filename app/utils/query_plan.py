@@ -0,0 +1,216 @@
+"""
+Проверка планов запросов репозиториев.
+
+    python -m app.utils.query_plan
+
+Создает временную БД по моделям, прогоняет типовые запросы репозиториев,
+снимает для каждого SQL EXPLAIN QUERY PLAN и завершается с кодом 1,
+если какой-то запрос читает таблицу целиком или сортирует без индекса.
+"""
+import asyncio
+import os
+import re
+import sys
+import tempfile
+from datetime import datetime
+
+from pydantic import ValidationError
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.database.database import Base
+from app.database.db_manager import DBManager
+from app.utils.pagination import encode_cursor
+
+FULL_SCAN = re.compile(r"^SCAN (\w+)$")
+TEMP_SORT = "USE TEMP B-TREE FOR ORDER BY"
+# Сортировка по вычисляемому расстоянию неизбежна, но только среди кандидатов из R-tree
+TEMP_SORT_ALLOWED = {"items: рядом"}
+
+SEED_SQL = [
+    "INSERT INTO roles (id, name) VALUES (1, 'user')",
+    "INSERT INTO users (id, email, name, hashed_password, is_verified, role_id) "
+    "VALUES (1, 'a@example.com', 'A', '-', 0, 1), (2, 'b@example.com', 'B', '-', 0, 1)",
+    "INSERT INTO categories (id, name) VALUES (1, 'Книги')",
+    "INSERT INTO locations (id, city, region, latitude, longitude) "
+    "VALUES (1, 'Москва', 'Москва', 55.75, 37.62)",
+    "INSERT INTO items (id, title, description, condition, is_active, created_at, "
+    "user_id, category_id, location_id) "
+    "VALUES (1, 'Книга', '-', 'good', 1, CURRENT_TIMESTAMP, 1, 1, 1)",
+    "INSERT INTO conversations (id, user_low_id, user_high_id, item_id, last_message_id, "
+    "last_message_at) VALUES (1, 1, 2, 1, 1, CURRENT_TIMESTAMP)",
+    "INSERT INTO messages (id, text, created_at, sender_id, recipient_id, item_id, "
+    "conversation_id) VALUES (1, 'Привет', CURRENT_TIMESTAMP, 1, 2, 1, 1)",
+    "INSERT INTO reviews (id, rating, created_at, user_id, item_id) "
+    "VALUES (1, 5, CURRENT_TIMESTAMP, 2, 1)",
+]
+
+# Курсор с произвольным ключом, чтобы проверить и вторые страницы
+CURSOR = encode_cursor([datetime(2030, 1, 1), 10**9])
+
+
+async def drain(batches) -> None:
+    async for _ in batches:
+        pass
+
+
+def export_case(entity: str):
+    async def case(db):
+        repository = getattr(db, entity)
+        await drain(
+            repository.stream_table_rows(
+                repository.model.updated_at >= datetime(2020, 1, 1),
+                sort_keys=("updated_at", "id"),
+            )
+        )
+
+    return case
+
+
+def query_cases():
+    """Типовые запросы репозиториев: (название, корутина от DBManager)"""
+    return [
+        ("items: лента", lambda db: db.items.get_page(limit=20)),
+        ("items: лента, 2 стр.", lambda db: db.items.get_page(limit=20, cursor=CURSOR)),
+        ("items: активные", lambda db: db.items.get_page(limit=20, is_active=True)),
+        ("items: категория", lambda db: db.items.get_page(limit=20, category_id=1)),
+        (
+            "items: активные в категории, 2 стр.",
+            lambda db: db.items.get_page(limit=20, cursor=CURSOR, category_id=1, is_active=True),
+        ),
+        (
+            "items: активные в локации",
+            lambda db: db.items.get_page(limit=20, location_id=1, is_active=True),
+        ),
+        ("items: пользователя", lambda db: db.items.get_page(limit=20, user_id=1)),
+        ("items: по id", lambda db: db.items.get_one_or_none(id=1)),
+        (
+            "items: поиск в категории",
+            lambda db: db.items.search('"книг"*', category_id=1, location_id=1),
+        ),
+        ("items: рядом", lambda db: db.items.get_nearby(55.75, 37.62, 10, category_id=1)),
+        ("items: фасеты", lambda db: db.items.get_facets(is_active=True)),
+        (
+            "items: фасеты в категории и локации",
+            lambda db: db.items.get_facets(category_id=1, location_id=1, is_active=True),
+        ),
+        ("items: фасеты пользователя", lambda db: db.items.get_facets(user_id=1)),
+        ("items: со связями", lambda db: db.items.get_one_or_none_with_relations(id=1)),
+        ("messages: чат", lambda db: db.messages.get_chat(1, limit=20)),
+        ("messages: чат, 2 стр.", lambda db: db.messages.get_chat(1, limit=20, cursor=CURSOR)),
+        ("conversations: список", lambda db: db.conversations.get_inbox(1, limit=20)),
+        (
+            "conversations: список, 2 стр.",
+            lambda db: db.conversations.get_inbox(2, limit=20, cursor=CURSOR),
+        ),
+        ("conversations: один чат", lambda db: db.conversations.get_summary(1, 1)),
+        ("reviews: товара", lambda db: db.reviews.get_item_reviews(1, limit=20)),
+        ("reviews: автора", lambda db: db.reviews.get_page(limit=20, user_id=2)),
+        ("locations: список", lambda db: db.locations.get_page(limit=20)),
+        ("locations: город", lambda db: db.locations.get_page(limit=20, city="Москва")),
+        ("export: items с водяным знаком", export_case("items")),
+        ("export: reviews с водяным знаком", export_case("reviews")),
+        ("export: messages с водяным знаком", export_case("messages")),
+        ("items: строки фида", lambda db: db.items.get_feed_titles("feed", ["1", "2"])),
+        ("users: по email", lambda db: db.users.get_one_or_none(email="a@example.com")),
+        ("users: с ролью", lambda db: db.users.get_one_or_none_with_role(id=1)),
+        (
+            "users: смена ролей",
+            lambda db: db.users.get_role_versions_changed_since(datetime(2030, 1, 1)),
+        ),
+        (
+            "refresh_tokens: отозвано ли семейство",
+            lambda db: db.refresh_tokens.is_family_revoked("f"),
+        ),
+        (
+            "refresh_tokens: свежие отзывы",
+            lambda db: db.refresh_tokens.get_families_revoked_since(datetime(2030, 1, 1)),
+        ),
+        ("roles: пользователи роли", lambda db: db.roles.get_role_users(1, limit=20)),
+        (
+            "roles: пользователи роли, 2 стр.",
+            lambda db: db.roles.get_role_users(1, limit=20, cursor=encode_cursor([10])),
+        ),
+    ]
+
+
+def find_problems(plan: list[str], allow_temp_sort: bool = False) -> list[str]:
+    problems = []
+    for detail in plan:
+        match = FULL_SCAN.match(detail)
+        if match:
+            problems.append(f"полное сканирование таблицы {match.group(1)}")
+        elif detail == TEMP_SORT and not allow_temp_sort:
+            problems.append("сортировка без индекса")
+    return problems
+
+
+async def check_query_plans() -> list[tuple[str, str, list[str]]]:
+    """Возвращает список (запрос, SQL, проблемы) для запросов с плохими планами"""
+    fd, path = tempfile.mkstemp(suffix=".db")
+    os.close(fd)
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    captured: list[tuple[str, object]] = []
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def _capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            captured.append((statement, parameters))
+
+    failures = []
+    try:
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+            # ANALYZE не запускаем: на паре строк планировщик честно выбрал бы
+            # полный проход, а нам нужен план для большой таблицы
+            for sql in SEED_SQL:
+                await conn.execute(text(sql))
+
+        session_factory = async_sessionmaker(bind=engine, expire_on_commit=False)
+        for name, case in query_cases():
+            captured.clear()
+            async with DBManager(session_factory=session_factory) as db:
+                try:
+                    await case(db)
+                except ValidationError:
+                    # Сборка схем ответа на тестовых строках может не пройти -
+                    # нас интересуют только уже выполненные SQL (их наличие проверим ниже)
+                    pass
+                except Exception as exc:
+                    failures.append((name, "", [f"запрос упал: {exc!r}"]))
+                    continue
+            statements = list(captured)
+            if not statements:
+                failures.append((name, "", ["не выполнено ни одного SELECT"]))
+                continue
+
+            async with engine.connect() as conn:
+                for statement, parameters in statements:
+                    result = await conn.exec_driver_sql(
+                        "EXPLAIN QUERY PLAN " + statement, parameters
+                    )
+                    plan = [row[-1] for row in result.all()]
+                    problems = find_problems(plan, name in TEMP_SORT_ALLOWED)
+                    if problems:
+                        failures.append((name, statement, problems))
+    finally:
+        await engine.dispose()
+        os.remove(path)
+
+    return failures
+
+
+def main() -> int:
+    failures = asyncio.run(check_query_plans())
+    for name, statement, problems in failures:
+        print(f"[FAIL] {name}: {', '.join(problems)}")
+        if statement:
+            print("       " + " ".join(statement.split()))
+    if failures:
+        return 1
+    print("Все запросы репозиториев используют индексы")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,192 @@
+import math
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+
+from app.config import settings
+
+
+@dataclass(frozen=True)
+class RateRule:
+    """Ведро на burst попыток, пополняется per_minute попытками в минуту"""
+    name: str
+    burst: int
+    per_minute: float
+
+    @property
+    def rate(self) -> float:
+        return self.per_minute / 60
+
+
+CREATE_TABLE_SQL = (
+    "CREATE TABLE IF NOT EXISTS rate_limits ("
+    "key TEXT PRIMARY KEY, tokens REAL NOT NULL, updated_at REAL NOT NULL, full_at REAL NOT NULL)",
+    "CREATE INDEX IF NOT EXISTS ix_rate_limits_full_at ON rate_limits (full_at)",
+)
+
+# Пополнение и списание одним UPSERT: строка блокируется писателем SQLite,
+# поэтому воркеры не могут потратить одну и ту же попытку дважды.
+# Если попыток нет, WHERE отбрасывает обновление и RETURNING ничего не вернет.
+TAKE_SQL = text(
+    """
+    INSERT INTO rate_limits (key, tokens, updated_at, full_at)
+    VALUES (:key, :burst - 1, :now, :now + 1 / :rate)
+    ON CONFLICT (key) DO UPDATE SET
+        tokens = min(:burst, tokens + (:now - updated_at) * :rate) - 1,
+        updated_at = :now,
+        full_at = :now + (:burst + 1 - min(:burst, tokens + (:now - updated_at) * :rate)) / :rate
+    WHERE min(:burst, tokens + (:now - updated_at) * :rate) >= 1
+    RETURNING tokens
+    """
+)
+
+# Возврат попытки: то же пополнение по времени плюс одна, но не больше burst.
+# Отсутствующая строка - уже полное ведро, возвращать некуда
+REFUND_SQL = text(
+    """
+    UPDATE rate_limits SET
+        tokens = min(:burst, tokens + (:now - updated_at) * :rate + 1),
+        updated_at = :now,
+        full_at = :now + (:burst - min(:burst, tokens + (:now - updated_at) * :rate + 1)) / :rate
+    WHERE key = :key
+    """
+)
+
+# Полное ведро ничем не отличается от отсутствующего - такие строки не нужны
+PURGE_SQL = text("DELETE FROM rate_limits WHERE full_at < :now")
+
+
+class RateLimiter:
+    """
+    Token bucket по ключу «правило:значение» (IP, email). Проверка - O(1):
+    одно ведро из словаря, пополненное по прошедшему времени.
+
+    По умолчанию ведра живут в памяти воркера, не больше max_keys: при
+    переполнении вытесняется ведро, к которому дольше всего не обращались
+    (для него это равносильно полному ведру). С db_path ведра лежат в
+    отдельном файле SQLite, и все воркеры тратят один общий бюджет; строки
+    полных ведер периодически удаляются. Если общий файл недоступен, проверка
+    идет по ведрам в памяти - лимит слабее, но вход не ломается.
+    """
+
+    PURGE_EVERY = 1000
+
+    def __init__(self, max_keys: int, db_path: str | None = None):
+        self.max_keys = max_keys
+        self.db_path = db_path
+        self._buckets: OrderedDict[str, tuple[float, float]] = OrderedDict()
+        self._engine: AsyncEngine | None = None
+        self._checks_since_purge = 0
+        self.allowed = 0
+        self.limited = 0
+        self.shared_errors = 0
+
+    def _take_local(self, key: str, rule: RateRule, now: float) -> float:
+        tokens, updated_at = self._buckets.pop(key, (rule.burst, now))
+        tokens = min(rule.burst, tokens + (now - updated_at) * rule.rate)
+        wait = 0.0
+        if tokens >= 1:
+            tokens -= 1
+        else:
+            wait = (1 - tokens) / rule.rate
+        self._buckets[key] = (tokens, now)
+        if len(self._buckets) > self.max_keys:
+            self._buckets.popitem(last=False)
+        return wait
+
+    def _refund_local(self, key: str, rule: RateRule, now: float) -> None:
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            return
+        tokens, updated_at = bucket
+        self._buckets[key] = (min(rule.burst, tokens + (now - updated_at) * rule.rate + 1), now)
+
+    async def _get_engine(self) -> AsyncEngine:
+        if self._engine is None:
+            engine = create_async_engine(f"sqlite+aiosqlite:///{self.db_path}")
+            async with engine.begin() as conn:
+                await conn.exec_driver_sql(f"PRAGMA busy_timeout={settings.DB_BUSY_TIMEOUT}")
+                await conn.exec_driver_sql("PRAGMA journal_mode=WAL")
+                for sql in CREATE_TABLE_SQL:
+                    await conn.exec_driver_sql(sql)
+            self._engine = engine
+        return self._engine
+
+    async def _take_shared(self, key: str, rule: RateRule, now: float) -> float:
+        engine = await self._get_engine()
+        params = {"key": key, "burst": rule.burst, "rate": rule.rate, "now": now}
+        async with engine.begin() as conn:
+            taken = (await conn.execute(TAKE_SQL, params)).first()
+            self._checks_since_purge += 1
+            if self._checks_since_purge >= self.PURGE_EVERY:
+                await conn.execute(PURGE_SQL, {"now": now})
+                self._checks_since_purge = 0
+        # Точный остаток не читаем лишним запросом: до следующей попытки не меньше 1 / rate
+        return 0.0 if taken is not None else 1 / rule.rate
+
+    async def hit(self, rule: RateRule, value: str) -> float:
+        """Тратит попытку. 0 - можно, иначе сколько секунд подождать"""
+        key = f"{rule.name}:{value}"
+        now = time.time()
+        if self.db_path:
+            try:
+                wait = await self._take_shared(key, rule, now)
+            except Exception:
+                self.shared_errors += 1
+                wait = self._take_local(key, rule, now)
+        else:
+            wait = self._take_local(key, rule, now)
+        if wait:
+            self.limited += 1
+        else:
+            self.allowed += 1
+        return wait
+
+    async def refund(self, rule: RateRule, value: str) -> None:
+        """Возвращает потраченную попытку, например после успешного входа"""
+        key = f"{rule.name}:{value}"
+        now = time.time()
+        if self.db_path:
+            try:
+                engine = await self._get_engine()
+                params = {"key": key, "burst": rule.burst, "rate": rule.rate, "now": now}
+                async with engine.begin() as conn:
+                    await conn.execute(REFUND_SQL, params)
+                return
+            except Exception:
+                self.shared_errors += 1
+        self._refund_local(key, rule, now)
+
+    async def hit_all(self, *checks: tuple[RateRule, str]) -> int:
+        """Проверяет ключи по очереди до первого отказа; секунды до повтора или 0"""
+        for rule, value in checks:
+            wait = await self.hit(rule, value)
+            if wait:
+                return math.ceil(wait)
+        return 0
+
+    async def close(self) -> None:
+        if self._engine is not None:
+            await self._engine.dispose()
+            self._engine = None
+
+    def stats(self) -> dict[str, int | bool]:
+        return {
+            "shared": bool(self.db_path),
+            "buckets": len(self._buckets),
+            "max_keys": self.max_keys,
+            "allowed": self.allowed,
+            "limited": self.limited,
+            "shared_errors": self.shared_errors,
+        }
+
+
+AUTH_IP_RULE = RateRule("auth_ip", settings.AUTH_RATE_IP_BURST, settings.AUTH_RATE_IP_PER_MINUTE)
+AUTH_EMAIL_RULE = RateRule(
+    "auth_email", settings.AUTH_RATE_EMAIL_BURST, settings.AUTH_RATE_EMAIL_PER_MINUTE
+)
+
+auth_limiter = RateLimiter(settings.RATE_LIMIT_MAX_KEYS, settings.RATE_LIMIT_DB_PATH)
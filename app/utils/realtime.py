@@ -0,0 +1,124 @@
+import asyncio
+import logging
+from typing import Iterable
+
+import orjson
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+BROKER_RECONNECT_SECONDS = 1.0
+
+
+class Subscription:
+    """
+    Подписка одного WebSocket-подключения. Очередь ограничена: если клиент
+    не успевает читать, подписка закрывается, а не копит события в памяти -
+    клиент переподключается и добирает историю через REST.
+    """
+
+    def __init__(self, user_id: int, queue_size: int):
+        self.user_id = user_id
+        self.queue: asyncio.Queue[bytes] = asyncio.Queue(maxsize=queue_size)
+        self.overflowed = asyncio.Event()
+
+
+class MessageHub:
+    """
+    Pub/sub событий чатов внутри процесса: пользователь -> его подключения.
+    Если задан сокет брокера, события идут через брокер и доставляются
+    подписчикам всех воркеров (включая отправивший) при получении обратно.
+    """
+
+    def __init__(self, queue_size: int, broker_socket: str | None = None):
+        self.queue_size = queue_size
+        self.broker_socket = broker_socket
+        self.subscriptions: dict[int, set[Subscription]] = {}
+        self._writer: asyncio.StreamWriter | None = None
+        self._broker_task: asyncio.Task | None = None
+        self.counters = {"published": 0, "delivered": 0, "overflowed": 0, "broker_errors": 0}
+
+    def subscribe(self, user_id: int) -> Subscription:
+        subscription = Subscription(user_id, self.queue_size)
+        self.subscriptions.setdefault(user_id, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        subscriptions = self.subscriptions.get(subscription.user_id)
+        if subscriptions is None:
+            return
+        subscriptions.discard(subscription)
+        if not subscriptions:
+            del self.subscriptions[subscription.user_id]
+
+    async def publish(self, user_ids: Iterable[int], event: dict) -> None:
+        user_ids = sorted(set(user_ids))
+        self.counters["published"] += 1
+        if self._writer is not None:
+            line = orjson.dumps({"users": user_ids, "event": event}) + b"\n"
+            try:
+                self._writer.write(line)
+                await self._writer.drain()
+                return
+            except (ConnectionError, RuntimeError):
+                self.counters["broker_errors"] += 1
+                self._writer = None
+                logger.warning("Брокер событий недоступен, доставка только в своем процессе")
+        self.deliver(user_ids, orjson.dumps(event))
+
+    def deliver(self, user_ids: Iterable[int], payload: bytes) -> None:
+        for user_id in user_ids:
+            for subscription in tuple(self.subscriptions.get(user_id, ())):
+                try:
+                    subscription.queue.put_nowait(payload)
+                    self.counters["delivered"] += 1
+                except asyncio.QueueFull:
+                    self.counters["overflowed"] += 1
+                    self.unsubscribe(subscription)
+                    subscription.overflowed.set()
+
+    async def start(self) -> None:
+        if self.broker_socket and self._broker_task is None:
+            self._broker_task = asyncio.create_task(self._listen_broker())
+
+    async def stop(self) -> None:
+        if self._broker_task is not None:
+            self._broker_task.cancel()
+            try:
+                await self._broker_task
+            except asyncio.CancelledError:
+                pass
+            self._broker_task = None
+
+    async def _listen_broker(self) -> None:
+        """Держит подключение к брокеру и раздает пришедшие события своим подписчикам"""
+        while True:
+            writer = None
+            try:
+                reader, writer = await asyncio.open_unix_connection(self.broker_socket)
+                self._writer = writer
+                logger.info("Подключились к брокеру событий %s", self.broker_socket)
+                while line := await reader.readline():
+                    message = orjson.loads(line)
+                    self.deliver(message["users"], orjson.dumps(message["event"]))
+            except (OSError, ValueError, KeyError) as exc:
+                self.counters["broker_errors"] += 1
+                logger.warning("Брокер событий: %s", exc)
+            finally:
+                if self._writer is writer:
+                    self._writer = None
+                if writer is not None:
+                    writer.close()
+            await asyncio.sleep(BROKER_RECONNECT_SECONDS)
+
+    def stats(self) -> dict[str, int | bool]:
+        return {
+            "users": len(self.subscriptions),
+            "connections": sum(len(subs) for subs in self.subscriptions.values()),
+            "broker_connected": self._writer is not None,
+            **self.counters,
+        }
+
+
+message_hub = MessageHub(settings.WS_QUEUE_SIZE, settings.REALTIME_BROKER_SOCKET)
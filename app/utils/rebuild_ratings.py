@@ -0,0 +1,23 @@
+"""
+Пересчет агрегатов отзывов объявлений (rating_count, rating_sum, rating_1..5).
+
+    python -m app.utils.rebuild_ratings
+
+Обычно агрегаты ведет ReviewService; пересчет нужен после ручных правок
+таблицы reviews или восстановления из резервной копии.
+"""
+import asyncio
+
+from app.database.db_manager import DBManager
+from app.database.database import async_session_maker
+
+
+async def rebuild() -> None:
+    async with DBManager(session_factory=async_session_maker) as db:
+        await db.items.rebuild_rating_aggregates()
+        await db.commit()
+
+
+if __name__ == "__main__":
+    asyncio.run(rebuild())
+    print("Агрегаты отзывов пересчитаны")
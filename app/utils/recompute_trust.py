@@ -0,0 +1,27 @@
+"""
+Пересчет рейтинга доверия пользователей.
+
+    python -m app.utils.recompute_trust          # затухание сохраненных сумм до текущего момента
+    python -m app.utils.recompute_trust --full   # полный пересчет по таблице reviews
+
+Первый вариант рассчитан на периодический запуск (cron): отзывы не читаются,
+обновляются только пользователи, у которых есть отзывы.
+"""
+import asyncio
+import sys
+
+from app.database.db_manager import DBManager
+from app.database.database import async_session_maker
+from app.services.trust import TrustService
+
+
+async def recompute(full: bool) -> int:
+    async with DBManager(session_factory=async_session_maker) as db:
+        if full:
+            return await TrustService(db).rebuild()
+        return await TrustService(db).refresh_decay()
+
+
+if __name__ == "__main__":
+    updated = asyncio.run(recompute("--full" in sys.argv[1:]))
+    print(f"Рейтинг доверия обновлен у {updated} пользователей")
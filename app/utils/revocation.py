@@ -0,0 +1,156 @@
+import asyncio
+import hashlib
+import math
+from collections import OrderedDict
+from datetime import datetime, timedelta
+
+from app.config import settings
+
+
+class BloomFilter:
+    """
+    Множество строк в битовом массиве: «нет» - точно нет, «да» - возможно.
+    Размер считается под ожидаемое число элементов и долю ложных срабатываний;
+    k позиций получаются двойным хешированием из одного sha256.
+    """
+
+    def __init__(self, capacity: int, error_rate: float):
+        self.capacity = capacity
+        self.size = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self._bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, value: str):
+        digest = hashlib.sha256(value.encode()).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:16], "little") | 1
+        for i in range(self.hashes):
+            yield (h1 + i * h2) % self.size
+
+    def add(self, value: str) -> None:
+        for pos in self._positions(value):
+            self._bits[pos >> 3] |= 1 << (pos & 7)
+        self.count += 1
+
+    def __contains__(self, value: str) -> bool:
+        return all(self._bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(value))
+
+
+class RevocationList:
+    """
+    Отозванные семейства refresh-токенов (family_id, он же jti первого токена
+    семейства) в памяти процесса. Access-токен несет fid своего семейства,
+    поэтому отзыв семейства закрывает и его.
+
+    Проверка на горячем пути: промах фильтра Блума - токен не отозван, без БД;
+    это почти все запросы. Попадание сверяется с LRU уже проверенных семейств
+    и только при промахе LRU - с таблицей refresh_tokens (ложное срабатывание
+    фильтра или свежий отзыв).
+
+    Отзывы из своего процесса видны сразу, из других воркеров - не позже чем
+    через refresh_seconds: раз в интервал читаются семейства с revoked_at после
+    прошлой проверки. Старше срока жизни refresh-токена отзывы не нужны -
+    токены семейства к тому времени истекли; по этому окну фильтр и
+    пересобирается, когда переполняется.
+    """
+
+    def __init__(
+        self,
+        capacity: int,
+        error_rate: float,
+        lru_size: int,
+        refresh_seconds: float,
+        lifetime: timedelta,
+    ):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.lru_size = lru_size
+        self.refresh_seconds = refresh_seconds
+        self.lifetime = lifetime
+        self._bloom = BloomFilter(capacity, error_rate)
+        self._known: OrderedDict[str, bool] = OrderedDict()  # family_id -> отозвано ли
+        self._checked_at: datetime | None = None
+        self._lock = asyncio.Lock()
+        self.bloom_misses = 0
+        self.lru_hits = 0
+        self.db_checks = 0
+        self.rebuilds = 0
+
+    def _remember(self, family_id: str, revoked: bool) -> None:
+        self._known[family_id] = revoked
+        self._known.move_to_end(family_id)
+        if len(self._known) > self.lru_size:
+            self._known.popitem(last=False)
+
+    def revoke(self, family_id: str) -> None:
+        if self._bloom.count >= self.capacity:
+            # Переполненный фильтр врет чаще заданного; соберем заново при следующем опросе
+            self._checked_at = None
+        self._bloom.add(family_id)
+        self._remember(family_id, True)
+
+    async def is_revoked(self, family_id: str) -> bool:
+        await self.refresh()
+        if family_id not in self._bloom:
+            self.bloom_misses += 1
+            return False
+        known = self._known.get(family_id)
+        if known is not None:
+            self._known.move_to_end(family_id)
+            self.lru_hits += 1
+            return known
+
+        from app.database.db_manager import DBManager
+        async with DBManager.for_read() as db:
+            revoked = await db.refresh_tokens.is_family_revoked(family_id)
+        self.db_checks += 1
+        self._remember(family_id, revoked)
+        return revoked
+
+    async def refresh(self) -> None:
+        now = datetime.utcnow()
+        if self._checked_at and (now - self._checked_at).total_seconds() < self.refresh_seconds:
+            return
+        async with self._lock:
+            if self._checked_at and (now - self._checked_at).total_seconds() < self.refresh_seconds:
+                return
+            rebuild = self._checked_at is None
+            # Окно с запасом: отзыв мог закоммититься позже своего revoked_at
+            since = (
+                now - self.lifetime
+                if rebuild
+                else self._checked_at - timedelta(seconds=self.refresh_seconds)
+            )
+            from app.database.db_manager import DBManager
+            async with DBManager.for_read() as db:
+                family_ids = await db.refresh_tokens.get_families_revoked_since(since)
+
+            if rebuild:
+                self._bloom = BloomFilter(self.capacity, self.error_rate)
+                self.rebuilds += 1
+            for family_id in family_ids:
+                if family_id not in self._bloom:
+                    self._bloom.add(family_id)
+                self._remember(family_id, True)
+            self._checked_at = now
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "bloom_items": self._bloom.count,
+            "bloom_bytes": len(self._bloom._bits),
+            "lru_size": len(self._known),
+            "bloom_misses": self.bloom_misses,
+            "lru_hits": self.lru_hits,
+            "db_checks": self.db_checks,
+            "rebuilds": self.rebuilds,
+        }
+
+
+revocations = RevocationList(
+    settings.REVOCATION_BLOOM_CAPACITY,
+    settings.REVOCATION_BLOOM_ERROR_RATE,
+    settings.REVOCATION_LRU_SIZE,
+    settings.REVOCATION_REFRESH_SECONDS,
+    timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS),
+)
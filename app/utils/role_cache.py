@@ -0,0 +1,35 @@
+import time
+
+from app.config import settings
+from app.schemes.roles import SRoleGet
+
+
+class RoleCache:
+    """
+    Все роли в памяти процесса: таблица крошечная и почти не меняется.
+    Правки ролей в своем процессе сбрасывают кеш сразу, правки из других
+    воркеров видны не позже чем через ttl_seconds.
+    """
+
+    def __init__(self, ttl_seconds: float):
+        self.ttl_seconds = ttl_seconds
+        self._roles: dict[int, SRoleGet] | None = None
+        self._loaded_at = 0.0
+        self.loads = 0
+
+    async def get(self, db, role_id: int) -> SRoleGet | None:
+        if self._roles is None or time.monotonic() - self._loaded_at > self.ttl_seconds:
+            roles = await db.roles.get_all()
+            self._roles = {role.id: role for role in roles}
+            self._loaded_at = time.monotonic()
+            self.loads += 1
+        return self._roles.get(role_id)
+
+    def invalidate(self) -> None:
+        self._roles = None
+
+    def stats(self) -> dict[str, int]:
+        return {"roles": len(self._roles or ()), "loads": self.loads}
+
+
+role_cache = RoleCache(settings.ROLE_CACHE_TTL_SECONDS)
@@ -0,0 +1,67 @@
+import asyncio
+import sys
+from datetime import datetime, timedelta
+
+from app.config import settings
+
+
+# Версия удаленного пользователя: больше любой из токена
+DELETED = sys.maxsize
+
+
+class RoleStamps:
+    """
+    Последние известные версии ролей пользователей, чья роль менялась недавно.
+    Токен несет роль и ее версию на момент выдачи; если здесь версия больше,
+    claims о роли устарели. Изменения в своем процессе учитываются сразу,
+    изменения в других воркерах - не позже чем через refresh_seconds:
+    раз в интервал читаются пользователи с role_changed_at после прошлой проверки.
+    Хранить версии дольше срока жизни access-токена незачем.
+    """
+
+    def __init__(self, refresh_seconds: float, lifetime: timedelta):
+        self.refresh_seconds = refresh_seconds
+        self.lifetime = lifetime
+        self.versions: dict[int, tuple[int, datetime]] = {}  # user_id -> (версия, когда узнали)
+        self._checked_at: datetime | None = None
+        self._lock = asyncio.Lock()
+
+    def note(self, user_id: int, version: int, now: datetime | None = None) -> None:
+        known = self.versions.get(user_id)
+        if known is None or version >= known[0]:
+            self.versions[user_id] = (version, now or datetime.utcnow())
+
+    def note_deleted(self, user_id: int) -> None:
+        """Пользователя больше нет - любые его claims о роли устарели"""
+        self.versions[user_id] = (DELETED, datetime.utcnow())
+
+    def is_stale(self, user_id: int, version: int) -> bool:
+        known = self.versions.get(user_id)
+        return known is not None and known[0] > version
+
+    async def refresh(self, db) -> None:
+        now = datetime.utcnow()
+        if self._checked_at and (now - self._checked_at).total_seconds() < self.refresh_seconds:
+            return
+        async with self._lock:
+            if self._checked_at and (now - self._checked_at).total_seconds() < self.refresh_seconds:
+                return
+            # Окно с запасом: изменение могло закоммититься позже своего role_changed_at
+            since = (self._checked_at or now - self.lifetime) - timedelta(
+                seconds=self.refresh_seconds
+            )
+            for user_id, version in await db.users.get_role_versions_changed_since(since):
+                self.note(user_id, version, now)
+            self._checked_at = now
+            expired = now - self.lifetime
+            for user_id in [uid for uid, (_, seen) in self.versions.items() if seen < expired]:
+                del self.versions[user_id]
+
+    def stats(self) -> dict[str, int]:
+        return {"tracked_users": len(self.versions)}
+
+
+role_stamps = RoleStamps(
+    settings.ROLE_STAMPS_REFRESH_SECONDS,
+    timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES),
+)
@@ -0,0 +1,39 @@
+import re
+
+WORD = re.compile(r"\w+")
+
+# Частые окончания русских слов, длинные первыми. Это не полноценный стеммер:
+# достаточно, чтобы "книги", "книгами" и "книга" сводились к префиксу "книг"
+RU_ENDINGS = sorted(
+    [
+        "иями", "ями", "ами", "иях", "ах", "ях",
+        "ого", "его", "ому", "ему", "ыми", "ими",
+        "ой", "ей", "ий", "ый", "ая", "яя", "ое", "ее", "ие", "ые", "ую", "юю",
+        "ом", "ем", "ов", "ев", "ам", "ям", "ия", "ья",
+        "ть", "ет", "ит", "ут", "ют", "ат", "ят",
+        "а", "я", "о", "е", "ы", "и", "у", "ю", "ь", "й",
+    ],
+    key=len,
+    reverse=True,
+)
+MIN_STEM = 3
+MAX_TERMS = 10
+
+
+def stem(word: str) -> str:
+    for ending in RU_ENDINGS:
+        if word.endswith(ending) and len(word) - len(ending) >= MIN_STEM:
+            return word[: -len(ending)]
+    return word
+
+
+def build_match_query(q: str) -> str | None:
+    """
+    Строка запроса пользователя -> выражение FTS5 MATCH: каждое слово
+    обрезается до основы и ищется по префиксу, слова объединяются через AND.
+    Кавычки вокруг терма экранируют синтаксис FTS5 (OR, NEAR, * и т.п.).
+    """
+    words = WORD.findall(q.lower())[:MAX_TERMS]
+    if not words:
+        return None
+    return " ".join(f'"{stem(word)}"*' for word in words)
@@ -0,0 +1,211 @@
+import heapq
+import logging
+import sys
+from bisect import bisect_left, insort
+from typing import Iterable, Literal
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+SuggestKind = Literal["item", "category"]
+Key = tuple[str, str]  # (нормализованная строка, вид)
+
+# Топ подсказок кешируется для префиксов с длинным диапазоном в массиве
+# (короткие и частые префиксы), узкие диапазоны дешевле просмотреть заново
+CACHE_RANGE_MIN = 256
+TOP_CACHE_SIZE = 20
+# В кеше держим запас кандидатов, чтобы удаление не требовало нового просмотра
+TOP_CACHE_SPARE = 2 * TOP_CACHE_SIZE
+# Оценка накладных расходов на запись сверх самих строк: кортеж ключа,
+# список [текст, популярность], слоты в dict и указатель в массиве
+ENTRY_OVERHEAD = 240
+
+
+def normalize(text: str) -> str:
+    return " ".join(text.lower().replace("ё", "е").split())
+
+
+class PrefixIndex:
+    """
+    Индекс подсказок в памяти процесса: отсортированный массив нормализованных
+    строк и поиск диапазона префикса через bisect. Популярность заголовка -
+    число активных объявлений с ним, категории - число активных объявлений в ней.
+    Новые строки сверх memory_budget (байты, оценка) не добавляются до пересборки.
+    """
+
+    def __init__(self, memory_budget: int):
+        self.memory_budget = memory_budget
+        self.memory_used = 0
+        self.dropped = 0
+        self.keys: list[Key] = []
+        self.entries: dict[Key, list] = {}  # ключ -> [исходный текст, популярность]
+        self.category_names: dict[int, str] = {}
+        # префикс -> [floor, top]: все строки диапазона вне top не популярнее floor
+        self._top_cache: dict[str, list] = {}
+
+    @staticmethod
+    def entry_size(key: Key, text: str) -> int:
+        return sys.getsizeof(key[0]) + sys.getsizeof(text) + ENTRY_OVERHEAD
+
+    def build(
+        self,
+        titles: Iterable[tuple[str, int]],
+        categories: Iterable[tuple[int, str, int]],
+    ) -> None:
+        """Полная пересборка: при нехватке бюджета остаются самые популярные строки"""
+        categories = list(categories)
+        self.category_names = {category_id: name for category_id, name, _ in categories}
+        candidates = [(count, "category", name) for _, name, count in categories]
+        candidates += [(count, "item", title) for title, count in titles]
+        candidates.sort(key=lambda candidate: candidate[0], reverse=True)
+
+        entries: dict[Key, list] = {}
+        memory_used = 0
+        dropped = 0
+        for count, kind, text in candidates:
+            key = (normalize(text), kind)
+            if not key[0]:
+                continue
+            entry = entries.get(key)
+            if entry is not None:
+                # Заголовки, отличающиеся только регистром и пробелами
+                entry[1] += count
+                continue
+            size = self.entry_size(key, text)
+            if memory_used + size > self.memory_budget:
+                dropped += 1
+                continue
+            entries[key] = [text, count]
+            memory_used += size
+
+        self.entries = entries
+        self.keys = sorted(entries)
+        self.memory_used = memory_used
+        self.dropped = dropped
+        self._top_cache.clear()
+        if dropped:
+            logger.warning("Индекс подсказок: %d строк не вошли в бюджет памяти", dropped)
+
+    def suggest(self, prefix: str, limit: int = 10) -> list[tuple[str, SuggestKind, int]]:
+        prefix = normalize(prefix)
+        if not prefix:
+            return []
+        cached = self._top_cache.get(prefix)
+        if cached is not None and limit <= TOP_CACHE_SIZE:
+            top = cached[1]
+        else:
+            top = self._scan(prefix, limit)
+        return [(self.entries[key][0], key[1], self.entries[key][1]) for key in top[:limit]]
+
+    def _scan(self, prefix: str, limit: int) -> list[Key]:
+        keys = self.keys
+        start = bisect_left(keys, (prefix,))
+        # Конец диапазона: первая строка больше любой, начинающейся с prefix
+        end = bisect_left(keys, (prefix + "\U0010ffff",), start)
+        if end - start < CACHE_RANGE_MIN:
+            return heapq.nlargest(limit, keys[start:end], key=self._popularity)
+        top = heapq.nlargest(TOP_CACHE_SPARE, keys[start:end], key=self._popularity)
+        self._top_cache[prefix] = [self._popularity(top[-1]), top]
+        return top
+
+    def _popularity(self, key: Key) -> int:
+        return self.entries[key][1]
+
+    def change(self, text: str, kind: SuggestKind, delta: int) -> None:
+        key = (normalize(text), kind)
+        if not key[0]:
+            return
+        entry = self.entries.get(key)
+        if entry is None:
+            if delta > 0:
+                self._insert(key, text, delta)
+            return
+        entry[1] += delta
+        # Категории остаются в подсказках и без объявлений
+        if entry[1] <= 0 and kind == "item":
+            self._remove(key)
+        else:
+            self._update_top_cache(key)
+
+    def _insert(self, key: Key, text: str, count: int) -> None:
+        size = self.entry_size(key, text)
+        if self.memory_used + size > self.memory_budget:
+            self.dropped += 1
+            return
+        self.entries[key] = [text, count]
+        insort(self.keys, key)
+        self.memory_used += size
+        self._update_top_cache(key)
+
+    def _remove(self, key: Key) -> None:
+        text, _ = self.entries.pop(key)
+        del self.keys[bisect_left(self.keys, key)]
+        self.memory_used -= self.entry_size(key, text)
+        self._update_top_cache(key)
+
+    def _update_top_cache(self, key: Key) -> None:
+        entry = self.entries.get(key)
+        for length in range(1, len(key[0]) + 1):
+            cached = self._top_cache.get(key[0][:length])
+            if cached is None:
+                continue
+            floor, top = cached
+            if key in top:
+                if entry is None or entry[1] < floor:
+                    # Строка ушла вниз и может уступить тем, что вне кеша
+                    top.remove(key)
+                    if len(top) < TOP_CACHE_SIZE:
+                        del self._top_cache[key[0][:length]]
+                        continue
+            elif entry is not None and entry[1] > floor:
+                top.append(key)
+            else:
+                continue
+            top.sort(key=self._popularity, reverse=True)
+            if len(top) > TOP_CACHE_SPARE:
+                del top[TOP_CACHE_SPARE:]
+                cached[0] = self._popularity(top[-1])
+
+    def add_item(self, title: str, category_id: int | None = None) -> None:
+        self.change(title, "item", 1)
+        if category_id in self.category_names:
+            self.change(self.category_names[category_id], "category", 1)
+
+    def remove_item(self, title: str, category_id: int | None = None) -> None:
+        self.change(title, "item", -1)
+        if category_id in self.category_names:
+            self.change(self.category_names[category_id], "category", -1)
+
+    def set_category(self, category_id: int, name: str) -> None:
+        """Добавление или переименование категории с сохранением популярности"""
+        count = 0
+        old_name = self.category_names.get(category_id)
+        if old_name is not None:
+            old_key = (normalize(old_name), "category")
+            if old_key in self.entries:
+                count = self.entries[old_key][1]
+                self._remove(old_key)
+        self.category_names[category_id] = name
+        key = (normalize(name), "category")
+        if key in self.entries:
+            self.change(name, "category", count)
+        elif key[0]:
+            self._insert(key, name, count)
+
+    def remove_category(self, category_id: int) -> None:
+        name = self.category_names.pop(category_id, None)
+        key = (normalize(name or ""), "category")
+        if key in self.entries:
+            self._remove(key)
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "entries": len(self.keys),
+            "memory_used": self.memory_used,
+            "memory_budget": self.memory_budget,
+            "dropped": self.dropped,
+        }
+
+
+suggest_index = PrefixIndex(settings.SUGGEST_MEMORY_BUDGET_MB * 1024 * 1024)
@@ -0,0 +1,57 @@
+import hashlib
+import time
+from collections import OrderedDict
+from typing import Callable
+
+from app.config import settings
+
+
+class TokenCache:
+    """
+    LRU уже проверенных JWT: подпись и срок токена из куки проверяются один раз,
+    дальше claims берутся из памяти до их exp. Ключ - sha256 токена, сам токен
+    не хранится. Ошибки проверки не кешируются - такой токен каждый раз
+    проходит полный разбор и получает то же исключение.
+    """
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._entries: OrderedDict[bytes, tuple[float, dict]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def decode(self, token: str, decoder: Callable[[str], dict]) -> dict:
+        key = hashlib.sha256(token.encode()).digest()
+        entry = self._entries.get(key)
+        if entry is not None:
+            expires_at, claims = entry
+            if expires_at > time.time():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return claims
+            # Истекший токен снова идет в decoder, чтобы получить его исключение
+            del self._entries[key]
+        self.misses += 1
+
+        claims = decoder(token)
+        if "exp" in claims:
+            self._entries[key] = (float(claims["exp"]), claims)
+            if len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+        return claims
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> dict[str, int | float]:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+token_cache = TokenCache(settings.TOKEN_CACHE_SIZE)
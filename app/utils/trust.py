@@ -0,0 +1,30 @@
+import math
+from datetime import datetime
+from typing import Sequence
+
+from app.config import settings
+
+DECAY_PER_SECOND = math.log(2) / (settings.TRUST_HALF_LIFE_DAYS * 24 * 3600)
+
+
+def decay(since: datetime | None, now: datetime) -> float:
+    """Во сколько раз уменьшился вес отзыва с момента since"""
+    if since is None:
+        return 1.0
+    return math.exp(-DECAY_PER_SECOND * max((now - since).total_seconds(), 0.0))
+
+
+def trust_score(weight: float, weighted_sum: float) -> float:
+    """Байесовское среднее: априорная оценка с весом TRUST_PRIOR_WEIGHT плюс отзывы"""
+    return round(
+        (settings.TRUST_PRIOR_MEAN * settings.TRUST_PRIOR_WEIGHT + weighted_sum)
+        / (settings.TRUST_PRIOR_WEIGHT + weight),
+        3,
+    )
+
+
+def decay_all(ages: Sequence[float]) -> list[float]:
+    """Коэффициенты затухания для пачки возрастов (в секундах) за один проход"""
+    rate = -DECAY_PER_SECOND
+    exp = math.exp
+    return [exp(rate * age) for age in ages]
@@ -1,6 +1,8 @@
+from contextlib import asynccontextmanager
+
 import uvicorn
 from fastapi import FastAPI
-from fastapi.responses import RedirectResponse
+from fastapi.responses import ORJSONResponse, RedirectResponse
 
 from fastapi.templating import Jinja2Templates
 from fastapi.staticfiles import StaticFiles
@@ -14,8 +16,44 @@ from app.api.messages import router as message_router
 from app.api.reviews import router as review_router
 from app.api.roles import router as role_router
 from app.api.web import router as web_router
+from app.api.metrics import router as metrics_router
+from app.api.export import router as export_router
+from app.api.ws import router as ws_router
+from app.database.db_manager import DBManager
+from app.database.query_counter import QueryCounterMiddleware
+from app.services.suggest import SuggestService
+from app.config import settings
+from app.utils.password_pool import password_pool
+from app.utils.passwords import CALIBRATION_TOLERANCE, calibrate_rounds, set_rounds
+from app.utils.rate_limit import auth_limiter
+from app.utils.realtime import message_hub
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if settings.BCRYPT_TARGET_MS:
+        # Замер в пуле паролей: десятки миллисекунд bcrypt не должны стоять в цикле событий
+        set_rounds(
+            await password_pool.run(calibrate_rounds, settings.BCRYPT_TARGET_MS),
+            tolerance=CALIBRATION_TOLERANCE,
+        )
+    # Индекс подсказок строится один раз при старте процесса
+    async with DBManager.for_read() as db:
+        await SuggestService(db).rebuild_index()
+    await message_hub.start()
+    yield
+    await message_hub.stop()
+    await auth_limiter.close()
+
+
+app = FastAPI(
+    title="ТовароОбмен",
+    version="0.0.1",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan,
+)
 
-app = FastAPI(title="ТовароОбмен", version="0.0.1")
+app.add_middleware(QueryCounterMiddleware)
 
 app.mount("/static", StaticFiles(directory="app/static"), "static")
 templates = Jinja2Templates(directory="app/templates")
@@ -30,6 +68,9 @@ app.include_router(message_router)
 app.include_router(review_router)
 app.include_router(role_router)
 app.include_router(web_router)
+app.include_router(metrics_router)
+app.include_router(export_router)
+app.include_router(ws_router)
 
 
 @app.get("/")
@@ -18,6 +18,9 @@ from app.models.locations import LocationModel
 from app.models.messages import MessageModel
 from app.models.reviews import ReviewModel
 from app.models.roles import RoleModel
+from app.models.item_facets import ItemFacetCountModel
+from app.models.conversations import ConversationModel
+from app.models.refresh_tokens import RefreshTokenModel
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
@@ -37,6 +40,16 @@ if config.config_file_name is not None:
 # target_metadata = mymodel.Base.metadata
 target_metadata = Base.metadata
 
+
+
+def include_name(name, type_, parent_names) -> bool:
+    # FTS5/R-tree таблицы и их служебные таблицы создаются миграциями вручную,
+    # autogenerate не должен предлагать их удалить
+    if type_ == "table" and name is not None and name.startswith(("items_fts", "items_rtree")):
+        return False
+    return True
+
+
 # other values from the config, defined by the needs of env.py,
 # can be acquired:
 # my_important_option = config.get_main_option("my_important_option")
@@ -59,6 +72,7 @@ def run_migrations_offline() -> None:
     context.configure(
         url=url,
         target_metadata=target_metadata,
+        include_name=include_name,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
     )
@@ -68,7 +82,11 @@ def run_migrations_offline() -> None:
 
 
 def do_run_migrations(connection: Connection) -> None:
-    context.configure(connection=connection, target_metadata=target_metadata)
+    context.configure(
+        connection=connection,
+        target_metadata=target_metadata,
+        include_name=include_name,
+    )
 
     with context.begin_transaction():
         context.run_migrations()
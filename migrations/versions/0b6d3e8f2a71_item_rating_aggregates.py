@@ -0,0 +1,43 @@
+"""item rating aggregates
+
+Revision ID: 0b6d3e8f2a71
+Revises: f3a9c2d8e145
+Create Date: 2026-10-17 22:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0b6d3e8f2a71'
+down_revision: Union[str, Sequence[str], None] = 'f3a9c2d8e145'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+COLUMNS = ['rating_count', 'rating_sum', 'rating_1', 'rating_2', 'rating_3', 'rating_4', 'rating_5']
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for name in COLUMNS:
+        op.add_column('items', sa.Column(name, sa.Integer(), server_default='0', nullable=False))
+    op.execute(
+        "UPDATE items SET "
+        "rating_count = agg.cnt, rating_sum = agg.total, "
+        "rating_1 = agg.r1, rating_2 = agg.r2, rating_3 = agg.r3, rating_4 = agg.r4, rating_5 = agg.r5 "
+        "FROM (SELECT item_id, count(*) AS cnt, sum(rating) AS total, "
+        "sum(rating = 1) AS r1, sum(rating = 2) AS r2, sum(rating = 3) AS r3, "
+        "sum(rating = 4) AS r4, sum(rating = 5) AS r5 "
+        "FROM reviews GROUP BY item_id) AS agg "
+        "WHERE items.id = agg.item_id"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Без batch-режима: пересоздание items удалило бы триггеры
+    for name in reversed(COLUMNS):
+        op.execute(f"ALTER TABLE items DROP COLUMN {name}")
@@ -0,0 +1,58 @@
+"""query indexes
+
+Revision ID: 3b9c1d2e4f5a
+Revises: faf68217eeb8
+Create Date: 2026-10-17 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3b9c1d2e4f5a'
+down_revision: Union[str, Sequence[str], None] = 'faf68217eeb8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_items_created_at_id', 'items', ['created_at', 'id'], unique=False)
+    op.create_index('ix_items_category_created', 'items', ['category_id', 'created_at', 'id'], unique=False)
+    op.create_index('ix_items_location_created', 'items', ['location_id', 'created_at', 'id'], unique=False)
+    op.create_index('ix_items_user_created', 'items', ['user_id', 'created_at', 'id'], unique=False)
+    op.create_index('ix_items_active_created', 'items', ['created_at', 'id'], unique=False, sqlite_where=sa.text('is_active = 1'))
+    op.create_index('ix_items_active_category_created', 'items', ['category_id', 'created_at', 'id'], unique=False, sqlite_where=sa.text('is_active = 1'))
+    op.create_index('ix_items_active_location_created', 'items', ['location_id', 'created_at', 'id'], unique=False, sqlite_where=sa.text('is_active = 1'))
+    op.create_index('ix_messages_sender_recipient_created', 'messages', ['sender_id', 'recipient_id', 'created_at', 'id'], unique=False)
+    op.create_index('ix_messages_recipient_created', 'messages', ['recipient_id', 'created_at', 'id'], unique=False)
+    op.create_index('ix_reviews_item_created', 'reviews', ['item_id', 'created_at', 'id'], unique=False)
+    op.create_index('ix_reviews_user_created', 'reviews', ['user_id', 'created_at', 'id'], unique=False)
+    op.create_index('ix_locations_created_at_id', 'locations', ['created_at', 'id'], unique=False)
+    op.create_index('ix_locations_city_created', 'locations', ['city', 'created_at', 'id'], unique=False)
+    op.create_index('ix_locations_region_created', 'locations', ['region', 'created_at', 'id'], unique=False)
+    op.create_index(op.f('ix_users_role_id'), 'users', ['role_id'], unique=False)
+    # Свежая статистика для планировщика
+    op.execute('ANALYZE')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_users_role_id'), table_name='users')
+    op.drop_index('ix_locations_region_created', table_name='locations')
+    op.drop_index('ix_locations_city_created', table_name='locations')
+    op.drop_index('ix_locations_created_at_id', table_name='locations')
+    op.drop_index('ix_reviews_user_created', table_name='reviews')
+    op.drop_index('ix_reviews_item_created', table_name='reviews')
+    op.drop_index('ix_messages_recipient_created', table_name='messages')
+    op.drop_index('ix_messages_sender_recipient_created', table_name='messages')
+    op.drop_index('ix_items_active_location_created', table_name='items', sqlite_where=sa.text('is_active = 1'))
+    op.drop_index('ix_items_active_category_created', table_name='items', sqlite_where=sa.text('is_active = 1'))
+    op.drop_index('ix_items_active_created', table_name='items', sqlite_where=sa.text('is_active = 1'))
+    op.drop_index('ix_items_user_created', table_name='items')
+    op.drop_index('ix_items_location_created', table_name='items')
+    op.drop_index('ix_items_category_created', table_name='items')
+    op.drop_index('ix_items_created_at_id', table_name='items')
@@ -0,0 +1,69 @@
+"""user trust score
+
+Revision ID: 5c1e7a9b3d42
+Revises: 0b6d3e8f2a71
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+import math
+from datetime import datetime
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.config import settings
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5c1e7a9b3d42'
+down_revision: Union[str, Sequence[str], None] = '0b6d3e8f2a71'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('users', sa.Column('trust_score', sa.Float(), server_default=str(settings.TRUST_PRIOR_MEAN), nullable=False))
+    op.add_column('users', sa.Column('trust_weight', sa.Float(), server_default='0', nullable=False))
+    op.add_column('users', sa.Column('trust_weighted_sum', sa.Float(), server_default='0', nullable=False))
+    op.add_column('users', sa.Column('trust_decayed_at', sa.DateTime(), nullable=True))
+
+    # Начальные значения по уже оставленным отзывам (то же, что recompute_trust --full)
+    bind = op.get_bind()
+    now = datetime.utcnow()
+    rate = math.log(2) / (settings.TRUST_HALF_LIFE_DAYS * 24 * 3600)
+    sums: dict[int, list[float]] = {}
+    rows = bind.execute(sa.text(
+        "SELECT items.user_id, reviews.rating, reviews.created_at "
+        "FROM reviews JOIN items ON items.id = reviews.item_id"
+    ))
+    for owner_id, rating, created_at in rows:
+        age = max((now - datetime.fromisoformat(str(created_at))).total_seconds(), 0.0)
+        acc = sums.setdefault(owner_id, [0.0, 0.0])
+        acc[0] += math.exp(-rate * age)
+        acc[1] += math.exp(-rate * age) * rating
+    prior = settings.TRUST_PRIOR_MEAN * settings.TRUST_PRIOR_WEIGHT
+    for owner_id, (weight, weighted_sum) in sums.items():
+        bind.execute(
+            sa.text(
+                "UPDATE users SET trust_weight = :w, trust_weighted_sum = :s, "
+                "trust_decayed_at = :now, trust_score = :score WHERE id = :id"
+            ),
+            {
+                "w": weight,
+                "s": weighted_sum,
+                "now": now,
+                "score": round((prior + weighted_sum) / (settings.TRUST_PRIOR_WEIGHT + weight), 3),
+                "id": owner_id,
+            },
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('users') as batch_op:
+        batch_op.drop_column('trust_decayed_at')
+        batch_op.drop_column('trust_weighted_sum')
+        batch_op.drop_column('trust_weight')
+        batch_op.drop_column('trust_score')
@@ -0,0 +1,33 @@
+"""items external id
+
+Revision ID: 7d2e5a9c1b4f
+Revises: 3b9c1d2e4f5a
+Create Date: 2026-10-17 13:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7d2e5a9c1b4f'
+down_revision: Union[str, Sequence[str], None] = '3b9c1d2e4f5a'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('items', sa.Column('source', sa.String(), nullable=True))
+    op.add_column('items', sa.Column('external_id', sa.String(), nullable=True))
+    op.create_index('ux_items_source_external_id', 'items', ['source', 'external_id'], unique=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ux_items_source_external_id', table_name='items')
+    with op.batch_alter_table('items') as batch_op:
+        batch_op.drop_column('external_id')
+        batch_op.drop_column('source')
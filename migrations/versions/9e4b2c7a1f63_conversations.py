@@ -0,0 +1,78 @@
+"""conversations summary table
+
+Revision ID: 9e4b2c7a1f63
+Revises: 5c1e7a9b3d42
+Create Date: 2026-10-17 23:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9e4b2c7a1f63'
+down_revision: Union[str, Sequence[str], None] = '5c1e7a9b3d42'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('conversations',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_low_id', sa.Integer(), nullable=False),
+    sa.Column('user_high_id', sa.Integer(), nullable=False),
+    sa.Column('item_id', sa.Integer(), nullable=False),
+    sa.Column('last_message_id', sa.Integer(), nullable=True),
+    sa.Column('last_message_at', sa.DateTime(), nullable=True),
+    sa.Column('unread_low', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('unread_high', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('created_at', sa.DateTime(), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=False),
+    sa.ForeignKeyConstraint(['item_id'], ['items.id'], ),
+    sa.ForeignKeyConstraint(['user_high_id'], ['users.id'], ),
+    sa.ForeignKeyConstraint(['user_low_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_conversations_high_last', 'conversations', ['user_high_id', 'last_message_at', 'id'], unique=False)
+    op.create_index('ix_conversations_low_last', 'conversations', ['user_low_id', 'last_message_at', 'id'], unique=False)
+    op.create_index('ux_conversations_pair_item', 'conversations', ['user_low_id', 'user_high_id', 'item_id'], unique=True)
+    with op.batch_alter_table('messages', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('conversation_id', sa.Integer(), nullable=True))
+        batch_op.create_foreign_key('fk_messages_conversation_id', 'conversations', ['conversation_id'], ['id'])
+        batch_op.create_index('ix_messages_conversation_created', ['conversation_id', 'created_at', 'id'], unique=False)
+
+    # Чаты из существующей переписки; признака прочтения раньше не было,
+    # поэтому непрочитанные начинаются с нуля
+    op.execute(
+        "INSERT INTO conversations (user_low_id, user_high_id, item_id, last_message_at) "
+        "SELECT min(sender_id, recipient_id), max(sender_id, recipient_id), item_id, max(created_at) "
+        "FROM messages GROUP BY 1, 2, 3"
+    )
+    op.execute(
+        "UPDATE messages SET conversation_id = ("
+        "SELECT c.id FROM conversations c "
+        "WHERE c.user_low_id = min(messages.sender_id, messages.recipient_id) "
+        "AND c.user_high_id = max(messages.sender_id, messages.recipient_id) "
+        "AND c.item_id = messages.item_id)"
+    )
+    op.execute(
+        "UPDATE conversations SET last_message_id = ("
+        "SELECT m.id FROM messages m WHERE m.conversation_id = conversations.id "
+        "ORDER BY m.created_at DESC, m.id DESC LIMIT 1)"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('messages', schema=None) as batch_op:
+        batch_op.drop_index('ix_messages_conversation_created')
+        batch_op.drop_constraint('fk_messages_conversation_id', type_='foreignkey')
+        batch_op.drop_column('conversation_id')
+
+    op.drop_index('ux_conversations_pair_item', table_name='conversations')
+    op.drop_index('ix_conversations_low_last', table_name='conversations')
+    op.drop_index('ix_conversations_high_last', table_name='conversations')
+    op.drop_table('conversations')
@@ -0,0 +1,41 @@
+"""role version and token revocation triggers
+
+Revision ID: a3d9f0b6c1e4
+Revises: e8c3f5a1d706
+Create Date: 2026-10-18 04:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a3d9f0b6c1e4'
+down_revision: Union[str, Sequence[str], None] = 'e8c3f5a1d706'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_refresh_tokens_user_id', 'refresh_tokens', ['user_id'], unique=False)
+    op.execute(
+        "CREATE TRIGGER users_role_version_au AFTER UPDATE OF role_id ON users "
+        "WHEN old.role_id IS NOT new.role_id BEGIN "
+        "UPDATE users SET role_version = role_version + 1, "
+        "role_changed_at = strftime('%Y-%m-%d %H:%M:%f', 'now') || '000' WHERE id = new.id; END"
+    )
+    op.execute(
+        "CREATE TRIGGER users_refresh_tokens_ad AFTER DELETE ON users BEGIN "
+        "UPDATE refresh_tokens SET revoked_at = strftime('%Y-%m-%d %H:%M:%f', 'now') || '000' "
+        "WHERE user_id = old.id AND revoked_at IS NULL; END"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP TRIGGER IF EXISTS users_refresh_tokens_ad")
+    op.execute("DROP TRIGGER IF EXISTS users_role_version_au")
+    op.drop_index('ix_refresh_tokens_user_id', table_name='refresh_tokens')
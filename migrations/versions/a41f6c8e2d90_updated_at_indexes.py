@@ -0,0 +1,32 @@
+"""updated_at indexes
+
+Revision ID: a41f6c8e2d90
+Revises: 7d2e5a9c1b4f
+Create Date: 2026-10-17 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a41f6c8e2d90'
+down_revision: Union[str, Sequence[str], None] = '7d2e5a9c1b4f'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_items_updated_at_id', 'items', ['updated_at', 'id'], unique=False)
+    op.create_index('ix_reviews_updated_at_id', 'reviews', ['updated_at', 'id'], unique=False)
+    op.create_index('ix_messages_updated_at_id', 'messages', ['updated_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_messages_updated_at_id', table_name='messages')
+    op.drop_index('ix_reviews_updated_at_id', table_name='reviews')
+    op.drop_index('ix_items_updated_at_id', table_name='items')
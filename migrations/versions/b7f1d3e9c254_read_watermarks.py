@@ -0,0 +1,72 @@
+"""conversation read watermarks
+
+Revision ID: b7f1d3e9c254
+Revises: 9e4b2c7a1f63
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7f1d3e9c254'
+down_revision: Union[str, Sequence[str], None] = '9e4b2c7a1f63'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+SIDES = ("low", "high")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.batch_alter_table('conversations', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('received_low', sa.Integer(), server_default='0', nullable=False))
+        batch_op.add_column(sa.Column('received_high', sa.Integer(), server_default='0', nullable=False))
+        batch_op.add_column(sa.Column('read_low', sa.Integer(), server_default='0', nullable=False))
+        batch_op.add_column(sa.Column('read_high', sa.Integer(), server_default='0', nullable=False))
+        batch_op.add_column(sa.Column('last_read_low_id', sa.Integer(), nullable=True))
+        batch_op.add_column(sa.Column('last_read_high_id', sa.Integer(), nullable=True))
+
+    # Непрочитанными остаются последние unread_* входящих, остальное - до водяного знака
+    for side in SIDES:
+        received = (
+            "FROM messages m WHERE m.conversation_id = conversations.id "
+            f"AND m.recipient_id = conversations.user_{side}_id"
+        )
+        op.execute(
+            f"UPDATE conversations SET received_{side} = (SELECT count(*) {received}), "
+            f"read_{side} = max((SELECT count(*) {received}) - unread_{side}, 0)"
+        )
+        op.execute(
+            f"UPDATE conversations SET last_read_{side}_id = ("
+            "SELECT id FROM (SELECT m.id, row_number() OVER "
+            f"(ORDER BY m.created_at DESC, m.id DESC) AS position {received}) "
+            f"WHERE position = conversations.unread_{side} + 1)"
+        )
+
+    with op.batch_alter_table('conversations', schema=None) as batch_op:
+        batch_op.drop_column('unread_high')
+        batch_op.drop_column('unread_low')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('conversations', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('unread_low', sa.Integer(), server_default='0', nullable=False))
+        batch_op.add_column(sa.Column('unread_high', sa.Integer(), server_default='0', nullable=False))
+
+    op.execute(
+        "UPDATE conversations SET unread_low = received_low - read_low, "
+        "unread_high = received_high - read_high"
+    )
+
+    with op.batch_alter_table('conversations', schema=None) as batch_op:
+        batch_op.drop_column('last_read_high_id')
+        batch_op.drop_column('last_read_low_id')
+        batch_op.drop_column('read_high')
+        batch_op.drop_column('read_low')
+        batch_op.drop_column('received_high')
+        batch_op.drop_column('received_low')
@@ -0,0 +1,55 @@
+"""items full-text search
+
+Revision ID: c5e8f1a3b7d2
+Revises: a41f6c8e2d90
+Create Date: 2026-10-17 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c5e8f1a3b7d2'
+down_revision: Union[str, Sequence[str], None] = 'a41f6c8e2d90'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute(
+        "CREATE VIRTUAL TABLE items_fts USING fts5("
+        "title, description, content='items', content_rowid='id', "
+        "tokenize='unicode61 remove_diacritics 2', prefix='2 3 4')"
+    )
+    op.execute("INSERT INTO items_fts(items_fts, rank) VALUES ('rank', 'bm25(10.0, 1.0)')")
+    op.execute(
+        "CREATE TRIGGER items_fts_ai AFTER INSERT ON items BEGIN "
+        "INSERT INTO items_fts(rowid, title, description) "
+        "VALUES (new.id, new.title, new.description); END"
+    )
+    op.execute(
+        "CREATE TRIGGER items_fts_ad AFTER DELETE ON items BEGIN "
+        "INSERT INTO items_fts(items_fts, rowid, title, description) "
+        "VALUES ('delete', old.id, old.title, old.description); END"
+    )
+    op.execute(
+        "CREATE TRIGGER items_fts_au AFTER UPDATE OF title, description ON items BEGIN "
+        "INSERT INTO items_fts(items_fts, rowid, title, description) "
+        "VALUES ('delete', old.id, old.title, old.description); "
+        "INSERT INTO items_fts(rowid, title, description) "
+        "VALUES (new.id, new.title, new.description); END"
+    )
+    # Индекс по уже существующим объявлениям
+    op.execute("INSERT INTO items_fts(items_fts) VALUES ('rebuild')")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP TRIGGER IF EXISTS items_fts_au")
+    op.execute("DROP TRIGGER IF EXISTS items_fts_ad")
+    op.execute("DROP TRIGGER IF EXISTS items_fts_ai")
+    op.execute("DROP TABLE IF EXISTS items_fts")
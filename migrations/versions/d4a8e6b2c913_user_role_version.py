@@ -0,0 +1,33 @@
+"""user role version
+
+Revision ID: d4a8e6b2c913
+Revises: b7f1d3e9c254
+Create Date: 2026-10-18 01:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd4a8e6b2c913'
+down_revision: Union[str, Sequence[str], None] = 'b7f1d3e9c254'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('users', sa.Column('role_version', sa.Integer(), server_default='0', nullable=False))
+    op.add_column('users', sa.Column('role_changed_at', sa.DateTime(), nullable=True))
+    op.create_index(op.f('ix_users_role_changed_at'), 'users', ['role_changed_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_users_role_changed_at'), table_name='users')
+    with op.batch_alter_table('users') as batch_op:
+        batch_op.drop_column('role_changed_at')
+        batch_op.drop_column('role_version')
@@ -0,0 +1,74 @@
+"""geo points and items rtree
+
+Revision ID: e2b7d4c9a610
+Revises: c5e8f1a3b7d2
+Create Date: 2026-10-17 18:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e2b7d4c9a610'
+down_revision: Union[str, Sequence[str], None] = 'c5e8f1a3b7d2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+ITEM_POINT_SQL = (
+    "SELECT new.latitude AS lat, new.longitude AS lon "
+    "WHERE new.latitude IS NOT NULL AND new.longitude IS NOT NULL "
+    "UNION ALL SELECT latitude, longitude FROM locations "
+    "WHERE id = new.location_id AND (new.latitude IS NULL OR new.longitude IS NULL)"
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('locations', sa.Column('latitude', sa.Float(), nullable=True))
+    op.add_column('locations', sa.Column('longitude', sa.Float(), nullable=True))
+    op.add_column('items', sa.Column('latitude', sa.Float(), nullable=True))
+    op.add_column('items', sa.Column('longitude', sa.Float(), nullable=True))
+
+    op.execute(
+        "CREATE VIRTUAL TABLE items_rtree USING rtree(id, min_lat, max_lat, min_lon, max_lon)"
+    )
+    op.execute(
+        "CREATE TRIGGER items_rtree_ai AFTER INSERT ON items BEGIN "
+        "INSERT INTO items_rtree SELECT new.id, p.lat, p.lat, p.lon, p.lon "
+        f"FROM ({ITEM_POINT_SQL}) AS p WHERE p.lat IS NOT NULL AND p.lon IS NOT NULL; END"
+    )
+    op.execute(
+        "CREATE TRIGGER items_rtree_au AFTER UPDATE OF latitude, longitude, location_id ON items "
+        "BEGIN DELETE FROM items_rtree WHERE id = old.id; "
+        "INSERT INTO items_rtree SELECT new.id, p.lat, p.lat, p.lon, p.lon "
+        f"FROM ({ITEM_POINT_SQL}) AS p WHERE p.lat IS NOT NULL AND p.lon IS NOT NULL; END"
+    )
+    op.execute(
+        "CREATE TRIGGER items_rtree_ad AFTER DELETE ON items BEGIN "
+        "DELETE FROM items_rtree WHERE id = old.id; END"
+    )
+    op.execute(
+        "CREATE TRIGGER locations_rtree_au AFTER UPDATE OF latitude, longitude ON locations BEGIN "
+        "DELETE FROM items_rtree WHERE id IN (SELECT id FROM items WHERE location_id = new.id "
+        "AND (latitude IS NULL OR longitude IS NULL)); "
+        "INSERT INTO items_rtree SELECT id, new.latitude, new.latitude, new.longitude, new.longitude "
+        "FROM items WHERE location_id = new.id AND (latitude IS NULL OR longitude IS NULL) "
+        "AND new.latitude IS NOT NULL AND new.longitude IS NOT NULL; END"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP TRIGGER IF EXISTS locations_rtree_au")
+    op.execute("DROP TRIGGER IF EXISTS items_rtree_ad")
+    op.execute("DROP TRIGGER IF EXISTS items_rtree_au")
+    op.execute("DROP TRIGGER IF EXISTS items_rtree_ai")
+    op.execute("DROP TABLE IF EXISTS items_rtree")
+    # Без batch-режима: пересоздание items удалило бы триггеры полнотекстового поиска
+    op.execute("ALTER TABLE items DROP COLUMN longitude")
+    op.execute("ALTER TABLE items DROP COLUMN latitude")
+    op.execute("ALTER TABLE locations DROP COLUMN longitude")
+    op.execute("ALTER TABLE locations DROP COLUMN latitude")
@@ -0,0 +1,75 @@
+"""item facet counters
+
+Revision ID: f3a9c2d8e145
+Revises: e2b7d4c9a610
+Create Date: 2026-10-17 20:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3a9c2d8e145'
+down_revision: Union[str, Sequence[str], None] = 'e2b7d4c9a610'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+FACET_COLUMNS = ("category_id", "location_id", "condition")
+
+
+def facet_count_sql(row: str, delta: int) -> str:
+    return "".join(
+        "INSERT INTO item_facet_counts (facet, value, is_active, count) "
+        f"SELECT '{column}', {row}.{column}, COALESCE({row}.is_active, 0), {delta} "
+        f"WHERE {row}.{column} IS NOT NULL "
+        "ON CONFLICT (facet, value, is_active) DO UPDATE SET count = count + excluded.count; "
+        for column in FACET_COLUMNS
+    )
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('item_facet_counts',
+    sa.Column('facet', sa.String(), nullable=False),
+    sa.Column('value', sa.String(), nullable=False),
+    sa.Column('is_active', sa.Boolean(), nullable=False),
+    sa.Column('count', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=False),
+    sa.PrimaryKeyConstraint('facet', 'value', 'is_active')
+    )
+    op.create_index('ix_items_category_location', 'items', ['category_id', 'location_id', 'is_active'], unique=False)
+    op.create_index('ix_items_location_category', 'items', ['location_id', 'category_id', 'is_active'], unique=False)
+
+    for column in FACET_COLUMNS:
+        op.execute(
+            "INSERT INTO item_facet_counts (facet, value, is_active, count) "
+            f"SELECT '{column}', {column}, COALESCE(is_active, 0), count(*) FROM items "
+            f"WHERE {column} IS NOT NULL GROUP BY {column}, COALESCE(is_active, 0)"
+        )
+    op.execute(
+        "CREATE TRIGGER items_facets_ai AFTER INSERT ON items BEGIN "
+        f"{facet_count_sql('new', 1)}END"
+    )
+    op.execute(
+        "CREATE TRIGGER items_facets_ad AFTER DELETE ON items BEGIN "
+        f"{facet_count_sql('old', -1)}END"
+    )
+    op.execute(
+        "CREATE TRIGGER items_facets_au "
+        f"AFTER UPDATE OF {', '.join(FACET_COLUMNS)}, is_active ON items BEGIN "
+        f"{facet_count_sql('old', -1)}{facet_count_sql('new', 1)}END"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP TRIGGER IF EXISTS items_facets_au")
+    op.execute("DROP TRIGGER IF EXISTS items_facets_ad")
+    op.execute("DROP TRIGGER IF EXISTS items_facets_ai")
+    op.drop_index('ix_items_location_category', table_name='items')
+    op.drop_index('ix_items_category_location', table_name='items')
+    op.drop_table('item_facet_counts')